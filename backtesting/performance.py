@@ -1,4 +1,6 @@
 from utils.data_manager import EnhancedMarketDataManager
+from utils.market_panel import MarketPanel
+from utils.panel_cache import load_market_panel
 from .backtesting_engine import BacktestingEngine
 import logging
 from typing import List, Dict, Any, Optional
@@ -21,18 +23,21 @@ class EnhancedBacktestPerformance:
             end_date: Optional, Enddatum im Format 'YYYY-MM-DD'
         """
         # Lade Daten mit individuellen Parametern
-        df = self.mdm.load_market_data(start_date=start_date, end_date=end_date, symbols=symbols)
+        df = load_market_panel(self.mdm, start_date=start_date, end_date=end_date, symbols=symbols)
         
         results = []
-        total_symbols = len(df['Symbol'].unique())
+        # Einmal nach Symbol sortieren, danach ist jedes Symbol ein Slice
+        panel = MarketPanel.from_frame(df)
+        total_symbols = panel.n_symbols
         logging.info(f"Starte Backtest für {total_symbols} Symbole...")
         
-        for i, symbol in enumerate(df['Symbol'].unique(), 1):
+        # Strategien mit Vorberechnung (z.B. Screener-Signal-Panel) einmal über alle Symbole
+        if hasattr(strategy, 'prepare'):
+            strategy.prepare(panel.frame)
+        
+        for i, (symbol, symbol_data) in enumerate(panel.iter_symbols(), 1):
             logging.info(f"Backtest für {symbol} ({i}/{total_symbols})")
             
-            # Daten für Symbol vorbereiten
-            symbol_data = df[df['Symbol'] == symbol].copy()
-            
             # Signale generieren
             symbol_data = strategy.generate_signals(symbol_data)
             
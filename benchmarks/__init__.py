@@ -0,0 +1 @@
+print("'benchmarks' module loaded successfully.")
\ No newline at end of file
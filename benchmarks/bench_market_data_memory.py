@@ -0,0 +1,65 @@
+"""
+Benchmark: Speicherbedarf pro Zeile der Marktdaten vor und nach der Kompaktierung.
+
+Vergleicht das bisherige Format (Symbol als Python-Strings, Kleinbuchstaben-Spalten
+als Kopien) mit kategorischen Symbolen, Aliasen ohne Kopie, optional float32-Preisen
+und einer Spaltenauswahl.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_market_data_memory --symbols 500 --days 2500
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils.data_manager import COLUMN_ALIASES, compact_market_data, memory_report
+
+
+def synthetic_market_data(n_symbols: int, n_days: int) -> pd.DataFrame:
+    """Erzeugt Marktdaten im Format von download_all_stock_data."""
+    dates = pd.date_range("2015-01-01", periods=n_days, freq="B", name="Date")
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(n_symbols):
+        close = 100 + np.cumsum(rng.normal(size=n_days))
+        frames.append(pd.DataFrame({
+            "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+            "Volume": rng.integers(1e5, 1e7, size=n_days).astype(float),
+            "Turnover": close * 1e6,
+            "Symbol": f"SYM{i:04d}"
+        }, index=dates))
+    return pd.concat(frames)
+
+
+def legacy_format(df: pd.DataFrame) -> pd.DataFrame:
+    """Bisheriges Ergebnis von load_market_data: Kleinbuchstaben-Spalten als Kopien."""
+    df = df.copy()
+    for original, alias in COLUMN_ALIASES.items():
+        df[alias] = df[original]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=500, help="Anzahl simulierter Symbole")
+    parser.add_argument("--days", type=int, default=2500, help="Handelstage pro Symbol")
+    args = parser.parse_args()
+
+    raw = synthetic_market_data(args.symbols, args.days)
+    variants = {
+        "bisher (Kopien, object)": legacy_format(raw),
+        "kategorisch + Aliase": compact_market_data(raw, categorical_symbols=True),
+        "+ float32 Preise": compact_market_data(raw, price_dtype="float32", categorical_symbols=True),
+        "+ nur Close": compact_market_data(raw, columns=["Close"], price_dtype="float32",
+                                           categorical_symbols=True),
+    }
+
+    print(f"{'Variante':<26} {'Bytes/Zeile':>12} {'Gesamt MB':>10}")
+    for name, frame in variants.items():
+        report = memory_report(frame)
+        print(f"{name:<26} {report['bytes_per_row']:>12.1f} {report['total_bytes'] / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: Öffnungszeit des Memmap-Panels im Vergleich zu pd.read_parquet.
+
+Für wachsende Datenmengen wird gemessen, wie lange das Laden der vollständigen
+Historie aus Parquet dauert und wie lange das Öffnen des Panels plus das Lesen
+einer Close-Spalte (ein Symbol) dauert.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_memmap_panel --symbols 100 500 2000 --days 2500
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.bench_market_data_memory import synthetic_market_data
+from utils.memmap_panel import MemmapPanel
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--days", type=int, default=2500, help="Handelstage pro Symbol")
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'Symbole':>8} {'Zeilen':>10} {'read_parquet':>13} {'Panel öffnen':>13}")
+        for n_symbols in args.symbols:
+            df = synthetic_market_data(n_symbols, args.days)
+            parquet_path = tmp_dir / f"data_{n_symbols}.parquet"
+            df.to_parquet(parquet_path)
+            panel_root = tmp_dir / f"panel_{n_symbols}"
+            MemmapPanel.build(df, panel_root)
+            del df
+
+            parquet_time = timed(lambda: pd.read_parquet(parquet_path))
+
+            def open_panel():
+                panel = MemmapPanel.open(panel_root)
+                panel.field('Close')[:, 0].sum()
+
+            panel_time = timed(open_panel)
+            print(f"{n_symbols:>8} {n_symbols * args.days:>10} {parquet_time * 1000:>11.1f}ms {panel_time * 1000:>11.1f}ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: Symbole/Sekunde von download_all_stock_data in Abhängigkeit der Worker-Anzahl.
+
+Norgate wird durch eine Attrappe mit fester Latenz pro Aufruf ersetzt, damit der
+Benchmark ohne laufende Norgate Data Utility reproduzierbar ist. Mit --live werden
+echte Norgate-Aufrufe verwendet.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_parallel_download --symbols 200 --latency 0.02
+"""
+import argparse
+import logging
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from utils.data_downloader import download_all_stock_data
+
+
+def fake_price_timeseries(latency: float):
+    """Erzeugt eine price_timeseries-Attrappe mit fester Latenz."""
+    dates = pd.date_range("2024-01-01", periods=250, freq="B", name="Date")
+
+    def price_timeseries(symbol, **kwargs):
+        time.sleep(latency)
+        close = 100 + np.cumsum(np.random.default_rng(len(symbol)).normal(size=len(dates)))
+        return pd.DataFrame({
+            "Open": close, "High": close, "Low": close, "Close": close, "Volume": 1e6
+        }, index=dates)
+
+    return price_timeseries
+
+
+def run(symbols, workers, rate_limit=None) -> float:
+    """Führt einen Download durch und liefert Symbole pro Sekunde."""
+    start = time.perf_counter()
+    download_all_stock_data(symbols, "2024-01-01", "2024-12-31",
+                            max_workers=workers, rate_limit=rate_limit)
+    return len(symbols) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=200, help="Anzahl simulierter Symbole")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulierte Latenz pro Aufruf in Sekunden")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--rate-limit", type=float, default=None, help="Maximale Aufrufe pro Sekunde")
+    parser.add_argument("--live", action="store_true", help="Echte Norgate-Aufrufe (S&P 500)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.live:
+        from utils.norgate_watchlist_symbols import get_watchlist_symbols
+        symbols = get_watchlist_symbols("S&P 500")[:args.symbols]
+        measure = lambda w: run(symbols, w, args.rate_limit)
+    else:
+        symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+
+        def measure(w):
+            with patch("utils.data_downloader.norgatedata.price_timeseries",
+                       side_effect=fake_price_timeseries(args.latency)):
+                return run(symbols, w, args.rate_limit)
+
+    print(f"{'Worker':>8} {'Symbole/s':>12} {'Speedup':>9}")
+    baseline = None
+    for workers in args.workers:
+        rate = measure(workers)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12.1f} {rate / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
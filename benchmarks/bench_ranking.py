@@ -0,0 +1,58 @@
+"""
+Benchmark: Top-N je Datum mit argpartition im Vergleich zu einer Sortierung je Datum.
+
+Gemessen wird nur das Ranking auf einer bereits berechneten ROC-Spalte
+(RankingScreener.evaluate), nicht die Indikatorberechnung. Die Referenz
+sortiert mit pandas alle Symbole je Datum (sort_values + groupby.head).
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_ranking --symbols 5000 --days 1260 --top 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_market_data_memory import synthetic_market_data
+from screeners.indicators import IndicatorEngine
+from screeners.ranking import RankingScreener
+
+
+def sorted_top_n(df, n):
+    """Referenz: vollständige Sortierung nach Datum und Score."""
+    ranked = df.dropna(subset=['ROC_130']).sort_values(['Date', 'ROC_130'], ascending=[True, False])
+    return ranked.groupby('Date').head(n)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=5000, help="Anzahl simulierter Symbole")
+    parser.add_argument("--days", type=int, default=1260, help="Handelstage pro Symbol (5 Jahre)")
+    parser.add_argument("--top", type=int, default=50, help="Symbole je Datum")
+    args = parser.parse_args()
+
+    df = synthetic_market_data(args.symbols, args.days).reset_index()
+    engine = IndicatorEngine.from_frame(df)
+    df = engine.panel.frame
+    df['ROC_130'] = engine.roc(130)
+
+    screener = RankingScreener("roc(130)", top_n=args.top, min_price=-np.inf, min_volume=0)
+    reference, sort_time = timed(lambda: sorted_top_n(df, args.top))
+    ranked, rank_time = timed(lambda: screener.evaluate(df))
+
+    assert len(reference) == len(ranked)
+    np.testing.assert_allclose(np.sort(reference['ROC_130'].to_numpy()), np.sort(ranked['Score'].to_numpy()))
+
+    print(f"{len(df)} Zeilen, {args.symbols} Symbole, {df['Date'].nunique()} Tage, {len(ranked)} Treffer (identisch)")
+    print(f"Sortierung je Datum: {sort_time * 1000:>9.1f}ms")
+    print(f"argpartition:        {rank_time * 1000:>9.1f}ms  ({sort_time / rank_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
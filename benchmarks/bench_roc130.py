@@ -0,0 +1,94 @@
+"""
+Benchmark: vektorisierter ROC130-Scan im Vergleich zur bisherigen Implementierung.
+
+Bisher wurde je Zeile per iterrows() ein stock_indicators-Quote erzeugt und
+indicators.get_roc je Symbol aufgerufen. Ist stock_indicators nicht installiert,
+wird derselbe zeilenweise Ablauf mit einer ROC-Berechnung in Python gemessen.
+
+Aufruf (aus dem Projekt-Root):
+    python -m benchmarks.bench_roc130 --symbols 500 --days 250
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.bench_market_data_memory import synthetic_market_data
+from screeners.roc130 import roc_crossovers
+from utils.market_panel import MarketPanel
+
+
+def python_roc(quotes, period):
+    """ROC wie indicators.get_roc: None für die ersten `period` Bars."""
+    results = []
+    for i, quote in enumerate(quotes):
+        roc = None
+        if i >= period and quotes[i - period].close != 0:
+            roc = (quote.close - quotes[i - period].close) / quotes[i - period].close * 100
+        results.append(SimpleNamespace(roc=roc))
+    return results
+
+
+def legacy_scan(df, roc_threshold):
+    """Bisheriger Ablauf: Quote-Objekte per iterrows(), ROC je Symbol."""
+    try:
+        from stock_indicators import indicators
+        from stock_indicators.indicators.common.quote import Quote
+        get_roc = indicators.get_roc
+    except ImportError:
+        Quote, get_roc = SimpleNamespace, python_roc
+
+    matches = []
+    for symbol, symbol_data in MarketPanel.from_frame(df).iter_symbols():
+        quotes = []
+        for index, row in symbol_data.iterrows():
+            quote = Quote()
+            quote.date = index
+            quote.open = float(row['Open'])
+            quote.high = float(row['High'])
+            quote.low = float(row['Low'])
+            quote.close = float(row['Close'])
+            quote.volume = float(row['Volume'])
+            quotes.append(quote)
+        roc_results = get_roc(quotes, 130)
+        if len(roc_results) >= 2:
+            yesterday_roc = roc_results[-1].roc
+            day_before_roc = roc_results[-2].roc
+            if yesterday_roc is None or day_before_roc is None:
+                continue
+            if day_before_roc < roc_threshold and yesterday_roc > roc_threshold:
+                matches.append({'symbol': symbol, 'roc_yesterday': yesterday_roc,
+                                'roc_day_before': day_before_roc})
+    return matches
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=500, help="Anzahl simulierter Symbole")
+    parser.add_argument("--days", type=int, default=250, help="Handelstage pro Symbol")
+    parser.add_argument("--threshold", type=float, default=5.0,
+                        help="ROC-Schwelle (niedrig, damit es Treffer gibt)")
+    args = parser.parse_args()
+
+    df = synthetic_market_data(args.symbols, args.days)
+    legacy, legacy_time = timed(lambda: legacy_scan(df, args.threshold))
+    vectorized, vectorized_time = timed(lambda: roc_crossovers(df, 130, args.threshold))
+
+    assert [m['symbol'] for m in legacy] == [m['symbol'] for m in vectorized]
+    np.testing.assert_allclose([m['roc_yesterday'] for m in legacy],
+                               [m['roc_yesterday'] for m in vectorized], rtol=1e-9)
+
+    print(f"{len(df)} Zeilen, {args.symbols} Symbole, {len(vectorized)} Treffer (identisch)")
+    print(f"bisher (Quotes je Zeile): {legacy_time * 1000:>9.1f}ms")
+    print(f"vektorisiert:             {vectorized_time * 1000:>9.1f}ms  ({legacy_time / vectorized_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,22 @@ class Config:
     # Standard-Screening-Konfiguration
     DEFAULT_MIN_PRICE = 1.0  # Standard minimaler Preis für das Screening
     DEFAULT_MIN_VOLUME = 100000  # Standard minimales Volumen für das Screening
+    SCREENER_WORKERS = 1  # Prozesse für das Screening über Symbol-Shards (1: im aufrufenden Prozess)
+    SCREENER_SHARDS_PER_WORKER = 4  # Mehr Shards als Prozesse für gleichmäßige Auslastung und Fortschritt
+    SCREENER_MIN_SYMBOLS_PER_SHARD = 50  # Kleinere Universen lohnen den Prozessstart nicht
+    
+    # Download-Konfiguration
+    DOWNLOAD_MAX_WORKERS = 1  # Parallele Norgate-Downloads (1 = sequentiell)
+    DOWNLOAD_RATE_LIMIT = None  # Maximale Norgate-Aufrufe pro Sekunde (None = unbegrenzt)
+    
+    # Cache-Konfiguration
+    WATCHLIST_CACHE_TTL = 6 * 60 * 60  # Gültigkeit von Watchlist-Namen und -Mitgliedern in Sekunden
+    WATCHLIST_STORAGE = "shared"  # 'shared': ein Symbol-Store für alle Watchlists, 'file': eine Datei je Watchlist
+    NORGATE_REFERENCE_SYMBOL = "$SPX"  # Referenzsymbol für das letzte verfügbare Handelsdatum
+    NORGATE_PROBE_TTL = 5 * 60  # Gültigkeit des abgefragten Handelsdatums in Sekunden
+    PANEL_CACHE_MAX_BYTES = 2 * 1024 ** 3  # Speicherbudget für geladene Marktdaten-Panels im Backend
+    PANEL_CACHE_TTL = 60 * 60  # Gültigkeit eines Panels im Speicher in Sekunden
+    PANEL_CACHE_WARM_WATCHLISTS = ["S&P 500"]  # Beim Start des Backends vorgeladene Watchlists
     
     # Daten-Konfiguration
     # START_DATE = "2023-01-01"
@@ -2,9 +2,24 @@ from abc import ABC, abstractmethod
 import pandas as pd
 from config.config import Config
 from webapp.backend.services.screener_process import ScreenerProcess
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+class DetachedProgress:
+    """Ersatz für ScreenerProcess in Worker-Prozessen - den Fortschritt meldet der Hauptprozess je Shard"""
+    stop_requested = False
+    
+    def update_progress(self, *args, **kwargs) -> None:
+        pass
 
 class BaseScreener(ABC):
+    # Anzahl Bars, die screen() für ein korrektes Ergebnis am letzten Bar benötigt
+    # (None: der gesamte angefragte Zeitraum wird geladen)
+    lookback_bars: Optional[int] = None
+    # Attribute, die beim Pickling (Übergabe an Worker-Prozesse) nicht mitgegeben werden
+    _transient_attributes: Tuple[str, ...] = ('process_manager',)
+    # Ergebnisspalte, die replay() als Score ausgibt (None: jeder Treffer zählt 1.0)
+    score_column: Optional[str] = None
+
     def __init__(self, name: str, min_price: Optional[float] = None, min_volume: Optional[int] = None):
         self.name = name
         self.config = Config()
@@ -14,6 +29,16 @@ class BaseScreener(ABC):
         self.min_price = min_price if min_price is not None else self.config.DEFAULT_MIN_PRICE
         self.min_volume = min_volume if min_volume is not None else self.config.DEFAULT_MIN_VOLUME
         
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._transient_attributes:
+            state[name] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.process_manager = DetachedProgress()
+        
     def update_progress(self, total_symbols: int, current_symbol: str) -> None:
         """Aktualisiert den Screener-Fortschritt"""
         if hasattr(self, 'processed_symbols'):
@@ -36,6 +61,94 @@ class BaseScreener(ABC):
         """Führt das Screening auf den Daten durch"""
         pass
     
+    def screen_as_of(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Screening nur für den letzten Bar der Daten (Stichtag).
+        
+        Standard: screen() auf allen Daten, danach nur Treffer am Stichtag.
+        Screener können das überschreiben, um nur den letzten Bar auszuwerten.
+        """
+        return self.at_last_date(self.screen(data), data)
+    
+    def indicator_columns(self) -> Dict[str, Tuple]:
+        """
+        Benötigte Indikatoren als Spaltenname -> Spezifikation für IndicatorEngine.compute,
+        z.B. {'EMA': ('ema', 20)}. Grundlage für die gemeinsame Berechnung in run_batch_screening.
+        """
+        return {}
+    
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wertet das Screening auf Daten aus, die die Spalten aus indicator_columns()
+        bereits enthalten (nach Symbol und Datum sortiert, Datum in 'Date').
+        
+        Standard: screen() auf den Daten.
+        """
+        return self.screen(data)
+    
+    def evaluate_as_of(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Wie evaluate(), aber nur Treffer am Stichtag."""
+        return self.at_last_date(self.evaluate(data), data)
+    
+    def merge_results(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """Führt die Ergebnisse mehrerer Symbol-Shards zusammen (siehe screeners.sharded)."""
+        return pd.concat(parts)
+    
+    def replay(self, data: pd.DataFrame, start_date: Optional[str] = None,
+               end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Wertet das Screening für jeden Tag des Zeitraums in einem Durchlauf aus.
+        
+        screen() berechnet Indikatoren und Kriterien bereits für alle Bars, die Treffer
+        aller Tage werden daher aus einem einzigen Lauf übernommen. Die Daten müssen
+        lookback_bars vor start_date beginnen, damit die ersten Tage korrekt sind.
+        
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte
+            start_date: Optional, erster ausgegebener Tag im Format 'YYYY-MM-DD'
+            end_date: Optional, letzter ausgegebener Tag im Format 'YYYY-MM-DD'
+        
+        Returns:
+            Signal-Panel mit einer Zeile je Treffer (siehe signal_panel)
+        """
+        return self.signal_panel(self.screen(data), start_date, end_date)
+    
+    def signal_panel(self, result: pd.DataFrame, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Reduziert Screening-Ergebnisse auf ein dünn besetztes Datum x Symbol Signal-Panel.
+        
+        Returns:
+            DataFrame mit den Spalten Date, Symbol und Score (score_column bzw. 1.0),
+            nach Date und Symbol sortiert
+        """
+        if result.empty:
+            return pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'),
+                                 'Symbol': pd.Series(dtype=object),
+                                 'Score': pd.Series(dtype='float64')})
+        dates = result['Date'] if 'Date' in result.columns else result.index.to_series()
+        score = result[self.score_column] if self.score_column else 1.0
+        signals = pd.DataFrame({
+            'Date': pd.to_datetime(dates.to_numpy()),
+            'Symbol': result['Symbol'].astype(str).to_numpy(),
+            'Score': pd.Series(score, index=result.index).to_numpy(dtype='float64')
+        })
+        if start_date is not None:
+            signals = signals[signals['Date'] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            signals = signals[signals['Date'] <= pd.Timestamp(end_date)]
+        return signals.drop_duplicates(['Date', 'Symbol']).sort_values(['Date', 'Symbol']).reset_index(drop=True)
+    
+    @staticmethod
+    def at_last_date(result: pd.DataFrame, data: pd.DataFrame) -> pd.DataFrame:
+        """Nur die Ergebniszeilen am letzten Datum der Eingabedaten."""
+        if result.empty:
+            return result
+        as_of = data['Date'].max() if 'Date' in data.columns else data.index.max()
+        if 'Date' in result.columns:
+            return result[result['Date'] == as_of]
+        return result[result.index == as_of]
+    
     def filter_basic_criteria(self, data: pd.DataFrame) -> pd.DataFrame:
         """Wendet grundlegende Filterkriterien an"""
         filtered = data[
@@ -1,11 +1,16 @@
+import numpy as np
 import pandas as pd
-import ta
-import norgatedata
 from .base_screener import BaseScreener
-from typing import Dict, List
+from .indicators import IndicatorEngine, warmup_bars
+from .indicator_state import IndicatorStateStore
+from utils.market_panel import MarketPanel
+from utils.index_membership import get_index_membership_cache, index_column_name
+from typing import Dict, List, Optional, Tuple
 import logging
 
 class EmaTouchScreener(BaseScreener):
+    score_column = 'Volume'
+
     def __init__(self, 
                  ema_period: int = 20,
                  min_price: float = None,
@@ -39,43 +44,42 @@ class EmaTouchScreener(BaseScreener):
         Returns:
             DataFrame mit zusätzlichen Index-Zugehörigkeitsspalten
         """
+        data = data.copy()
+        if 'Symbol' not in data.columns:
+            data['Symbol'] = symbol
+        return self.add_index_membership(data)
+
+    def add_index_membership(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fügt für alle required_indices eine Zugehörigkeitsspalte ('In_<Index>') an.
+        
+        Die Zugehörigkeit kommt aus einer täglich aufgebauten Datum x Symbol Matrix
+        und wird für alle Symbole in einem Schritt angefügt.
+        
+        Args:
+            data: DataFrame mit Datum und 'Symbol'-Spalte
+            
+        Returns:
+            DataFrame mit zusätzlichen Index-Zugehörigkeitsspalten
+        """
+        membership = get_index_membership_cache()
         for index_name in self.required_indices:
+            column_name = index_column_name(index_name)
+            if column_name in data.columns:
+                logging.info(f"Spalte {column_name} existiert bereits. Überspringe...")
+                continue
             try:
-                logging.info(f"Prüfe ob {symbol} Teil von {index_name} ist...")
-                
-                # Hole die Index-Mitgliedschaft als Zeitreihe
-                index_data = norgatedata.index_constituent_timeseries(
-                    symbol,
-                    index_name,
-                    padding_setting=norgatedata.PaddingType.NONE,
-                    pandas_dataframe=data.copy(),  # Übergebe eine Kopie des existierenden DataFrames
-                    timeseriesformat='pandas-dataframe'
-                )
-                
-                column_name = f'In_{index_name.replace(" ", "_")}'
-                
-                if column_name in data.columns:
-                    logging.info(f"Spalte {column_name} existiert bereits. Überspringe...")
-                    continue
-                
-                if 'Index Constituent' in index_data.columns:
-                    # Benenne die 'Index Constituent' Spalte um
-                    index_data.rename(columns={'Index Constituent': column_name}, inplace=True)
-                    
-                    # Füge die umbenannte Spalte dem originalen DataFrame hinzu
-                    data[column_name] = index_data[column_name]
-                else:
-                    logging.warning(f"'Index Constituent' Spalte nicht gefunden für {symbol} in {index_name}")
-                    # Setze die Spalte auf False wenn keine Daten verfügbar sind
-                    data[column_name] = False
-                    
+                data = membership.join(data, index_name, column_name)
             except Exception as e:
-                logging.warning(f"Fehler bei Index-Prüfung für {symbol} in {index_name}: {e}")
-                column_name = f'In_{index_name.replace(" ", "_")}'
+                logging.warning(f"Fehler bei Index-Prüfung für {index_name}: {e}")
                 data[column_name] = False
-                
         return data
 
+    @property
+    def lookback_bars(self) -> int:
+        """Anlaufphase von EMA, RSI (Wilder-Spanne 2n - 1) und MACD inklusive Signallinie."""
+        return max(warmup_bars(self.ema_period), warmup_bars(2 * 14 - 1), warmup_bars(26) + warmup_bars(9))
+
     def screen(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Führt das Screening durch.
@@ -86,27 +90,132 @@ class EmaTouchScreener(BaseScreener):
         Returns:
             DataFrame mit gefilterten Aktien
         """
+        return self.evaluate(self.add_indicators(data))
+
+    def screen_as_of(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prüft nur den letzten Bar der Daten (Stichtag).
+        
+        Die Indikatoren werden über das übergebene Fenster berechnet, die Kriterien
+        nur für Symbole mit einem Bar am Stichtag ausgewertet.
+        
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte, mindestens lookback_bars Bars
+        
+        Returns:
+            DataFrame mit gefilterten Aktien (ein Bar je Symbol)
+        """
+        return self.evaluate_as_of(self.add_indicators(data))
+
+    def indicator_columns(self) -> Dict[str, Tuple]:
+        return {
+            'EMA': ('ema', self.ema_period),
+            'RSI': ('rsi', 14),
+            'MACD': ('macd_diff', 12, 26, 9)
+        }
+
+    def add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Berechnet EMA, RSI und MACD je Symbol.
+        
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte
+        
+        Returns:
+            Nach Symbol und Datum sortierte Kopie mit 'Date'-Spalte und Indikatorspalten
+        """
         # Erstelle eine Kopie der Daten zu Beginn
         working_data = data.copy()
         
         # Reset index, um Timestamp-Probleme zu vermeiden
         if isinstance(working_data.index, pd.DatetimeIndex):
             working_data = working_data.reset_index()
-            
-        # Grundlegende Filterung
-        working_data = self.filter_basic_criteria(working_data)
         
-        # Berechne technische Indikatoren
-        working_data.loc[:, 'EMA'] = ta.trend.ema_indicator(
-            working_data['Close'], 
-            window=self.ema_period
-        )
+        # Berechne technische Indikatoren je Symbol über die gesamte Historie,
+        # erst danach filtern - sonst fehlen den Indikatoren Bars
+        engine = IndicatorEngine.from_frame(working_data)
+        working_data = engine.panel.frame
+        for column, spec in self.indicator_columns().items():
+            working_data[column] = engine.compute(spec)
         
+        return working_data
+
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wendet die Kriterien auf Daten mit EMA-, RSI- und MACD-Spalte an.
+        
+        Args:
+            data: DataFrame mit OHLCV-, Symbol- und Indikatorspalten
+        
+        Returns:
+            DataFrame mit gefilterten Aktien
+        """
+        working_data = data.copy(deep=False)
         # Berechne relative Distanz zum EMA
-        working_data.loc[:, 'EMA_Distance'] = abs(working_data['Low'] - working_data['EMA']) / working_data['EMA']
+        working_data['EMA_Distance'] = abs(working_data['Low'] - working_data['EMA']) / working_data['EMA']
+        return self.apply_criteria(working_data)
+
+    def evaluate_as_of(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Wertet nur den Bar am Stichtag je Symbol aus."""
+        panel = MarketPanel.from_frame(data)
+        dates = panel.dates()
+        last_rows = panel.last_rows()
+        last_rows = last_rows[dates[last_rows] == dates.max()]
+        return self.evaluate(panel.frame.iloc[last_rows].copy())
+
+    def merge_results(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(parts, ignore_index=True).sort_values('Volume', ascending=False)
+
+    def indicator_state(self) -> IndicatorStateStore:
+        """Gespeicherter Indikator-Zustand für inkrementelle Screenings mit diesen Parametern."""
+        return IndicatorStateStore(ema_windows=[self.ema_period])
+
+    def screen_latest(self, data: pd.DataFrame, state_store: Optional[IndicatorStateStore] = None) -> pd.DataFrame:
+        """
+        Prüft nur den letzten Bar je Symbol mit gespeichertem Indikator-Zustand.
+        
+        Der Zustand wird mit den noch nicht verarbeiteten Bars aus `data` fortgeführt,
+        die Laufzeit hängt damit von der Anzahl Symbole und nicht von der Historie ab.
+        
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte, mindestens ab
+                state_store.required_start()
+            state_store: Optional, Indikator-Zustand (Standard: indicator_state())
+        
+        Returns:
+            DataFrame mit gefilterten Aktien
+        """
+        store = state_store or self.indicator_state()
+        store.update(data)
+        
+        working_data = data.reset_index() if isinstance(data.index, pd.DatetimeIndex) else data.copy()
+        panel = MarketPanel.from_frame(working_data)
+        # Letzter Bar je Symbol
+        last_rows = panel.last_rows()
+        working_data = panel.frame.iloc[last_rows].copy()
+        
+        symbols = [str(symbol) for symbol in panel.symbols]
+        indicators = store.latest(symbols).reindex(symbols)
+        # Nur Symbole, deren Zustand genau bis zu diesem Bar reicht
+        current = indicators['Date'].to_numpy() == panel.dates()[last_rows].values
+        working_data['EMA'] = np.where(current, indicators[f"EMA_{self.ema_period}"], np.nan)
+        working_data['RSI'] = np.where(current, indicators[f"RSI_{store.rsi_window}"], np.nan)
+        working_data['MACD'] = np.where(current, indicators[store.macd_column], np.nan)
+        
+        return self.evaluate(working_data)
+
+    def apply_criteria(self, working_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wendet Basisfilter und EMA-Touch-Kriterien auf Daten mit EMA, RSI und MACD an.
         
-        working_data.loc[:, 'RSI'] = ta.momentum.rsi(working_data['Close'])
-        working_data.loc[:, 'MACD'] = ta.trend.macd_diff(working_data['Close'])
+        Args:
+            working_data: DataFrame mit OHLCV-, Symbol- und Indikatorspalten
+        
+        Returns:
+            DataFrame mit gefilterten Aktien
+        """
+        # Grundlegende Filterung
+        working_data = self.filter_basic_criteria(working_data)
         
         # Identifiziere EMA-Berührungen mit Threshold
         working_data.loc[:, 'EMA_Touch'] = (
@@ -125,32 +234,15 @@ class EmaTouchScreener(BaseScreener):
         # Finale Filterung
         result = working_data[mask]
         
-        # Aktualisiere Fortschritt für jedes Symbol
-        unique_symbols = result['Symbol'].unique()
-        total_symbols = len(unique_symbols)
-        
         # Prüfe Index-Zugehörigkeit für die gefilterten Symbole
+        total_symbols = result['Symbol'].nunique()
         if not result.empty:
-            # Temporärer DataFrame für die Endergebnisse
-            final_result = pd.DataFrame()
+            if self.check_stop_requested():
+                logging.info("Screening wurde gestoppt")
+                return pd.DataFrame()
             
-            for symbol in unique_symbols:
-                if self.check_stop_requested():
-                    logging.info("Screening wurde gestoppt")
-                    return pd.DataFrame()
-                    
-                self.update_progress(total_symbols, symbol)
-                
-                # Hole die Symbol-spezifischen Daten
-                symbol_data = result[result['Symbol'] == symbol]
-                
-                # Prüfe Index-Zugehörigkeit und aktualisiere die Daten
-                symbol_data = self.check_index_membership(symbol, symbol_data)
-                
-                # Füge die Daten zum Endergebnis hinzu
-                final_result = pd.concat([final_result, symbol_data])
+            result = self.add_index_membership(result.copy())
             
-            # Ersetze das ursprüngliche result mit dem aktualisierten DataFrame
-            result = final_result
+            self.process_manager.update_progress(total_symbols, total_symbols, "Index-Zugehörigkeit geprüft")
         
         return result.sort_values('Volume', ascending=False)
\ No newline at end of file
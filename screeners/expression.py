@@ -0,0 +1,392 @@
+"""Screener aus einem deklarativen Ausdruck, z.B. 'close > ema(20) and rsi(14) < 70'"""
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from screeners.base_screener import BaseScreener
+from screeners.indicators import IndicatorEngine, warmup_bars
+from utils.market_panel import MarketPanel
+
+# Kursspalten, die im Ausdruck (ohne Groß-/Kleinschreibung) verwendet werden können
+PRICE_COLUMNS = {name.lower(): name for name in ('Open', 'High', 'Low', 'Close', 'Volume')}
+
+# Funktion -> (Name für IndicatorEngine.compute, Standardargumente)
+FUNCTIONS = {
+    'sma': ('sma', (20,)),
+    'ema': ('ema', (20,)),
+    'roc': ('roc', (12,)),
+    'rsi': ('rsi', (14,)),
+    'macd': ('macd_diff', (12, 26, 9)),
+    'atr': ('atr', (14,)),
+    'true_range': ('true_range', ())
+}
+
+COMPARISONS = ('<=', '>=', '==', '!=', '<', '>', 'crosses_above', 'crosses_below')
+KEYWORDS = ('and', 'or', 'not') + COMPARISONS[-2:]
+
+TOKEN_PATTERN = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|(<=|>=|==|!=|[-+*/<>(),]))")
+
+# Knoten des kompilierten Ausdrucks sind Tupel - gleiche Teilausdrücke sind gleich
+# und werden bei der Auswertung nur einmal berechnet:
+# ('num', wert), ('col', spalte), ('ind', spec), ('neg', a), ('arith', op, a, b),
+# ('cmp', op, a, b), ('and', a, b), ('or', a, b), ('not', a)
+Node = Tuple
+CONDITIONS = ('cmp', 'and', 'or', 'not')
+
+
+def tokenize(expression: str) -> List[str]:
+    """Zerlegt einen Ausdruck in Tokens (Zahlen, Namen, Operatoren)."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Ungültiges Zeichen an Position {position}: '{expression[position:position + 10]}'")
+        token = match.group(1) or match.group(3) or match.group(2).lower()
+        tokens.append(token)
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Rekursiver Abstieg über die Grammatik (von schwach nach stark bindend):
+
+        or    := and ('or' and)*
+        and   := not ('and' not)*
+        not   := 'not' not | cmp
+        cmp   := sum (('<' | '<=' | '>' | '>=' | '==' | '!=' | 'crosses_above' | 'crosses_below') sum)?
+        sum   := term (('+' | '-') term)*
+        term  := unary (('*' | '/') unary)*
+        unary := '-' unary | atom
+        atom  := Zahl | Spalte | Funktion '(' [Zahl (',' Zahl)*] ')' | '(' or ')'
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = tokenize(expression)
+        self.index = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} in Ausdruck '{self.expression}'")
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise self.error(f"'{expected or 'Ausdruck'}' erwartet, gefunden '{token or 'Ende'}'")
+        self.index += 1
+        return token
+
+    def condition(self, node: Node) -> Node:
+        if node[0] not in CONDITIONS:
+            raise self.error("Bedingung (Vergleich) erwartet")
+        return node
+
+    def number(self, node: Node) -> Node:
+        if node[0] in CONDITIONS:
+            raise self.error("Zahlenwert erwartet, gefunden Bedingung")
+        return node
+
+    def parse(self, condition: bool = True) -> Node:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise self.error(f"Unerwartetes Token '{self.peek()}'")
+        return self.condition(node) if condition else self.number(node)
+
+    def parse_or(self) -> Node:
+        node = self.parse_and()
+        while self.peek() == 'or':
+            self.take()
+            node = ('or', self.condition(node), self.condition(self.parse_and()))
+        return node
+
+    def parse_and(self) -> Node:
+        node = self.parse_not()
+        while self.peek() == 'and':
+            self.take()
+            node = ('and', self.condition(node), self.condition(self.parse_not()))
+        return node
+
+    def parse_not(self) -> Node:
+        if self.peek() == 'not':
+            self.take()
+            return ('not', self.condition(self.parse_not()))
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Node:
+        node = self.parse_sum()
+        if self.peek() in COMPARISONS:
+            node = ('cmp', self.take(), self.number(node), self.number(self.parse_sum()))
+        return node
+
+    def parse_sum(self) -> Node:
+        node = self.parse_term()
+        while self.peek() in ('+', '-'):
+            node = ('arith', self.take(), self.number(node), self.number(self.parse_term()))
+        return node
+
+    def parse_term(self) -> Node:
+        node = self.parse_unary()
+        while self.peek() in ('*', '/'):
+            node = ('arith', self.take(), self.number(node), self.number(self.parse_unary()))
+        return node
+
+    def parse_unary(self) -> Node:
+        if self.peek() == '-':
+            self.take()
+            node = self.number(self.parse_unary())
+            return ('num', -node[1]) if node[0] == 'num' else ('neg', node)
+        return self.parse_atom()
+
+    def parse_atom(self) -> Node:
+        token = self.take()
+        if token == '(':
+            node = self.parse_or()
+            self.take(')')
+            return node
+        if token[0].isdigit() or token[0] == '.':
+            return ('num', float(token))
+        if token in PRICE_COLUMNS:
+            return ('col', PRICE_COLUMNS[token])
+        if token in FUNCTIONS:
+            name, defaults = FUNCTIONS[token]
+            args = []
+            if self.peek() == '(':
+                self.take('(')
+                while self.peek() != ')':
+                    if args:
+                        self.take(',')
+                    value = self.take()
+                    if not value.isdigit():
+                        raise self.error(f"Ganzzahlige Periode für {token}() erwartet, gefunden '{value}'")
+                    args.append(int(value))
+                self.take(')')
+            if len(args) > len(defaults):
+                raise self.error(f"{token}() erwartet höchstens {len(defaults)} Argumente")
+            return ('ind', (name,) + tuple(args) + defaults[len(args):])
+        if token in KEYWORDS:
+            raise self.error(f"Unerwartetes Schlüsselwort '{token}'")
+        raise self.error(f"Unbekannter Name '{token}'")
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression: str, condition: bool = True) -> Node:
+    """
+    Parst einen Screener-Ausdruck einmal zu einem Knotenbaum (zwischengespeichert).
+
+    Args:
+        expression: z.B. 'close > ema(20) and rsi(14) < 70 and roc(130) crosses_above 40'
+        condition: True für eine Bedingung, False für einen Zahlenwert (z.B. 'roc(130)')
+
+    Returns:
+        Wurzelknoten (Tupel, siehe Node)
+
+    Raises:
+        ValueError: bei Syntaxfehlern oder unbekannten Namen
+    """
+    return _Parser(expression).parse(condition)
+
+
+def _children(node: Node) -> Tuple[Node, ...]:
+    if node[0] in ('neg', 'not'):
+        return (node[1],)
+    if node[0] in ('and', 'or'):
+        return node[1:]
+    if node[0] in ('arith', 'cmp'):
+        return node[2:]
+    return ()
+
+
+def indicator_specs(node: Node) -> List[Tuple]:
+    """Alle im Ausdruck verwendeten Indikatoren (ohne Duplikate, in Reihenfolge des Auftretens)."""
+    specs: Dict[Tuple, None] = {}
+
+    def visit(current: Node) -> None:
+        if current[0] == 'ind':
+            specs[current[1]] = None
+        for child in _children(current):
+            visit(child)
+
+    visit(node)
+    return list(specs)
+
+
+def uses_crossing(node: Node) -> bool:
+    """True, wenn der Ausdruck crosses_above/crosses_below enthält (benötigt den Vortag)."""
+    if node[0] == 'cmp' and node[1].startswith('crosses'):
+        return True
+    return any(uses_crossing(child) for child in _children(node))
+
+
+def expression_lookback(node: Node) -> int:
+    """Längste Warm-up-Phase der verwendeten Indikatoren (plus Vortag für Kreuzungen)."""
+    bars = [1]
+    for name, *args in indicator_specs(node):
+        if name == 'ema':
+            bars.append(warmup_bars(args[0]))
+        elif name in ('rsi', 'atr'):
+            # Wilder-Glättung entspricht einem EMA der Spanne 2n - 1
+            bars.append(warmup_bars(2 * args[0] - 1))
+        elif name == 'macd_diff':
+            bars.append(warmup_bars(args[1]) + warmup_bars(args[2]))
+        elif name == 'roc':
+            bars.append(args[0] + 1)
+        elif name == 'sma':
+            bars.append(args[0])
+        else:
+            bars.append(2)
+    return max(bars) + int(uses_crossing(node))
+
+
+def spec_column(spec: Tuple) -> str:
+    """Spaltenname eines Indikators, z.B. ('ema', 20) -> 'EMA_20'."""
+    return '_'.join([spec[0].upper()] + [str(arg) for arg in spec[1:]])
+
+
+class ExpressionEvaluator:
+    """
+    Wertet einen kompilierten Ausdruck vektorisiert über alle Zeilen eines Panels aus.
+
+    Jeder Teilausdruck wird höchstens einmal berechnet (Memo über den Knoten),
+    Indikatoren werden aus vorhandenen Spalten gelesen. Bedingungen mit einem
+    NaN-Operanden (z.B. in der Anlaufphase eines Indikators) gelten als unbekannt:
+    sie sind False und bleiben es auch unter 'not'.
+    """
+
+    def __init__(self, panel: MarketPanel):
+        self.panel = panel
+        self._first_rows = panel.positions() == 0
+        self._memo: Dict[Node, np.ndarray] = {}
+        self._valid: Dict[Node, np.ndarray] = {}
+
+    def value(self, node: Node) -> np.ndarray:
+        if node not in self._memo:
+            self._memo[node] = self._evaluate(node)
+        return self._memo[node]
+
+    def valid(self, node: Node) -> np.ndarray:
+        """Maske der Zeilen, in denen der Teilausdruck ohne NaN-Operanden berechnet wurde."""
+        if node not in self._valid:
+            self._valid[node] = self._validity(node)
+        return self._valid[node]
+
+    def _validity(self, node: Node) -> np.ndarray:
+        kind = node[0]
+        if kind == 'not':
+            return self.valid(node[1])
+        if kind in ('and', 'or'):
+            return self.valid(node[1]) & self.valid(node[2])
+        if kind == 'cmp':
+            valid = self.valid(node[2]) & self.valid(node[3])
+            if node[1] in ('crosses_above', 'crosses_below'):
+                valid = valid & ~np.isnan(self.previous(node[2])) & ~np.isnan(self.previous(node[3]))
+            return valid
+        return ~np.isnan(self.value(node))
+
+    def previous(self, node: Node) -> np.ndarray:
+        """Wert am Vorbar desselben Symbols (NaN am ersten Bar)."""
+        values = np.broadcast_to(self.value(node), (len(self.panel),)).astype('float64')
+        shifted = np.full(len(values), np.nan)
+        shifted[1:] = values[:-1]
+        shifted[self._first_rows] = np.nan
+        return shifted
+
+    def _evaluate(self, node: Node) -> np.ndarray:
+        kind = node[0]
+        if kind == 'num':
+            return np.float64(node[1])
+        if kind == 'col':
+            return self.panel.column(node[1], dtype='float64')
+        if kind == 'ind':
+            return self.panel.column(spec_column(node[1]), dtype='float64')
+        if kind == 'neg':
+            return -self.value(node[1])
+        if kind == 'not':
+            # ~(a < b) wäre bei NaN True - unbekannte Bedingungen bleiben False
+            return ~self.value(node[1]) & self.valid(node[1])
+        if kind == 'and':
+            return self.value(node[1]) & self.value(node[2])
+        if kind == 'or':
+            return self.value(node[1]) | self.value(node[2])
+
+        op, left, right = node[1], self.value(node[2]), self.value(node[3])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if kind == 'arith':
+                return {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide}[op](left, right)
+            if op == 'crosses_above':
+                return (self.previous(node[2]) <= self.previous(node[3])) & (left > right)
+            if op == 'crosses_below':
+                return (self.previous(node[2]) >= self.previous(node[3])) & (left < right)
+            return {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+                    '==': np.equal, '!=': np.not_equal}[op](left, right)
+
+
+class ExpressionScreener(BaseScreener):
+    def __init__(self, expression: str, min_price: float = None, min_volume: int = None):
+        """
+        Screener aus einem Ausdruck statt einer eigenen Unterklasse.
+
+        Unterstützt Kursspalten (open, high, low, close, volume), Indikatoren
+        (sma, ema, roc, rsi, macd, atr, true_range mit Perioden als Argument),
+        Arithmetik, Vergleiche, crosses_above/crosses_below sowie and/or/not.
+        Der Ausdruck wird einmal geparst; gleiche Indikatoren werden nur einmal
+        berechnet.
+
+        Args:
+            expression: z.B. 'close > ema(20) and rsi(14) < 70 and roc(130) crosses_above 40'
+            min_price: Minimaler Preis (optional, Standard aus Config)
+            min_volume: Minimales Volumen (optional, Standard aus Config)
+
+        Raises:
+            ValueError: bei ungültigem Ausdruck
+        """
+        super().__init__("Expression", min_price=min_price, min_volume=min_volume)
+        self.expression = expression
+        self.tree = compile_expression(expression)
+        self.specs = indicator_specs(self.tree)
+
+    @property
+    def lookback_bars(self) -> int:
+        return expression_lookback(self.tree)
+
+    def indicator_columns(self) -> Dict[str, Tuple]:
+        return {spec_column(spec): spec for spec in self.specs}
+
+    def screen(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wertet den Ausdruck für alle Bars aus.
+
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte
+
+        Returns:
+            DataFrame mit den Bars, die den Ausdruck erfüllen (Date, Symbol, Close,
+            Volume und die verwendeten Indikatoren)
+        """
+        working_data = data.reset_index() if isinstance(data.index, pd.DatetimeIndex) else data.copy()
+        engine = IndicatorEngine.from_frame(working_data)
+        working_data = engine.panel.frame
+        for column, spec in self.indicator_columns().items():
+            working_data[column] = engine.compute(spec)
+        return self.evaluate(working_data)
+
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Wertet den Ausdruck auf Daten mit den Spalten aus indicator_columns() aus."""
+        panel = MarketPanel.from_frame(data)
+        mask = np.broadcast_to(ExpressionEvaluator(panel).value(self.tree), (len(panel),))
+        frame = panel.frame
+        mask = mask & (frame['Close'].to_numpy() >= self.min_price) & (frame['Volume'].to_numpy() >= self.min_volume)
+
+        result = frame[mask]
+        columns = [c for c in ['Date', 'Symbol', 'Close', 'Volume'] if c in result.columns]
+        columns += list(self.indicator_columns())
+        logging.info(f"Ausdruck '{self.expression}': {len(result)} Treffer")
+        return result[columns].sort_values(['Date', 'Symbol'])
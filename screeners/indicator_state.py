@@ -0,0 +1,265 @@
+"""Gespeicherter Indikator-Zustand je Symbol für inkrementelle Screenings"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import Config
+from screeners.indicators import EwmState, IndicatorEngine
+
+# Relative Abweichung des Schlusskurses, ab der eine rückwirkende Anpassung
+# (Split, Dividende) angenommen und der Zustand neu aufgebaut wird
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+class IndicatorStateStore:
+    """
+    Hält für jedes Symbol den Zustand von EMA, RSI und MACD nach dem letzten Bar.
+
+    Ein Update verarbeitet nur Bars nach dem gespeicherten Datum, ein tägliches
+    Screening kostet damit einen Schritt je Symbol statt der ganzen Historie.
+    Die Fortsetzung liefert dieselben Werte wie eine vollständige Berechnung
+    (siehe ewm_update). Weicht der Schlusskurs am gespeicherten Datum von den neuen
+    Daten ab (rückwirkend adjustierte Kurse), wird der Zustand des Symbols verworfen;
+    es erscheint dann in missing() und muss mit voller Historie neu geladen werden.
+
+    Der Zustand liegt als Parquet-Datei je Indikator-Konfiguration unter
+    data/processed/indicator_state.
+
+    Beispiel:
+        store = IndicatorStateStore(ema_windows=[20])
+        start = store.required_start(symbols, default_start)
+        store.update(load_market_data(start_date=start, ...))
+        if store.missing(symbols): ...   # volle Historie für diese Symbole nachladen
+        values = store.latest()          # EMA_20, RSI_14, MACD_12_26_9 je Symbol
+    """
+
+    def __init__(self, ema_windows: Iterable[int] = (20,), rsi_window: int = 14,
+                 macd_windows: Tuple[int, int, int] = (12, 26, 9), path: Optional[str] = None):
+        """
+        Args:
+            ema_windows: Perioden der benötigten EMAs
+            rsi_window: Periode des RSI
+            macd_windows: (fast, slow, signal) des MACD
+            path: Optional, Pfad der Zustandsdatei (Standard abhängig von der Konfiguration)
+        """
+        self.ema_windows = tuple(sorted(set(ema_windows)))
+        self.rsi_window = rsi_window
+        self.macd_windows = tuple(macd_windows)
+        if path is None:
+            path = Config.get_project_path('data', 'processed', 'indicator_state', f"{self.key}.parquet")
+        self.path = Path(path)
+        self._state: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        """Kennung der Indikator-Konfiguration, z.B. 'ema20_rsi14_macd12-26-9'."""
+        emas = '-'.join(str(window) for window in self.ema_windows)
+        macd = '-'.join(str(window) for window in self.macd_windows)
+        return f"ema{emas}_rsi{self.rsi_window}_macd{macd}"
+
+    @property
+    def macd_column(self) -> str:
+        return "MACD_{}_{}_{}".format(*self.macd_windows)
+
+    def _ewm_specs(self) -> Dict[str, Tuple[float, int]]:
+        """Name -> (alpha, min_periods) aller fortgeführten EWMs."""
+        fast, slow, sign = self.macd_windows
+        specs = {f"ema_{w}": (2.0 / (w + 1), w) for w in set(self.ema_windows) | {fast, slow}}
+        specs[f"rsi_up_{self.rsi_window}"] = (1.0 / self.rsi_window, self.rsi_window)
+        specs[f"rsi_down_{self.rsi_window}"] = (1.0 / self.rsi_window, self.rsi_window)
+        specs[f"macd_signal_{fast}_{slow}_{sign}"] = (2.0 / (sign + 1), sign)
+        return specs
+
+    def load(self) -> pd.DataFrame:
+        """Zustand je Symbol (Index Symbol, Spalten Date, Close und EWM-Zustände)."""
+        if self._state is None:
+            if self.path.exists():
+                self._state = pd.read_parquet(self.path)
+            else:
+                self._state = pd.DataFrame(index=pd.Index([], name='Symbol', dtype=object))
+        return self._state
+
+    def save(self) -> None:
+        """Schreibt den Zustand atomar."""
+        state = self.load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        state.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def reset(self, symbols: Optional[List[str]] = None) -> None:
+        """Verwirft den Zustand (aller oder einzelner Symbole)."""
+        with self._lock:
+            state = self.load()
+            if symbols is None:
+                self._state = state.iloc[0:0]
+            else:
+                self._state = state.drop(index=[s for s in symbols if s in state.index])
+            self.save()
+
+    def last_dates(self, symbols: Optional[List[str]] = None) -> pd.Series:
+        """Datum des zuletzt verarbeiteten Bars je Symbol (NaT ohne Zustand)."""
+        state = self.load()
+        dates = state['Date'] if 'Date' in state.columns else pd.Series(dtype='datetime64[ns]')
+        return dates if symbols is None else dates.reindex(symbols)
+
+    def missing(self, symbols: List[str]) -> List[str]:
+        """Symbole ohne gespeicherten Zustand."""
+        dates = self.last_dates(symbols)
+        return list(dates.index[dates.isna()])
+
+    def required_start(self, symbols: List[str], default_start: str) -> str:
+        """
+        Frühestes Datum, ab dem Daten für ein Update geladen werden müssen.
+
+        Der zuletzt verarbeitete Bar wird mitgeladen, um rückwirkende Kursanpassungen
+        zu erkennen. Symbole ohne Zustand benötigen die volle Historie ab default_start.
+
+        Args:
+            symbols: Zu aktualisierende Symbole
+            default_start: Startdatum für eine vollständige Berechnung
+
+        Returns:
+            Startdatum im Format 'YYYY-MM-DD'
+        """
+        dates = self.last_dates(symbols)
+        if dates.empty or dates.isna().any():
+            return default_start
+        return max(dates.min(), pd.Timestamp(default_start)).strftime("%Y-%m-%d")
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Verarbeitet alle Bars nach dem gespeicherten Datum und speichert den neuen Zustand.
+
+        Args:
+            df: Marktdaten mit DatetimeIndex (oder 'Date'-Spalte), 'Symbol' und 'Close'
+
+        Returns:
+            Anzahl verarbeiteter Bars
+        """
+        if df.empty:
+            return 0
+        with self._lock:
+            panel = IndicatorEngine.from_frame(df).panel
+            state = self.load()
+            dates = panel.dates()
+            closes = panel.column('Close', dtype='float64')
+            group_ids = panel.group_ids()
+            symbols = np.asarray(panel.symbols, dtype=str)
+
+            known = self.last_dates(list(symbols)).to_numpy(dtype='datetime64[ns]')
+            stored_close = (state['Close'].reindex(symbols).to_numpy(dtype='float64')
+                            if 'Close' in state.columns else np.full(len(symbols), np.nan))
+
+            # Rückwirkend angepasste Kurse: die übergebenen Daten reichen für einen
+            # Neuaufbau meist nicht zurück, der Zustand wird verworfen
+            at_last = dates.values == known[group_ids]
+            changed = at_last & ~np.isclose(closes, stored_close[group_ids], rtol=ADJUSTMENT_TOLERANCE)
+            stale = np.unique(group_ids[changed])
+            if len(stale):
+                logging.info(f"Kurse von {len(stale)} Symbolen rückwirkend geändert, Indikator-Zustand wird verworfen")
+                state = state.drop(index=symbols[stale])
+                self._state = state
+
+            is_stale = np.isin(group_ids, stale)
+            new_rows = ~is_stale & (np.isnat(known[group_ids]) | (dates.values > known[group_ids]))
+            if new_rows.any():
+                new_state = self._advance(IndicatorEngine.from_frame(panel.frame[new_rows]), state)
+                self._state = pd.concat([state.drop(index=new_state.index, errors='ignore'), new_state]).sort_index()
+            if new_rows.any() or len(stale):
+                self.save()
+            return int(new_rows.sum())
+
+    def _advance(self, engine: IndicatorEngine, state: pd.DataFrame) -> pd.DataFrame:
+        """Führt alle Zustände über die Bars der Engine fort."""
+        panel = engine.panel
+        symbols = pd.Index(np.asarray(panel.symbols, dtype=str), name='Symbol')
+        previous = state.reindex(symbols)
+        close = panel.column('Close', dtype='float64')
+
+        def initial(name: str) -> EwmState:
+            if f"{name}_value" not in previous.columns:
+                return EwmState.empty(len(symbols))
+            return EwmState(
+                previous[f"{name}_value"].to_numpy(dtype='float64'),
+                previous[f"{name}_wt"].fillna(1.0).to_numpy(dtype='float64'),
+                previous[f"{name}_nobs"].fillna(0).to_numpy(dtype=np.int64)
+            )
+
+        specs = self._ewm_specs()
+        results: Dict[str, Tuple[np.ndarray, EwmState]] = {}
+        for name, (alpha, min_periods) in specs.items():
+            if name.startswith('ema_'):
+                results[name] = engine.ewm_state(close, alpha, min_periods, initial(name))
+
+        # RSI: erste Differenz gegen den gespeicherten Schlusskurs
+        previous_close = engine.shift(close, 1)
+        if 'Close' in previous.columns:
+            previous_close[panel.offsets[:-1]] = previous['Close'].to_numpy(dtype='float64')
+        diff = close - previous_close
+        window = self.rsi_window
+        for name, values in ((f"rsi_up_{window}", np.where(diff > 0, diff, 0.0)),
+                             (f"rsi_down_{window}", np.where(diff < 0, -diff, 0.0))):
+            alpha, min_periods = specs[name]
+            results[name] = engine.ewm_state(values, alpha, min_periods, initial(name))
+
+        fast, slow, sign = self.macd_windows
+        line = results[f"ema_{fast}"][0] - results[f"ema_{slow}"][0]
+        name = f"macd_signal_{fast}_{slow}_{sign}"
+        alpha, min_periods = specs[name]
+        results[name] = engine.ewm_state(line, alpha, min_periods, initial(name))
+
+        last_rows = panel.last_rows()
+        columns = {
+            'Date': panel.dates()[last_rows],
+            'Close': close[last_rows]
+        }
+        for name, (_, end_state) in results.items():
+            columns[f"{name}_value"] = end_state.weighted
+            columns[f"{name}_wt"] = end_state.old_wt
+            columns[f"{name}_nobs"] = end_state.nobs
+        return pd.DataFrame(columns, index=symbols)
+
+    def latest(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Indikatorwerte am zuletzt verarbeiteten Bar je Symbol.
+
+        Args:
+            symbols: Optional, nur diese Symbole
+
+        Returns:
+            DataFrame (Index Symbol) mit Date, Close, EMA_<n>, RSI_<n> und MACD_<fast>_<slow>_<signal>
+            (MACD-Histogramm wie ta.trend.macd_diff)
+        """
+        state = self.load()
+        if symbols is not None:
+            state = state.reindex([s for s in symbols if s in state.index])
+        result = pd.DataFrame({'Date': state.get('Date'), 'Close': state.get('Close')}, index=state.index)
+        if state.empty:
+            return result
+
+        specs = self._ewm_specs()
+
+        def value(name: str) -> np.ndarray:
+            ewm = EwmState(state[f"{name}_value"].to_numpy(), state[f"{name}_wt"].to_numpy(),
+                           state[f"{name}_nobs"].to_numpy())
+            return ewm.value(specs[name][1])
+
+        for window in self.ema_windows:
+            result[f"EMA_{window}"] = value(f"ema_{window}")
+
+        up = value(f"rsi_up_{self.rsi_window}")
+        down = value(f"rsi_down_{self.rsi_window}")
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[f"RSI_{self.rsi_window}"] = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+
+        fast, slow, sign = self.macd_windows
+        line = value(f"ema_{fast}") - value(f"ema_{slow}")
+        result[self.macd_column] = line - value(f"macd_signal_{fast}_{slow}_{sign}")
+        return result
@@ -0,0 +1,280 @@
+"""Vektorisierte technische Indikatoren für alle Symbole eines Panels"""
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.market_panel import MarketPanel
+
+# Anlaufphase eines EMA in Vielfachen seiner Spanne: danach liegt der Einfluss
+# des Startwerts unter 0,1% ((1 - 2 / (span + 1)) ** (4 * span) < e ** -7.9)
+EWM_WARMUP_FACTOR = 4
+
+
+# Über compute() abrufbare Indikatoren, Spezifikation: (Name, Argumente...)
+INDICATORS = ('sma', 'ema', 'roc', 'rsi', 'macd_diff', 'true_range', 'atr')
+
+
+def warmup_bars(span: int) -> int:
+    """Bars, nach denen ein EMA der Spanne `span` praktisch unabhängig vom Startwert ist."""
+    return EWM_WARMUP_FACTOR * span
+
+
+class EwmState(NamedTuple):
+    """Zustand eines EWM je Symbol: gewichteter Wert, altes Gewicht, Anzahl Beobachtungen."""
+    weighted: np.ndarray
+    old_wt: np.ndarray
+    nobs: np.ndarray
+
+    @classmethod
+    def empty(cls, n: int) -> 'EwmState':
+        """Zustand vor der ersten Beobachtung."""
+        return cls(np.full(n, np.nan), np.ones(n), np.zeros(n, dtype=np.int64))
+
+    def value(self, min_periods: int = 0) -> np.ndarray:
+        """Aktueller Indikatorwert (NaN solange min_periods nicht erreicht ist)."""
+        return np.where(self.nobs >= max(min_periods, 1), self.weighted, np.nan)
+
+
+def ewm_update(matrix: np.ndarray, alpha: float, min_periods: int = 0,
+               state: Optional[EwmState] = None,
+               lengths: Optional[np.ndarray] = None) -> Tuple[np.ndarray, EwmState]:
+    """
+    Führt einen EWM-Zustand über neue Zeilen einer Zeit x Symbol Matrix fort.
+
+    Entspricht Series.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    für jede Spalte, einschließlich der Behandlung fehlender Werte. Mit einem
+    gespeicherten Zustand ergibt die Fortsetzung dieselben Werte wie eine
+    Berechnung über die gesamte Historie.
+
+    Args:
+        matrix: Zeit x Symbol Matrix
+        alpha: Glättungsfaktor
+        min_periods: Mindestanzahl Beobachtungen für einen Wert
+        state: Optional, Zustand nach der letzten verarbeiteten Zeile
+        lengths: Optional, Anzahl echter Zeilen je Spalte (danach Auffüllung,
+            die den Zustand nicht verändert)
+
+    Returns:
+        Tuple (Matrix gleicher Form, Zustand nach der jeweils letzten echten Zeile)
+    """
+    min_periods = max(min_periods, 1)
+    n_steps, n_groups = matrix.shape
+    out = np.full(matrix.shape, np.nan)
+    if state is None:
+        state = EwmState.empty(n_groups)
+    weighted = state.weighted.astype(float)
+    old_wt = state.old_wt.astype(float)
+    nobs = state.nobs.astype(np.int64)
+
+    decay = 1.0 - alpha
+    for t in range(n_steps):
+        cur = matrix[t]
+        is_obs = ~np.isnan(cur)
+        nobs += is_obs
+        started = ~np.isnan(weighted)
+        # Lücken lassen das alte Gewicht weiter abklingen (wie ignore_na=False)
+        decaying = started if lengths is None else started & (t < lengths)
+        old_wt = np.where(decaying, old_wt * decay, old_wt)
+        update = started & is_obs
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, np.where(is_obs & ~started, cur, weighted))
+        old_wt = np.where(update, 1.0, old_wt)
+        out[t] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out, EwmState(weighted, old_wt, nobs)
+
+
+def ewm_mean(matrix: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentiell gewichteter Mittelwert entlang der Zeitachse (Zeilen).
+
+    Entspricht Series.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    für jede Spalte.
+
+    Args:
+        matrix: Zeit x Symbol Matrix
+        alpha: Glättungsfaktor
+        min_periods: Mindestanzahl Beobachtungen für einen Wert
+
+    Returns:
+        Matrix gleicher Form
+    """
+    return ewm_update(matrix, alpha, min_periods)[0]
+
+
+class IndicatorEngine:
+    """
+    Berechnet Indikatoren für alle Symbole eines MarketPanel in einem Durchgang.
+
+    Die Werte werden in eine Zeit x Symbol Matrix gelegt (jede Spalte beginnt mit
+    dem ersten Bar ihres Symbols), rekursive Indikatoren laufen einmal über die
+    Zeitachse und rechnen dabei alle Symbole gleichzeitig. Damit fließt kein Wert
+    über eine Symbolgrenze, und die Ergebnisse entsprechen den Einzelaufrufen der
+    ta-Bibliothek je Symbol.
+
+    Ergebnisse sind Arrays in Zeilenreihenfolge von panel.frame und werden
+    zwischengespeichert, sodass z.B. MACD und EMA-Screener dieselben EMAs teilen.
+
+    Beispiel:
+        engine = IndicatorEngine.from_frame(df)
+        frame = engine.panel.frame
+        frame['EMA'] = engine.ema(20)
+    """
+
+    def __init__(self, panel: MarketPanel):
+        self.panel = panel
+        self._group_ids = panel.group_ids()
+        self._positions = panel.positions()
+        self._lengths = np.diff(panel.offsets)
+        self._n_steps = int(self._lengths.max()) if len(self._lengths) else 0
+        self._cache: Dict[Hashable, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol_column: str = 'Symbol') -> 'IndicatorEngine':
+        """Baut Panel und Engine aus einem DataFrame mit Symbol-Spalte."""
+        return cls(MarketPanel.from_frame(df, symbol_column=symbol_column))
+
+    def _cached(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def to_matrix(self, values: np.ndarray) -> np.ndarray:
+        """Zeilenwerte -> Zeit x Symbol Matrix (nach Symbolende mit NaN aufgefüllt)."""
+        matrix = np.full((self._n_steps, self.panel.n_symbols), np.nan)
+        matrix[self._positions, self._group_ids] = values
+        return matrix
+
+    def from_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """Zeit x Symbol Matrix -> Zeilenwerte in Panel-Reihenfolge."""
+        return matrix[self._positions, self._group_ids]
+
+    def compute(self, spec: Tuple) -> np.ndarray:
+        """
+        Berechnet einen Indikator aus seiner Spezifikation, z.B. ('ema', 20) oder ('macd_diff', 12, 26, 9).
+
+        Gleiche Spezifikationen verschiedener Screener werden nur einmal berechnet.
+        """
+        name, *args = spec
+        if name not in INDICATORS:
+            raise ValueError(f"Unbekannter Indikator: {name}")
+        return getattr(self, name)(*args)
+
+    def _values(self, column: str) -> np.ndarray:
+        return self.panel.column(column, dtype='float64')
+
+    def shift(self, values: np.ndarray, periods: int = 1) -> np.ndarray:
+        """Verschiebt Zeilenwerte innerhalb jedes Symbols (wie groupby().shift())."""
+        shifted = np.full(len(values), np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[:len(values) - periods]
+        shifted[self._positions < periods] = np.nan
+        return shifted
+
+    def ewm(self, values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+        """Exponentiell gewichteter Mittelwert je Symbol (adjust=False)."""
+        return self.ewm_state(values, alpha, min_periods)[0]
+
+    def ewm_state(self, values: np.ndarray, alpha: float, min_periods: int = 0,
+                  state: Optional[EwmState] = None) -> Tuple[np.ndarray, EwmState]:
+        """
+        Exponentiell gewichteter Mittelwert je Symbol mit Start- und Endzustand.
+
+        Args:
+            values: Zeilenwerte in Panel-Reihenfolge
+            alpha: Glättungsfaktor
+            min_periods: Mindestanzahl Beobachtungen für einen Wert
+            state: Optional, Zustand je Symbol (Reihenfolge panel.symbols) vor der ersten Zeile
+
+        Returns:
+            Tuple (Zeilenwerte, Zustand je Symbol nach dem letzten Bar)
+        """
+        matrix, end_state = ewm_update(self.to_matrix(values), alpha, min_periods, state, self._lengths)
+        return self.from_matrix(matrix), end_state
+
+    def sma(self, window: int, column: str = 'Close') -> np.ndarray:
+        """Einfacher gleitender Durchschnitt."""
+        def compute():
+            matrix = self.to_matrix(self._values(column))
+            valid = ~np.isnan(matrix)
+            sums = np.cumsum(np.where(valid, matrix, 0.0), axis=0)
+            counts = np.cumsum(valid, axis=0)
+            sums[window:] -= sums[:-window].copy()
+            counts[window:] -= counts[:-window].copy()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = np.where(counts >= window, sums / window, np.nan)
+            return self.from_matrix(result)
+        return self._cached(('sma', window, column), compute)
+
+    def ema(self, window: int, column: str = 'Close') -> np.ndarray:
+        """Exponentieller gleitender Durchschnitt (wie ta.trend.ema_indicator)."""
+        return self._cached(
+            ('ema', window, column),
+            lambda: self.ewm(self._values(column), 2.0 / (window + 1), min_periods=window)
+        )
+
+    def roc(self, window: int = 12, column: str = 'Close') -> np.ndarray:
+        """Rate of Change in Prozent (wie ta.momentum.roc)."""
+        def compute():
+            values = self._values(column)
+            previous = self.shift(values, window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return (values - previous) / previous * 100
+        return self._cached(('roc', window, column), compute)
+
+    def rsi(self, window: int = 14, column: str = 'Close') -> np.ndarray:
+        """Relative Strength Index nach Wilder (wie ta.momentum.rsi)."""
+        def compute():
+            values = self._values(column)
+            diff = values - self.shift(values, 1)
+            up = np.where(diff > 0, diff, 0.0)
+            down = np.where(diff < 0, -diff, 0.0)
+            ema_up = self.ewm(up, 1.0 / window, min_periods=window)
+            ema_down = self.ewm(down, 1.0 / window, min_periods=window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+        return self._cached(('rsi', window, column), compute)
+
+    def macd(self, window_fast: int = 12, window_slow: int = 26,
+             window_sign: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        MACD-Linie, Signallinie und Histogramm (wie ta.trend.MACD).
+
+        Returns:
+            Tuple (macd, signal, diff)
+        """
+        def compute():
+            line = self.ema(window_fast) - self.ema(window_slow)
+            signal = self.ewm(line, 2.0 / (window_sign + 1), min_periods=window_sign)
+            return line, signal, line - signal
+        return self._cached(('macd', window_fast, window_slow, window_sign), compute)
+
+    def macd_diff(self, window_fast: int = 12, window_slow: int = 26, window_sign: int = 9) -> np.ndarray:
+        """MACD-Histogramm (wie ta.trend.macd_diff)."""
+        return self.macd(window_fast, window_slow, window_sign)[2]
+
+    def true_range(self) -> np.ndarray:
+        """True Range, am ersten Bar eines Symbols High - Low."""
+        def compute():
+            high, low = self._values('High'), self._values('Low')
+            prev_close = self.shift(self._values('Close'), 1)
+            return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return self._cached(('true_range',), compute)
+
+    def atr(self, window: int = 14) -> np.ndarray:
+        """
+        Average True Range mit Wilder-Glättung (wie ta.volatility.average_true_range).
+
+        Abweichend von ta sind die ersten window - 1 Bars NaN statt 0.
+        """
+        def compute():
+            true_range = self.to_matrix(self.true_range())
+            result = np.full(true_range.shape, np.nan)
+            if self._n_steps < window:
+                return self.from_matrix(result)
+            # Start mit dem Mittel der ersten window Werte, Symbole mit zu wenig Bars bleiben NaN
+            result[window - 1] = true_range[:window].mean(axis=0)
+            for t in range(window, self._n_steps):
+                result[t] = (result[t - 1] * (window - 1) + true_range[t]) / window
+            return self.from_matrix(result)
+        return self._cached(('atr', window), compute)
@@ -0,0 +1,152 @@
+"""Querschnitts-Ranking: die besten (oder schlechtesten) N Symbole je Datum"""
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from screeners.base_screener import BaseScreener
+from screeners.expression import (ExpressionEvaluator, compile_expression, expression_lookback,
+                                  indicator_specs, spec_column)
+from screeners.indicators import IndicatorEngine
+from utils.market_panel import MarketPanel
+
+# Anzahl Datumszeilen je argpartition-Aufruf (begrenzt den Index-Puffer auf Zeilen x Symbole)
+RANK_CHUNK_ROWS = 256
+
+
+def top_n(scores: np.ndarray, n: int, largest: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wählt je Zeile einer Datum x Symbol Matrix die N höchsten (bzw. niedrigsten) Werte.
+
+    Statt jede Zeile vollständig zu sortieren, trennt np.argpartition die N besten
+    Spalten in O(Symbole) ab; sortiert werden nur diese N. NaN zählt nicht,
+    ±inf wird normal gerankt (z.B. Division durch eine ATR von 0).
+    Funktioniert auch direkt auf Memmap-Matrizen (MemmapPanel.field).
+
+    Args:
+        scores: Matrix (Zeilen = Daten, Spalten = Symbole)
+        n: Anzahl Treffer je Zeile
+        largest: True für die höchsten, False für die niedrigsten Werte
+
+    Returns:
+        Tuple (Zeilen, Spalten, Rang ab 1) der gewählten Zellen, je Zeile nach Rang sortiert
+    """
+    n_rows, n_columns = scores.shape
+    k = min(n, n_columns)
+    rows, columns, ranks = [], [], []
+    if k <= 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+
+    for start in range(0, n_rows, RANK_CHUNK_ROWS):
+        block = np.asarray(scores[start:start + RANK_CHUNK_ROWS], dtype='float64')
+        # Einheitlich "kleiner ist besser" - argpartition/argsort sortieren NaN hinter +inf
+        keys = -block if largest else block
+        if k < n_columns:
+            selected = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            selected = np.broadcast_to(np.arange(n_columns), keys.shape)
+        selected_keys = np.take_along_axis(keys, selected, axis=1)
+        order = np.argsort(selected_keys, axis=1, kind='stable')
+        selected = np.take_along_axis(selected, order, axis=1)
+        valid = ~np.isnan(np.take_along_axis(selected_keys, order, axis=1))
+
+        block_rows, positions = np.nonzero(valid)
+        rows.append(block_rows + start)
+        columns.append(selected[block_rows, positions])
+        ranks.append(positions + 1)
+
+    return np.concatenate(rows), np.concatenate(columns), np.concatenate(ranks)
+
+
+class RankingScreener(BaseScreener):
+    score_column = 'Score'
+
+    def __init__(self, score: str = "roc(130)", top_n: int = 50, bottom: bool = False,
+                 min_price: float = None, min_volume: int = None):
+        """
+        Wählt je Datum die N Symbole mit dem höchsten (oder niedrigsten) Score.
+
+        Der Score ist ein Ausdruck wie im ExpressionScreener, z.B. 'roc(130)' oder
+        '(close - sma(200)) / atr(14)'. Symbole unter min_price/min_volume oder
+        ohne Score (zu kurze Historie) nehmen am Ranking nicht teil.
+
+        Args:
+            score: Ausdruck für den Score je Bar
+            top_n: Anzahl Symbole je Datum
+            bottom: True wählt die niedrigsten statt der höchsten Scores
+            min_price: Minimaler Preis (optional, Standard aus Config)
+            min_volume: Minimales Volumen (optional, Standard aus Config)
+
+        Raises:
+            ValueError: bei ungültigem Score-Ausdruck
+        """
+        super().__init__("Ranking", min_price=min_price, min_volume=min_volume)
+        self.score = score
+        self.top_n = top_n
+        self.bottom = bottom
+        self.tree = compile_expression(score, condition=False)
+        self.specs = indicator_specs(self.tree)
+
+    @property
+    def lookback_bars(self) -> int:
+        return expression_lookback(self.tree)
+
+    def indicator_columns(self) -> Dict[str, Tuple]:
+        return {spec_column(spec): spec for spec in self.specs}
+
+    def screen(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rangliste für jedes Datum der Daten.
+
+        Args:
+            data: DataFrame mit OHLCV-Daten und Symbol-Spalte
+
+        Returns:
+            DataFrame mit Date, Symbol, Close, Volume, Score, Rank und den Indikatorspalten,
+            nach Date und Rank sortiert
+        """
+        working_data = data.reset_index() if isinstance(data.index, pd.DatetimeIndex) else data.copy()
+        engine = IndicatorEngine.from_frame(working_data)
+        working_data = engine.panel.frame
+        for column, spec in self.indicator_columns().items():
+            working_data[column] = engine.compute(spec)
+        return self.evaluate(working_data)
+
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Rangliste auf Daten mit den Spalten aus indicator_columns()."""
+        panel = MarketPanel.from_frame(data)
+        frame = panel.frame
+        score = np.broadcast_to(ExpressionEvaluator(panel).value(self.tree), (len(panel),)).astype('float64')
+        eligible = (frame['Close'].to_numpy() >= self.min_price) & (frame['Volume'].to_numpy() >= self.min_volume)
+        score[~eligible] = np.nan
+
+        # Zeilen -> Datum x Symbol Matrix (nach Datum ausgerichtet, fehlende Bars NaN)
+        date_rows, all_dates = pd.factorize(panel.dates(), sort=True)
+        symbol_columns = panel.group_ids()
+        matrix = np.full((len(all_dates), panel.n_symbols), np.nan)
+        matrix[date_rows, symbol_columns] = score
+        row_ids = np.full(matrix.shape, -1, dtype=np.int64)
+        row_ids[date_rows, symbol_columns] = np.arange(len(panel))
+
+        rows, columns, ranks = top_n(matrix, self.top_n, largest=not self.bottom)
+        selected = row_ids[rows, columns]
+
+        result = frame.iloc[selected].copy()
+        result['Score'] = score[selected]
+        result['Rank'] = ranks
+        columns = [c for c in ['Date', 'Symbol', 'Close', 'Volume', 'Score', 'Rank'] if c in result.columns]
+        columns += [c for c in self.indicator_columns() if c not in columns]
+        logging.info(f"Ranking '{self.score}': Top {self.top_n} an {len(all_dates)} Tagen")
+        return result[columns].reset_index(drop=True)
+
+    def merge_results(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """Shards enthalten je Datum ihre eigene Top N - global neu ranken."""
+        merged = pd.concat(parts, ignore_index=True)
+        if merged.empty:
+            return merged
+        keys = -merged['Score'] if not self.bottom else merged['Score']
+        merged = merged.assign(_key=keys).sort_values(['Date', '_key'], kind='stable')
+        merged['Rank'] = merged.groupby('Date').cumcount() + 1
+        return merged[merged['Rank'] <= self.top_n].drop(columns='_key').reset_index(drop=True)
@@ -1,83 +1,165 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
-from stock_indicators.indicators.common.quote import Quote
-from stock_indicators import indicators
-from utils.norgate_watchlist_symbols import get_watchlist_symbols
 from utils.data_manager import EnhancedMarketDataManager
+from utils.market_panel import MarketPanel
+from screeners.base_screener import BaseScreener
+from screeners.indicators import IndicatorEngine
 
-class ROC130Screener:
-    def __init__(self, watchlist_name: Optional[str] = None):
+
+def roc_crossovers(df: pd.DataFrame, period: int = 130, roc_threshold: float = 40.0) -> List[Dict]:
+    """
+    Findet alle Symbole, deren ROC am letzten Bar den Schwellenwert von unten durchbricht.
+    
+    Die ROC wird für alle Symbole gleichzeitig über die Panel-Arrays berechnet
+    (Verschiebung je Symbol, dann Division), verglichen werden nur die letzten
+    beiden Bars jedes Symbols.
+    
+    Args:
+        df: Marktdaten mit 'Close'- und 'Symbol'-Spalte
+        period: ROC-Periode in Bars
+        roc_threshold: Schwellenwert in Prozent
+        
+    Returns:
+        Liste von Dicts mit 'symbol', 'roc_yesterday' und 'roc_day_before'
+    """
+    if df.empty:
+        return []
+    engine = IndicatorEngine.from_frame(df)
+    roc = engine.roc(period)
+    
+    last_rows = engine.panel.last_rows()
+    # Symbole mit nur einem Bar haben keinen Vortag
+    has_previous = np.diff(engine.panel.offsets) >= 2
+    last_rows = last_rows[has_previous]
+    symbols = engine.panel.symbols[has_previous]
+    
+    roc_yesterday = roc[last_rows]
+    roc_day_before = roc[last_rows - 1]
+    # NaN (zu kurze Historie) erfüllt keinen der Vergleiche
+    crossed = (roc_day_before < roc_threshold) & (roc_yesterday > roc_threshold)
+    
+    return [
+        {
+            'symbol': symbol,
+            'roc_yesterday': float(yesterday),
+            'roc_day_before': float(day_before)
+        }
+        for symbol, yesterday, day_before in zip(symbols[crossed], roc_yesterday[crossed], roc_day_before[crossed])
+    ]
+
+
+class ROC130Screener(BaseScreener):
+    _transient_attributes = BaseScreener._transient_attributes + ('_mdm',)
+    score_column = 'ROC'
+
+    def __init__(self, watchlist_name: Optional[str] = None,
+                 roc_period: int = 130,
+                 roc_threshold: float = 40.0,
+                 min_price: float = None,
+                 min_volume: int = None):
         """
         ROC130 Screener zum Finden von Aktien die den ROC130 von unten nach oben durchbrechen.
         
         Args:
-            watchlist_name: Optional, Name der zu scannenden Watchlist
+            watchlist_name: Optional, Name der zu scannenden Watchlist (nur für scan())
+            roc_period: ROC-Periode in Bars
+            roc_threshold: Schwellenwert für den Durchbruch in Prozent
+            min_price: Minimaler Preis (optional, Standard aus Config)
+            min_volume: Minimales Volumen (optional, Standard aus Config)
         """
-        self.mdm = EnhancedMarketDataManager(watchlist_name=watchlist_name)
+        super().__init__("ROC130", min_price=min_price, min_volume=min_volume)
+        self.watchlist_name = watchlist_name
+        self.roc_period = roc_period
+        self.roc_threshold = roc_threshold
+        self._mdm = None
         logging.basicConfig(level=logging.INFO)
+
+    @property
+    def mdm(self) -> EnhancedMarketDataManager:
+        """Market Data Manager der Watchlist (erst bei Bedarf angelegt)."""
+        if self._mdm is None:
+            self._mdm = EnhancedMarketDataManager(watchlist_name=self.watchlist_name)
+        return self._mdm
+
+    @property
+    def lookback_bars(self) -> int:
+        """ROC am letzten Bar und am Vortag."""
+        return self.roc_period + 2
+
+    def indicator_columns(self) -> Dict[str, Tuple]:
+        return {'ROC': ('roc', self.roc_period)}
+
+    def screen(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Findet alle Bars, an denen die ROC den Schwellenwert von unten durchbricht.
         
-    def create_quotes(self, df: pd.DataFrame) -> List[Quote]:
-        """Konvertiert DataFrame zu Quote-Objekten für stock-indicators"""
-        quotes = []
-        for index, row in df.iterrows():
-            quote = Quote()
-            quote.date = index
-            quote.open = float(row['open'])
-            quote.high = float(row['high'])
-            quote.low = float(row['low'])
-            quote.close = float(row['close'])
-            quote.volume = float(row['volume'])
-            quotes.append(quote)
-        return quotes
+        Args:
+            data: DataFrame mit 'Close'- und 'Symbol'-Spalte
+        
+        Returns:
+            DataFrame mit Date, Symbol, Close, ROC und ROC_Previous der Durchbrüche
+        """
+        working_data = data.reset_index() if isinstance(data.index, pd.DatetimeIndex) else data.copy()
+        engine = IndicatorEngine.from_frame(working_data)
+        working_data = engine.panel.frame
+        for column, spec in self.indicator_columns().items():
+            working_data[column] = engine.compute(spec)
+        return self.evaluate(working_data)
+
+    def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Durchbrüche auf Daten mit ROC-Spalte (nach Symbol und Datum sortiert), gefiltert nach Preis und Volumen."""
+        panel = MarketPanel.from_frame(data)
+        frame = panel.frame
+        roc = panel.column('ROC', dtype='float64')
+        previous = np.full(len(roc), np.nan)
+        previous[1:] = roc[:-1]
+        previous[panel.positions() == 0] = np.nan
+        
+        # NaN (zu kurze Historie) erfüllt keinen der Vergleiche
+        crossed = (previous < self.roc_threshold) & (roc > self.roc_threshold)
+        crossed &= (frame['Close'].to_numpy() >= self.min_price) & (frame['Volume'].to_numpy() >= self.min_volume)
+        result = frame[crossed].copy()
+        result['ROC_Previous'] = previous[crossed]
+        columns = [c for c in ['Date', 'Symbol', 'Close', 'Volume', 'ROC', 'ROC_Previous'] if c in result.columns]
+        return result[columns].sort_values('ROC', ascending=False)
         
-    def scan(self, roc_threshold: float = 40.0) -> List[str]:
+    def merge_results(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(parts, ignore_index=True).sort_values('ROC', ascending=False)
+        
+    def scan(self, roc_threshold: Optional[float] = None) -> List[Dict]:
         """
         Führt den ROC130 Scan durch.
         
         Args:
-            roc_threshold: Schwellenwert für ROC130 Durchbruch (default: 40.0)
+            roc_threshold: Optional, Schwellenwert für ROC130 Durchbruch (Standard: roc_threshold des Screeners)
             
         Returns:
-            Liste der Symbole, die das Kriterium erfüllen
+            Liste der Treffer mit Symbol und den letzten beiden ROC-Werten
         """
-        # Daten laden (letzten 200 Tage für 130 ROC Berechnung)
+        if roc_threshold is None:
+            roc_threshold = self.roc_threshold
+        # Daten laden (letzten 200 Tage für 130 ROC Berechnung), nur Schlusskurse werden benötigt
         df = self.mdm.load_market_data(
             start_date="2024-01-01",  # Ausreichend Daten für 130 Perioden
-            end_date="2025-01-04"
+            end_date="2025-01-04",
+            columns=['Close'],
+            categorical_symbols=True,
+            lowercase_aliases=False
         )
         
-        matches = []
-        total_symbols = len(df['Symbol'].unique())
-        
-        for i, symbol in enumerate(df['Symbol'].unique(), 1):
-            logging.info(f"Scanne {symbol} ({i}/{total_symbols})")
-            
-            # Daten für das Symbol extrahieren
-            symbol_data = df[df['Symbol'] == symbol].copy()
-            
-            # Zu Quote-Objekten konvertieren
-            quotes = self.create_quotes(symbol_data)
-            
-            # ROC130 berechnen
-            roc_results = indicators.get_roc(quotes, 130)
-            
-            # Die letzten beiden ROC-Werte prüfen
-            if len(roc_results) >= 2:
-                yesterday_roc = roc_results[-1].roc
-                day_before_roc = roc_results[-2].roc
-                
-                # Prüfen ob ROC von unter threshold auf über threshold gestiegen ist
-                if day_before_roc < roc_threshold and yesterday_roc > roc_threshold:
-                    matches.append({
-                        'symbol': symbol,
-                        'roc_yesterday': yesterday_roc,
-                        'roc_day_before': day_before_roc
-                    })
-                    logging.info(f"Match gefunden: {symbol} (ROC: {yesterday_roc:.2f}%)")
+        matches = roc_crossovers(df, period=self.roc_period, roc_threshold=roc_threshold)
+        for match in matches:
+            logging.info(f"Match gefunden: {match['symbol']} (ROC: {match['roc_yesterday']:.2f}%)")
+        logging.info(f"ROC130 Scan abgeschlossen: {len(matches)} Treffer")
         
         return matches
 
+
+# Name für get_screener_class('roc130')
+Roc130Screener = ROC130Screener
+
 def main():
     # Screener für S&P 500 initialisieren
     screener = ROC130Screener(watchlist_name="S&P 500")
@@ -1,14 +1,17 @@
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional, Type, List
-import importlib
+from typing import Dict, Any, Optional, Tuple, Type, List
 import pandas as pd
 
 from config.config import Config
 from screeners.base_screener import BaseScreener
-from utils.data_downloader import download_all_stock_data
+from screeners.indicators import IndicatorEngine
+from screeners.sharded import screen_sharded
+from utils.data_manager import EnhancedMarketDataManager
 from utils.norgate_database_symbols import get_active_symbols
 from utils.norgate_watchlist_symbols import get_watchlist_symbols
+from utils.panel_cache import load_market_panel
+from utils.plugin_registry import get_screener_registry
 from webapp.backend.services.screener_process import ScreenerProcess
 
 def get_symbols(watchlist_name: Optional[str] = None) -> List[str]:
@@ -25,9 +28,40 @@ def get_symbols(watchlist_name: Optional[str] = None) -> List[str]:
         return get_watchlist_symbols(watchlist_name)
     return get_active_symbols()
 
+def default_screening_range(end_date: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Standard-Zeitraum für das Screening: ein Jahr bis zum Enddatum.
+    
+    Args:
+        end_date: Optional, Enddatum im Format 'YYYY-MM-DD' (Standard: heute)
+    
+    Returns:
+        Tuple (start_date, end_date)
+    """
+    if end_date is None:
+        end_date = datetime.now().strftime("%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    return end.replace(year=end.year - 1).strftime("%Y-%m-%d"), end_date
+
+def lookback_start(end_date: str, lookback_bars: int) -> str:
+    """
+    Startdatum, ab dem mindestens `lookback_bars` Handelstage bis zum Enddatum vorliegen.
+    
+    Gerechnet wird in Werktagen plus einem Puffer für Börsenfeiertage (ca. 10 pro Jahr).
+    
+    Args:
+        end_date: Enddatum im Format 'YYYY-MM-DD'
+        lookback_bars: Benötigte Anzahl Bars inklusive des letzten
+    
+    Returns:
+        Startdatum im Format 'YYYY-MM-DD'
+    """
+    business_days = lookback_bars + lookback_bars // 20 + 5
+    return (pd.Timestamp(end_date) - pd.offsets.BDay(business_days)).strftime("%Y-%m-%d")
+
 def get_screener_class(screener_type: str) -> Type[BaseScreener]:
     """
-    Lädt die Screener-Klasse dynamisch basierend auf dem Screener-Typ.
+    Lädt die Screener-Klasse über die Screener-Registry (beim ersten Aufruf importiert, danach zwischengespeichert).
     
     Args:
         screener_type: Name des Screeners (z.B. 'ema_touch')
@@ -35,20 +69,150 @@ def get_screener_class(screener_type: str) -> Type[BaseScreener]:
     Returns:
         Screener-Klasse
     """
+    return get_screener_registry().get_class(screener_type)
+
+def screening_start(end_date: str, start_date: Optional[str], latest_only: bool,
+                    lookback_bars: Optional[int]) -> str:
+    """
+    Startdatum der zu ladenden Marktdaten.
+    
+    Args:
+        end_date: Enddatum (Stichtag) im Format 'YYYY-MM-DD'
+        start_date: Optional, explizites Startdatum (hat Vorrang)
+        latest_only: Nur der Stichtag wird ausgewertet
+        lookback_bars: Optional, vom Screener benötigte Bars
+    
+    Returns:
+        Startdatum im Format 'YYYY-MM-DD'
+    """
+    if start_date is not None:
+        return start_date
+    if latest_only and lookback_bars:
+        # Stichtag: nur so viele Bars wie der Screener für den letzten Bar braucht
+        start_date = lookback_start(end_date, lookback_bars)
+        logging.info(f"Stichtag {end_date}: {lookback_bars} Bars Lookback ab {start_date}")
+        return start_date
+    # Standard: 1 Jahr zurück vom Enddatum
+    return default_screening_range(end_date)[0]
+
+def run_batch_screening(
+    screeners: List[Dict[str, Any]],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    watchlist_name: Optional[str] = None,
+    latest_only: bool = False
+) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Führt mehrere Screener in einem Durchgang auf denselben Marktdaten aus.
+    
+    Die Marktdaten werden einmal geladen, die Vereinigung der von allen Screenern
+    benötigten Indikatoren (indicator_columns) einmal berechnet und jeder Screener
+    auf den gemeinsamen Spalten ausgewertet.
+    
+    Args:
+        screeners: Konfigurationen, z.B. [{'screener_type': 'ema_touch', 'parameters': {...}},
+            {'screener_type': 'roc130', 'name': 'roc130_30', 'parameters': {'roc_threshold': 30}}]
+        start_date: Startdatum für die Marktdaten im Format 'YYYY-MM-DD'
+        end_date: Enddatum für die Marktdaten im Format 'YYYY-MM-DD'
+        watchlist_name: Optional, Name der Watchlist für das Screening
+        latest_only: Nur Treffer am Stichtag (end_date); ohne start_date wird nur
+            das größte Lookback-Fenster der Screener geladen
+    
+    Returns:
+        Dict Name -> Ergebnisse (Name aus 'name', sonst screener_type; bei Mehrfachverwendung
+        mit Nummer, z.B. 'ema_touch_2') oder None bei Fehler/Abbruch
+    """
+    Config.setup()
+    process_manager = ScreenerProcess()
+    
     try:
-        module_name = f"screeners.{screener_type}"
-        module = importlib.import_module(module_name)
-        class_name = ''.join(word.capitalize() for word in screener_type.split('_')) + "Screener"
-        return getattr(module, class_name)
-    except (ImportError, AttributeError) as e:
-        raise ValueError(f"Screener-Typ '{screener_type}' nicht gefunden: {str(e)}")
+        process_manager.status = "initializing"
+        process_manager.update_progress(0, 0, "Initialisiere Screener...")
+        
+        instances: Dict[str, BaseScreener] = {}
+        for config in screeners:
+            screener_type = config['screener_type']
+            base_name = name = config.get('name') or screener_type
+            number = 2
+            while name in instances:
+                name = f"{base_name}_{number}"
+                number += 1
+            instances[name] = get_screener_class(screener_type)(**(config.get('parameters') or {}))
+        
+        symbols = get_symbols(watchlist_name)
+        total_symbols = len(symbols)
+        logging.info(f"Gefundene Symbole: {total_symbols} {'in Watchlist ' + watchlist_name if watchlist_name else 'in Datenbank'}")
+        if not symbols:
+            logging.error("Keine Symbole gefunden")
+            process_manager.status = "error"
+            return None
+        
+        # Ein Fenster für alle: das größte Lookback, None wenn ein Screener den ganzen Zeitraum braucht
+        lookbacks = [screener.lookback_bars for screener in instances.values()]
+        lookback = None if any(bars is None for bars in lookbacks) else max(lookbacks)
+        end_date = default_screening_range(end_date)[1]
+        start_date = screening_start(end_date, start_date, latest_only, lookback)
+        
+        process_manager.update_progress(total_symbols, 0, "Lade Marktdaten...")
+        market_data = load_market_panel(
+            EnhancedMarketDataManager(watchlist_name=watchlist_name),
+            start_date=start_date,
+            end_date=end_date,
+            symbols=None if watchlist_name else symbols,
+            categorical_symbols=True,
+            lowercase_aliases=False
+        )
+        if market_data.empty:
+            logging.error("Keine Marktdaten geladen")
+            process_manager.status = "error"
+            return None
+        
+        process_manager.status = "screening"
+        process_manager.update_progress(len(instances), 0, "Berechne Indikatoren...")
+        
+        # Gemeinsame Indikatoren: gleiche Spezifikationen nur einmal berechnen
+        working_data = market_data.reset_index() if isinstance(market_data.index, pd.DatetimeIndex) else market_data
+        engine = IndicatorEngine.from_frame(working_data)
+        requested = [spec for screener in instances.values() for spec in screener.indicator_columns().values()]
+        indicators = {spec: engine.compute(spec) for spec in dict.fromkeys(requested)}
+        logging.info(f"{len(indicators)} Indikatoren für {len(instances)} Screener berechnet ({len(requested)} angefordert)")
+        
+        results = {}
+        for i, (name, screener) in enumerate(instances.items(), 1):
+            if process_manager.stop_requested:
+                logging.info("Screening-Prozess wurde gestoppt")
+                return None
+            process_manager.update_progress(len(instances), i - 1, name)
+            
+            # Flache Kopie: die Indikatorspalten des Screeners unter seinen eigenen Namen
+            shared = engine.panel.frame.copy(deep=False)
+            for column, spec in screener.indicator_columns().items():
+                shared[column] = indicators[spec]
+            result = screener.evaluate_as_of(shared) if latest_only else screener.evaluate(shared)
+            results[name] = result
+            
+            output_path = Config.get_project_path('data', 'processed', f'screener_results_{name}_{end_date}.parquet')
+            result.to_parquet(output_path)
+            logging.info(f"{name}: {len(result)} Treffer, gespeichert in {output_path}")
+        
+        process_manager.status = "completed"
+        process_manager.update_progress(len(instances), len(instances), "Screening abgeschlossen")
+        return results
+        
+    except Exception as e:
+        logging.error(f"Fehler beim Batch-Screening: {e}")
+        process_manager.status = "error"
+        return None
 
 def run_daily_screening(
     screener_type: str = "ema_touch",
     parameters: Dict[str, Any] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    watchlist_name: Optional[str] = None
+    watchlist_name: Optional[str] = None,
+    incremental: bool = False,
+    latest_only: bool = False,
+    workers: Optional[int] = None
 ) -> Optional[pd.DataFrame]:
     """
     Führt das tägliche Screening durch
@@ -59,6 +223,12 @@ def run_daily_screening(
         start_date: Startdatum für die Marktdaten im Format 'YYYY-MM-DD'
         end_date: Enddatum für die Marktdaten im Format 'YYYY-MM-DD'
         watchlist_name: Optional, Name der Watchlist für das Screening
+        incremental: Nur den letzten Bar mit gespeichertem Indikator-Zustand prüfen
+            (für Screener mit screen_latest); geladen werden nur noch nicht verarbeitete Bars
+        latest_only: Nur Treffer am Stichtag (end_date) ermitteln; ohne start_date wird
+            nur das vom Screener deklarierte Lookback-Fenster geladen
+        workers: Optional, Anzahl Prozesse für das Screening über Symbol-Shards
+            (Standard: Config.SCREENER_WORKERS)
     """
     Config.setup()
     process_manager = ScreenerProcess()
@@ -88,17 +258,27 @@ def run_daily_screening(
         process_manager.update_progress(total_symbols, 0, "Lade Marktdaten...")
         
         # Setze Default-Werte für Datum wenn nicht angegeben
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        if start_date is None:
-            # Standard: 1 Jahr zurück vom Enddatum
-            start_date = (datetime.strptime(end_date, "%Y-%m-%d").replace(year=datetime.strptime(end_date, "%Y-%m-%d").year - 1)).strftime("%Y-%m-%d")
-        
-        # Lade aktuelle Marktdaten
-        market_data = download_all_stock_data(
-            symbols=symbols,
-            start_date=start_date,
-            end_date=end_date
+        end_date = default_screening_range(end_date)[1]
+        start_date = screening_start(end_date, start_date, latest_only, screener.lookback_bars)
+        
+        # Inkrementell: nur Bars ab dem ältesten gespeicherten Indikator-Zustand laden
+        state_store = None
+        load_start = start_date
+        if incremental and hasattr(screener, 'screen_latest'):
+            state_store = screener.indicator_state()
+            load_start = state_store.required_start(symbols, start_date)
+            logging.info(f"Inkrementelles Screening, lade Marktdaten ab {load_start}")
+        
+        # Lade Marktdaten über den Panel-Cache - wiederholte Screenings lesen aus dem Speicher.
+        # Watchlists lösen ihre Symbole im Manager selbst auf (gleicher Key wie beim Vorladen)
+        mdm = EnhancedMarketDataManager(watchlist_name=watchlist_name)
+        market_data = load_market_panel(
+            mdm,
+            start_date=load_start,
+            end_date=end_date,
+            symbols=None if watchlist_name else symbols,
+            categorical_symbols=True,
+            lowercase_aliases=False
         )
         if market_data.empty:
             logging.error("Keine Marktdaten geladen")
@@ -109,14 +289,21 @@ def run_daily_screening(
         process_manager.status = "screening"
         process_manager.update_progress(total_symbols, 0, "Führe Screening durch...")
         
-        # Hole nur die Daten vom letzten Tag
-        unique_dates = market_data.index.unique()
-        latest_date = unique_dates[-1]
-        latest_data = market_data[market_data.index == latest_date].copy()
-        
         # Führe das Screening durch
         try:
-            results = screener.screen(market_data)
+            if state_store is not None:
+                state_store.update(market_data)
+                # Symbole ohne Zustand (z.B. nach rückwirkender Kursanpassung) mit voller Historie nachladen
+                missing = state_store.missing(list(market_data['Symbol'].astype(str).unique()))
+                if missing and load_start != start_date:
+                    logging.info(f"Baue Indikator-Zustand für {len(missing)} Symbole neu auf")
+                    state_store.update(mdm.load_market_data(start_date=start_date, end_date=end_date,
+                                                            symbols=missing, categorical_symbols=True,
+                                                            lowercase_aliases=False))
+                results = screener.screen_latest(market_data, state_store)
+            else:
+                results = screen_sharded(screener, market_data, workers=workers,
+                                         as_of=latest_only, process_manager=process_manager)
             
             if process_manager.stop_requested:
                 logging.info("Screening-Prozess wurde gestoppt")
@@ -0,0 +1,223 @@
+"""Screening über Symbol-Shards in einem Prozess-Pool mit Marktdaten in Shared Memory"""
+import copy
+import gc
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import Config
+from screeners.base_screener import BaseScreener
+from utils.market_panel import MarketPanel
+from webapp.backend.services.screener_process import ScreenerProcess
+
+DATE_ARRAY = "__date__"
+SYMBOL_ARRAY = "__symbol__"
+
+
+class SharedPanel:
+    """
+    Spalten eines MarketPanel in Shared-Memory-Blöcken.
+
+    Worker-Prozesse erhalten nur den kleinen `handle` (Blocknamen, Datentypen,
+    Symbolliste) und bilden ihren Zeilenbereich ohne Kopie als DataFrame ab -
+    die Marktdaten selbst werden nicht gepickelt.
+
+    Beispiel:
+        with SharedPanel.create(panel) as shared:
+            pool.submit(worker, shared.handle, start, end)
+    """
+
+    def __init__(self, blocks: Dict[str, shared_memory.SharedMemory], handle: dict):
+        self._blocks = blocks
+        self.handle = handle
+
+    @classmethod
+    def create(cls, panel: MarketPanel, columns: Optional[List[str]] = None) -> 'SharedPanel':
+        """
+        Kopiert die Spalten des Panels einmalig in Shared Memory.
+
+        Args:
+            panel: Nach Symbol und Datum sortiertes Panel
+            columns: Optional, zu teilende Spalten (Standard: alle numerischen)
+        """
+        frame = panel.frame
+        if columns is None:
+            columns = [column for column in frame.columns
+                       if column != panel.symbol_column and pd.api.types.is_numeric_dtype(frame[column])]
+        arrays = {column: frame[column].to_numpy() for column in columns}
+        arrays[DATE_ARRAY] = panel.dates().asi8
+        arrays[SYMBOL_ARRAY] = panel.group_ids().astype(np.int32)
+
+        blocks: Dict[str, shared_memory.SharedMemory] = {}
+        spec = {}
+        try:
+            for name, values in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                blocks[name] = block
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                spec[name] = (block.name, values.dtype.str, len(values))
+        except Exception:
+            cls(blocks, {}).close()
+            raise
+
+        handle = {
+            'arrays': spec,
+            'symbols': [str(symbol) for symbol in panel.symbols],
+            'symbol_column': panel.symbol_column
+        }
+        return cls(blocks, handle)
+
+    def close(self) -> None:
+        """Gibt die Blöcke frei (nur im erzeugenden Prozess aufrufen)."""
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self) -> 'SharedPanel':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_shard(handle: dict, start: int, end: int) -> Tuple[List[shared_memory.SharedMemory], pd.DataFrame]:
+    """
+    Bildet die Zeilen [start, end) eines SharedPanel als DataFrame ab (ohne Kopie, schreibgeschützt).
+
+    Returns:
+        Tuple (geöffnete Blöcke, DataFrame mit DatetimeIndex 'Date' und kategorischer Symbol-Spalte)
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, dtype, length) in handle['arrays'].items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        values = np.ndarray(length, dtype=dtype, buffer=block.buf)[start:end]
+        values.flags.writeable = False
+        arrays[name] = values
+
+    index = pd.DatetimeIndex(arrays.pop(DATE_ARRAY).view('datetime64[ns]'), name='Date')
+    codes = arrays.pop(SYMBOL_ARRAY)
+    frame = pd.DataFrame(arrays, index=index, copy=False)
+    frame[handle['symbol_column']] = pd.Categorical.from_codes(codes, categories=handle['symbols'])
+    return blocks, frame
+
+
+def _close_blocks(blocks: List[shared_memory.SharedMemory]) -> None:
+    gc.collect()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Noch referenzierte Views - die Abbildung endet mit dem Worker-Prozess
+            logging.debug(f"Shared-Memory-Block {block.name} noch in Verwendung")
+
+
+def _screen_shard(screener: BaseScreener, handle: dict, start: int, end: int, as_of: bool) -> pd.DataFrame:
+    """Worker: screent einen Zeilenbereich des SharedPanel."""
+    blocks, frame = attach_shard(handle, start, end)
+    try:
+        result = screener.screen_as_of(frame) if as_of else screener.screen(frame)
+        # Ergebnis vom Shared Memory lösen, bevor die Blöcke geschlossen werden
+        result = result.copy()
+        symbol_column = handle['symbol_column']
+        if symbol_column in result.columns and isinstance(result[symbol_column].dtype, pd.CategoricalDtype):
+            result[symbol_column] = result[symbol_column].astype(str)
+    finally:
+        del frame
+        _close_blocks(blocks)
+    return result
+
+
+def shard_bounds(offsets: np.ndarray, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Teilt die Symbole in zusammenhängende Shards mit etwa gleich vielen Zeilen.
+
+    Args:
+        offsets: Symbol-Offsets eines MarketPanel
+        n_shards: Gewünschte Anzahl Shards
+
+    Returns:
+        Zeilenbereiche [(start, end), ...], Grenzen liegen immer zwischen zwei Symbolen
+    """
+    targets = np.linspace(0, offsets[-1], n_shards + 1)
+    cuts = np.unique(offsets[np.searchsorted(offsets, targets)])
+    return [(int(start), int(end)) for start, end in zip(cuts[:-1], cuts[1:]) if end > start]
+
+
+def screen_sharded(screener: BaseScreener, data: pd.DataFrame, workers: Optional[int] = None,
+                   as_of: bool = False, process_manager: Optional[ScreenerProcess] = None) -> pd.DataFrame:
+    """
+    Führt screen() (bzw. screen_as_of()) parallel über Symbol-Shards aus.
+
+    Die Marktdaten liegen einmal in Shared Memory, jeder Worker screent einen
+    zusammenhängenden Symbolbereich. Indikatoren werden je Symbol berechnet, die
+    Ergebnisse sind daher identisch mit einem Lauf über alle Daten. Der Fortschritt
+    wird je fertigem Shard an den ScreenerProcess gemeldet, ein Stopp verwirft
+    noch nicht gestartete Shards. Die Index-Zugehörigkeit (required_indices)
+    wird erst nach dem Zusammenführen im Elternprozess angefügt.
+
+    Args:
+        screener: Screener (wird ohne process_manager an die Worker übergeben)
+        data: Marktdaten mit DatetimeIndex und 'Symbol'-Spalte
+        workers: Optional, Anzahl Prozesse (Standard: Config.SCREENER_WORKERS)
+        as_of: Nur Treffer am Stichtag (screen_as_of)
+        process_manager: Optional, Empfänger des Fortschritts (Standard: ScreenerProcess())
+
+    Returns:
+        Zusammengeführte Ergebnisse (screener.merge_results)
+    """
+    workers = Config.SCREENER_WORKERS if workers is None else workers
+    panel = MarketPanel.from_frame(data)
+    n_shards = min(workers * Config.SCREENER_SHARDS_PER_WORKER,
+                   panel.n_symbols // Config.SCREENER_MIN_SYMBOLS_PER_SHARD)
+    if workers <= 1 or n_shards <= 1:
+        return screener.screen_as_of(data) if as_of else screener.screen(data)
+
+    process_manager = process_manager or ScreenerProcess()
+    bounds = shard_bounds(panel.offsets, n_shards)
+    logging.info(f"Screening von {panel.n_symbols} Symbolen in {len(bounds)} Shards mit {workers} Prozessen")
+
+    # Index-Zugehörigkeit einmal im Elternprozess anfügen: parallele Worker würden
+    # die IndexMembershipCache-Dateien sonst gleichzeitig und je Shard überschreiben
+    required_indices = getattr(screener, 'required_indices', None)
+    worker_screener = screener
+    if required_indices:
+        worker_screener = copy.copy(screener)
+        worker_screener.required_indices = []
+
+    parts: Dict[int, pd.DataFrame] = {}
+    processed_symbols = 0
+    with SharedPanel.create(panel) as shared:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            futures = {
+                pool.submit(_screen_shard, worker_screener, shared.handle, start, end, as_of): (start, end)
+                for start, end in bounds
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                parts[start] = future.result()
+                processed_symbols += int(np.searchsorted(panel.offsets, end) - np.searchsorted(panel.offsets, start))
+                process_manager.update_progress(panel.n_symbols, processed_symbols,
+                                                f"{len(parts)}/{len(bounds)} Shards")
+                if process_manager.stop_requested:
+                    for pending in futures:
+                        pending.cancel()
+                    logging.info("Screening wurde gestoppt")
+                    return pd.DataFrame()
+
+    results = [parts[start] for start in sorted(parts) if not parts[start].empty]
+    if not results:
+        return pd.DataFrame()
+    merged = screener.merge_results(results)
+    # Jeder Shard kennt nur seinen eigenen letzten Tag
+    if as_of:
+        merged = screener.at_last_date(merged, data)
+    if required_indices and not merged.empty:
+        merged = screener.add_index_membership(merged)
+    return merged
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 
 class MeanReversionStrategy:
+    """Strategie, die Umkehrungen nach Overnight-Gaps nach unten identifiziert"""
+
     def __init__(self, gap_threshold=-0.03):
         """
         Args:
@@ -16,7 +18,7 @@ class MeanReversionStrategy:
         df = df.copy()
         
         # Nach Symbol gruppieren und Gaps berechnen
-        df['prev_close'] = df.groupby('Symbol')['Close'].shift(1)
+        df['prev_close'] = df.groupby('Symbol', observed=True)['Close'].shift(1)
         df['gap'] = (df['Open'] - df['prev_close']) / df['prev_close']
         
         # Long Signal wenn Gap kleiner als Schwellwert
@@ -0,0 +1,66 @@
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.plugin_registry import get_screener_registry
+
+
+class ScreenerSignalStrategy:
+    def __init__(self, screener_type: str = "ema_touch", parameters: Optional[Dict[str, Any]] = None,
+                 hold_days: int = 5, min_score: Optional[float] = None,
+                 signals: Optional[pd.DataFrame] = None):
+        """
+        Strategie aus den historischen Treffern eines Screeners.
+
+        Ein Treffer eröffnet eine Position, die hold_days Bars gehalten wird
+        (weitere Treffer verlängern sie). Die Treffer stammen aus einem
+        Signal-Panel von BaseScreener.replay, das vor dem Backtest einmal für
+        alle Symbole berechnet wird (prepare) - ohne Screening je Tag.
+
+        Args:
+            screener_type: Art des Screeners (z.B. 'ema_touch')
+            parameters: Parameter für den Screener
+            hold_days: Haltedauer in Bars nach dem letzten Treffer
+            min_score: Optional, nur Treffer mit mindestens diesem Score
+            signals: Optional, bereits berechnetes Signal-Panel (Date, Symbol, Score)
+        """
+        self.screener = get_screener_registry().get_class(screener_type)(**(parameters or {}))
+        self.hold_days = hold_days
+        self.min_score = min_score
+        self.signals = signals
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Berechnet das Signal-Panel einmal für alle Symbole und Tage.
+
+        Args:
+            df: Marktdaten aller Symbole für den Backtest-Zeitraum
+
+        Returns:
+            Signal-Panel (Date, Symbol, Score)
+        """
+        self.signals = self.screener.replay(df)
+        logging.info(f"{len(self.signals)} Screener-Treffer für den Backtest")
+        return self.signals
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Markiert Bars innerhalb von hold_days nach einem Screener-Treffer als Long-Signal."""
+        signals = self.signals if self.signals is not None else self.screener.replay(df)
+        if self.min_score is not None:
+            signals = signals[signals['Score'] >= self.min_score]
+
+        df = df.copy()
+        dates = pd.DatetimeIndex(df['Date'] if 'Date' in df.columns else df.index)
+        keys = pd.MultiIndex.from_arrays([dates, df['Symbol'].astype(str)])
+        hit = keys.isin(pd.MultiIndex.from_frame(signals[['Date', 'Symbol']]))
+
+        # Bars seit dem letzten Treffer je Symbol (Daten je Symbol nach Datum sortiert)
+        df['screener_hit'] = hit
+        symbols = df['Symbol'].to_numpy()
+        position = df.groupby(symbols, observed=True).cumcount().to_numpy()
+        last_hit = pd.Series(np.where(hit, position, np.nan)).groupby(symbols, observed=True).ffill().to_numpy()
+        df['signal'] = position - last_hit < self.hold_days
+
+        return df
@@ -1,6 +1,8 @@
 import unittest
 import os
 import sys
+import shutil
+import tempfile
 import pandas as pd
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
@@ -87,6 +89,1330 @@ class TestEnhancedMarketDataManager(unittest.TestCase):
         self.assertEqual(len(result_df), 9)
         self.assertEqual(len(result_df['Symbol'].unique()), 3)
 
+# Test für den partitionierten Parquet-Store
+class TestPartitionedParquetStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        dates = pd.date_range(start='2023-12-28', periods=6, freq='D', name='Date')
+        frames = []
+        for symbol, base in [('AAPL', 100.0), ('MSFT', 200.0), ('GOOGL', 300.0)]:
+            frames.append(pd.DataFrame({
+                'Open': base, 'Close': base + 1, 'Volume': 1000.0, 'Symbol': symbol
+            }, index=dates))
+        self.df = pd.concat(frames)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_roundtrip_with_filters(self):
+        """Test, ob Datums-, Symbol- und Spaltenfilter korrekt angewendet werden"""
+        from utils.parquet_store import PartitionedParquetStore
+        
+        store = PartitionedParquetStore(self.tmp_dir, num_buckets=4)
+        store.write(self.df)
+        
+        # Gesamter Bestand
+        self.assertEqual(len(store.read()), len(self.df))
+        
+        # Ein Symbol, Zeitraum über den Jahreswechsel, nur eine Spalte
+        result = store.read(start_date='2023-12-30', end_date='2024-01-01',
+                            symbols=['MSFT'], columns=['Close'])
+        self.assertListEqual(list(result.columns), ['Symbol', 'Close'])
+        self.assertEqual(len(result), 3)
+        self.assertTrue((result['Symbol'] == 'MSFT').all())
+        self.assertEqual(result.index.min(), pd.Timestamp('2023-12-30'))
+        self.assertEqual(result.index.max(), pd.Timestamp('2024-01-01'))
+    
+    def test_merge_overwrites_duplicates(self):
+        """Test, ob beim Zusammenführen neuere Zeilen bestehende ersetzen"""
+        from utils.parquet_store import PartitionedParquetStore
+        
+        store = PartitionedParquetStore(self.tmp_dir, num_buckets=4)
+        store.write(self.df)
+        
+        update = self.df[self.df['Symbol'] == 'AAPL'].tail(1).copy()
+        update['Close'] = 999.0
+        store.write(update)
+        
+        result = store.read(symbols=['AAPL'])
+        self.assertEqual(len(result), 6)
+        self.assertEqual(result['Close'].iloc[-1], 999.0)
+
+    def test_concurrent_merges_keep_all_rows(self):
+        """Test, ob gleichzeitige Schreibzugriffe auf dieselbe Partition keine Zeilen verlieren"""
+        import glob
+        import multiprocessing
+        from concurrent.futures import ThreadPoolExecutor
+        from utils.parquet_store import PartitionedParquetStore
+
+        parts = [self.df.assign(Symbol=f'{symbol}{i}') for i in range(4)
+                 for symbol in ('AAPL', 'MSFT', 'GOOGL')]
+        threads = parts[:6]
+        processes = parts[6:]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda part: PartitionedParquetStore(self.tmp_dir, num_buckets=1).write(part), threads))
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=PartitionedParquetStore(self.tmp_dir, num_buckets=1).write, args=(part,))
+                   for part in processes]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        result = PartitionedParquetStore(self.tmp_dir).read()
+        self.assertEqual(len(result), len(self.df) * 4)
+        self.assertListEqual(glob.glob(os.path.join(self.tmp_dir, '**', '*.tmp'), recursive=True), [])
+
+# Test für die inkrementelle Cache-Aktualisierung
+class TestIncrementalRefresh(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'test_data.parquet')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    @staticmethod
+    def make_bars(symbols, start, periods):
+        dates = pd.date_range(start=start, periods=periods, freq='B', name='Date')
+        return pd.concat([
+            pd.DataFrame({'Close': 100.0, 'Volume': 1000.0, 'Symbol': symbol}, index=dates)
+            for symbol in symbols
+        ])
+    
+    @patch('utils.data_downloader.download_all_stock_data')
+    def test_only_missing_bars_are_downloaded(self, mock_download):
+        """Test, ob nur die Bars nach dem letzten gespeicherten Datum geladen werden"""
+        from utils.data_manager import EnhancedMarketDataManager
+        
+        for storage in ('file', 'partitioned'):
+            with self.subTest(storage=storage):
+                mock_download.reset_mock()
+                cache_file = os.path.join(self.tmp_dir, f'{storage}_data.parquet')
+                mdm = EnhancedMarketDataManager(cache_file=cache_file, storage=storage,
+                                                refresh_mode='incremental')
+                
+                # Bestand bis Freitag, 06.01.2023
+                mdm._write_cache(self.make_bars(['AAPL', 'MSFT'], '2023-01-02', 5))
+                mock_download.return_value = self.make_bars(['AAPL', 'MSFT'], '2023-01-09', 2)
+                
+                added = mdm.refresh_incremental(['AAPL', 'MSFT'], end_date='2023-01-10')
+                
+                mock_download.assert_called_once()
+                self.assertEqual(mock_download.call_args.args, (['AAPL', 'MSFT'], '2023-01-07', '2023-01-10'))
+                self.assertEqual(added, 4)
+                
+                result = mdm._read_cache()
+                self.assertEqual(len(result), 14)
+                self.assertEqual(result.index.max(), pd.Timestamp('2023-01-10'))
+    
+    @patch('utils.data_manager.latest_trading_date', return_value=pd.Timestamp('2023-01-10'))
+    @patch('utils.data_downloader.download_all_stock_data')
+    def test_failed_symbols_are_not_covered(self, mock_download, mock_latest):
+        """Test, ob nur die zurückgelieferten Symbole als bis end_date abgedeckt gelten"""
+        from utils.data_manager import EnhancedMarketDataManager
+        
+        mdm = EnhancedMarketDataManager(cache_file=self.cache_file, refresh_mode='incremental')
+        mdm._write_cache(self.make_bars(['AAPL', 'MSFT'], '2023-01-02', 5))
+        mdm.coverage.reset(['AAPL', 'MSFT'], '2023-01-02', '2023-01-06')
+        # MSFT schlägt fehl
+        mock_download.return_value = self.make_bars(['AAPL'], '2023-01-09', 2)
+        
+        mdm.refresh_incremental(['AAPL', 'MSFT'], end_date='2023-01-10')
+        
+        self.assertEqual(mdm.coverage.get('AAPL')[1], pd.Timestamp('2023-01-10'))
+        self.assertEqual(mdm.coverage.get('MSFT')[1], pd.Timestamp('2023-01-06'))
+    
+    @patch('utils.data_downloader.download_all_stock_data')
+    def test_up_to_date_cache_skips_download(self, mock_download):
+        """Test, ob ein aktueller Cache keinen Download auslöst"""
+        from utils.data_manager import EnhancedMarketDataManager
+        
+        mdm = EnhancedMarketDataManager(cache_file=self.cache_file, refresh_mode='incremental')
+        mdm._write_cache(self.make_bars(['AAPL'], '2023-01-02', 5))
+        
+        added = mdm.refresh_incremental(['AAPL'], end_date='2023-01-06')
+        
+        mock_download.assert_not_called()
+        self.assertEqual(added, 0)
+
+# Test für den parallelen Download
+class TestParallelDownload(unittest.TestCase):
+    
+    @patch('utils.data_downloader.download_stock_data')
+    def test_parallel_download_keeps_symbol_order(self, mock_download):
+        """Test, ob der parallele Download alle Symbole in Eingabereihenfolge liefert"""
+        from utils.data_downloader import download_all_stock_data
+        
+        def fake_download(symbol, start_date, end_date):
+            return pd.DataFrame({'Close': [1.0], 'Symbol': [symbol]},
+                                index=pd.DatetimeIndex(['2023-01-02'], name='Date'))
+        mock_download.side_effect = fake_download
+        
+        symbols = [f'SYM{i}' for i in range(20)]
+        result = download_all_stock_data(symbols, '2023-01-01', '2023-01-31', max_workers=4)
+        
+        self.assertEqual(mock_download.call_count, 20)
+        self.assertListEqual(list(result['Symbol']), symbols)
+    
+    def test_stop_request_stops_submitting(self):
+        """Test, ob nach einem Stopp-Wunsch keine weiteren Downloads gestartet werden"""
+        from utils.parallel_download import iter_downloads
+        
+        fetched = []
+        def fetch(symbol):
+            fetched.append(symbol)
+            return None
+        
+        results = list(iter_downloads([f'SYM{i}' for i in range(100)], fetch,
+                                      max_workers=4, should_stop=lambda: len(fetched) >= 8))
+        
+        # Bereits eingereihte Downloads laufen noch zu Ende, danach ist Schluss
+        self.assertLess(len(fetched), 20)
+        self.assertEqual(len(results), len(fetched))
+    
+    def test_rate_limiter_spaces_calls(self):
+        """Test, ob der Rate-Limiter die Aufrufe zeitlich verteilt"""
+        import time
+        from utils.parallel_download import RateLimiter
+        
+        limiter = RateLimiter(calls_per_second=100)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+# Test für das Streaming in eine Parquet-Datei
+class TestStreamingIngestion(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.save_path = os.path.join(self.tmp_dir, 'universe.parquet')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    @patch('utils.data_fetcher.fetch_ohlcv_data')
+    def test_symbols_are_written_in_row_groups(self, mock_fetch):
+        """Test, ob die Symbole batchweise als Row-Groups geschrieben werden"""
+        import pyarrow.parquet as pq
+        from utils.data_fetcher import stream_ohlcv_to_parquet
+        
+        def fake_fetch(symbol, start_date, end_date):
+            if symbol == 'EMPTY':
+                return pd.DataFrame()
+            dates = pd.date_range(start='2023-01-02', periods=10, freq='B', name='Date')
+            return pd.DataFrame({'Close': 1.0, 'Volume': 100.0, 'Symbol': symbol}, index=dates)
+        mock_fetch.side_effect = fake_fetch
+        
+        rows, loaded = stream_ohlcv_to_parquet(['AAPL', 'EMPTY', 'MSFT', 'GOOGL'], '2023-01-01',
+                                               '2023-01-31', self.save_path, batch_rows=10)
+        
+        self.assertEqual((rows, loaded), (30, 3))
+        self.assertEqual(pq.ParquetFile(self.save_path).num_row_groups, 3)
+        self.assertFalse(os.path.exists(self.save_path + '.tmp'))
+        
+        result = pd.read_parquet(self.save_path)
+        self.assertIsInstance(result.index, pd.DatetimeIndex)
+        self.assertListEqual(list(result['Symbol'].unique()), ['AAPL', 'MSFT', 'GOOGL'])
+
+    @patch('utils.data_fetcher.fetch_ohlcv_data')
+    def test_interrupted_ingestion_resumes(self, mock_fetch):
+        """Test, ob eine unterbrochene Ingestion beim ersten fehlenden Symbol fortsetzt"""
+        from utils.data_fetcher import stream_ohlcv_to_parquet
+        
+        def fake_fetch(symbol, start_date, end_date):
+            dates = pd.date_range(start='2023-01-02', periods=5, freq='B', name='Date')
+            return pd.DataFrame({'Close': 1.0, 'Symbol': symbol}, index=dates)
+        mock_fetch.side_effect = fake_fetch
+        symbols = [f'SYM{i}' for i in range(6)]
+        
+        # Erster Lauf bricht nach drei Symbolen ab
+        rows, loaded = stream_ohlcv_to_parquet(symbols, '2023-01-01', '2023-01-31', self.save_path,
+                                               batch_rows=5, should_stop=lambda: mock_fetch.call_count >= 3)
+        self.assertEqual((rows, loaded), (0, 0))
+        self.assertFalse(os.path.exists(self.save_path))
+        self.assertTrue(os.path.exists(self.save_path + '.checkpoint'))
+        
+        # Zweiter Lauf lädt nur die fehlenden Symbole
+        mock_fetch.reset_mock()
+        rows, loaded = stream_ohlcv_to_parquet(symbols, '2023-01-01', '2023-01-31', self.save_path,
+                                               batch_rows=5)
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual((rows, loaded), (30, 6))
+        self.assertFalse(os.path.exists(self.save_path + '.checkpoint'))
+        self.assertListEqual(list(pd.read_parquet(self.save_path)['Symbol'].unique()), symbols)
+
+    @patch('utils.data_fetcher.fetch_ohlcv_data')
+    def test_failed_symbols_stay_pending(self, mock_fetch):
+        """Test, ob ein Download-Fehler nicht als erledigt vermerkt wird und die Zieldatei erst danach entsteht"""
+        from utils.data_fetcher import stream_ohlcv_to_parquet
+        from utils.ingestion_checkpoint import IngestionCheckpoint
+        
+        def fake_fetch(symbol, start_date, end_date):
+            if symbol == 'FAIL' and mock_fetch.call_count <= 3:
+                return None
+            dates = pd.date_range(start='2023-01-02', periods=5, freq='B', name='Date')
+            return pd.DataFrame({'Close': 1.0, 'Symbol': symbol}, index=dates)
+        mock_fetch.side_effect = fake_fetch
+        symbols = ['AAPL', 'FAIL', 'MSFT']
+        
+        rows, loaded = stream_ohlcv_to_parquet(symbols, '2023-01-01', '2023-01-31', self.save_path)
+        self.assertEqual((rows, loaded), (0, 0))
+        self.assertFalse(os.path.exists(self.save_path))
+        checkpoint = IngestionCheckpoint(self.save_path, '2023-01-01', '2023-01-31')
+        self.assertListEqual(checkpoint.pending_symbols(symbols), ['FAIL'])
+        
+        # Der nächste Lauf lädt nur das fehlgeschlagene Symbol
+        rows, loaded = stream_ohlcv_to_parquet(symbols, '2023-01-01', '2023-01-31', self.save_path)
+        self.assertEqual(mock_fetch.call_count, 4)
+        self.assertEqual((rows, loaded), (15, 3))
+
+# Test für den Symbol-Metadaten-Cache
+class TestSymbolMetadataCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'symbol_metadata.parquet')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    @patch('utils.symbol_metadata.fetch_symbol_metadata')
+    def test_metadata_is_fetched_once_and_persisted(self, mock_fetch):
+        """Test, ob Metadaten nur für fehlende Symbole geladen und gespeichert werden"""
+        from utils.symbol_metadata import SymbolMetadataCache
+        
+        values = {'subtype1': lambda symbol: 'Fund' if symbol == 'SPY' else 'Equity',
+                  'security_name': lambda symbol: f'{symbol} Inc', 'gics_sector': lambda symbol: 'Tech'}
+        def fake_fetch(symbol, fields):
+            record = {'Symbol': symbol, 'fetched_fields': ','.join(sorted(fields)),
+                      'updated_at': pd.Timestamp.now()}
+            record.update({field: values[field](symbol) for field in fields})
+            return record
+        mock_fetch.side_effect = fake_fetch
+        
+        cache = SymbolMetadataCache(cache_file=self.cache_file)
+        self.assertListEqual(cache.filter_subtype(['AAPL', 'SPY', 'MSFT']), ['AAPL', 'MSFT'])
+        self.assertEqual(mock_fetch.call_count, 3)
+        # Nur das benötigte Feld wird abgefragt
+        self.assertListEqual(mock_fetch.call_args.args[1], ['subtype1'])
+        
+        # Neue Instanz liest von der Platte und lädt nur das neue Symbol nach
+        mock_fetch.reset_mock()
+        cache = SymbolMetadataCache(cache_file=self.cache_file)
+        self.assertListEqual(cache.filter_subtype(['AAPL', 'MSFT', 'GOOGL']), ['AAPL', 'MSFT', 'GOOGL'])
+        mock_fetch.assert_called_once_with('GOOGL', ['subtype1'])
+        
+        # Weitere Felder werden einmalig ergänzt
+        mock_fetch.reset_mock()
+        data = pd.DataFrame({'Symbol': ['AAPL', 'MSFT', 'AAPL', 'GOOGL']})
+        data = cache.join(data, {'security_name': 'Security_Name', 'gics_sector': 'Sector'})
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertListEqual(list(data['Security_Name']), ['AAPL Inc', 'MSFT Inc', 'AAPL Inc', 'GOOGL Inc'])
+        self.assertTrue((data['Sector'] == 'Tech').all())
+        mock_fetch.reset_mock()
+        cache.join(data, {'security_name': 'Security_Name'})
+        cache.filter_subtype(['AAPL', 'MSFT', 'GOOGL'])
+        mock_fetch.assert_not_called()
+    
+    @patch('norgatedata.database', side_effect=RuntimeError('Norgate nicht erreichbar'))
+    @patch('norgatedata.subtype1', side_effect=RuntimeError('Norgate nicht erreichbar'))
+    def test_failed_symbols_are_retried(self, mock_subtype, mock_database):
+        """Test, ob Symbole ohne erfolgreiche Abfrage nicht gespeichert und erneut angefragt werden"""
+        from utils.symbol_metadata import SymbolMetadataCache
+        
+        cache = SymbolMetadataCache(cache_file=self.cache_file)
+        self.assertListEqual(cache.filter_subtype(['AAPL']), [])
+        self.assertListEqual(cache.stale_symbols(['AAPL'], ['subtype1']), ['AAPL'])
+        
+        mock_subtype.side_effect = None
+        mock_subtype.return_value = 'Equity'
+        self.assertListEqual(cache.filter_subtype(['AAPL']), ['AAPL'])
+        self.assertEqual(mock_subtype.call_count, 2)
+        mock_database.assert_not_called()
+    
+    @patch('norgatedata.security_name', return_value='Apple Inc')
+    @patch('norgatedata.subtype1', side_effect=RuntimeError('Norgate nicht erreichbar'))
+    def test_failed_field_is_retried(self, mock_subtype, mock_name):
+        """Test, ob ein einzelnes fehlgeschlagenes Feld beim nächsten Zugriff erneut angefragt wird"""
+        from utils.symbol_metadata import SymbolMetadataCache
+        
+        cache = SymbolMetadataCache(cache_file=self.cache_file)
+        cache.ensure(['AAPL'], ['subtype1', 'security_name'])
+        self.assertListEqual(cache.stale_symbols(['AAPL'], ['security_name']), [])
+        self.assertListEqual(cache.stale_symbols(['AAPL'], ['subtype1']), ['AAPL'])
+        
+        mock_subtype.side_effect = None
+        mock_subtype.return_value = 'Equity'
+        self.assertListEqual(cache.filter_subtype(['AAPL']), ['AAPL'])
+        self.assertEqual(mock_subtype.call_count, 2)
+
+# Test für die Index-Zugehörigkeitsmatrix
+class TestIndexMembershipCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dates = pd.date_range(start='2023-01-02', periods=4, freq='B', name='Date')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    @patch('utils.index_membership.fetch_index_membership')
+    def test_membership_is_joined_from_cached_matrix(self, mock_fetch):
+        """Test, ob die Zugehörigkeit einmalig aufgebaut und vektorisiert angefügt wird"""
+        from utils.index_membership import IndexMembershipCache
+        
+        membership = {'AAPL': [True, True, False, True], 'MSFT': [False, False, True, True]}
+        def fake_fetch(symbol, index_name, start, end):
+            if symbol == 'FAIL':
+                return None
+            return pd.Series(membership.get(symbol, []), index=self.dates if symbol in membership else None,
+                             name=symbol, dtype=bool)
+        mock_fetch.side_effect = fake_fetch
+        panel = pd.concat([
+            pd.DataFrame({'Close': 1.0, 'Symbol': symbol}, index=self.dates)
+            for symbol in ['AAPL', 'MSFT', 'XXX', 'FAIL']
+        ])
+        
+        cache = IndexMembershipCache(cache_dir=self.tmp_dir)
+        result = cache.join(panel, 'S&P 500')
+        
+        self.assertEqual(mock_fetch.call_count, 4)
+        self.assertListEqual(list(result['In_S&P_500']),
+                             membership['AAPL'] + membership['MSFT'] + [False] * 8)
+        
+        # Zweite Instanz liest die Matrix von der Platte, nur die fehlgeschlagene Abfrage wird wiederholt
+        mock_fetch.reset_mock()
+        membership['FAIL'] = [True] * 4
+        mock_fetch.side_effect = lambda symbol, index_name, start, end: pd.Series(
+            membership[symbol], index=self.dates, name=symbol)
+        result = IndexMembershipCache(cache_dir=self.tmp_dir).join(panel.reset_index(), 'S&P 500')
+        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_args.args[0], 'FAIL')
+        self.assertEqual(int(result['In_S&P_500'].sum()), 9)
+
+# Test für das Marktdaten-Panel mit Symbol-Offsets
+class TestMarketPanel(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.date_range(start='2023-01-02', periods=3, freq='B', name='Date')
+        # Absichtlich unsortiert: Symbole gemischt, Datum absteigend
+        self.df = pd.concat([
+            pd.DataFrame({'Close': [3.0, 2.0, 1.0], 'Symbol': 'MSFT'}, index=dates[::-1]),
+            pd.DataFrame({'Close': [10.0, 20.0, 30.0], 'Symbol': 'AAPL'}, index=dates)
+        ])
+
+    def test_offsets_and_slices(self):
+        """Test, ob Offsets korrekt sind und Slices nach Datum sortiert vorliegen"""
+        from utils.market_panel import MarketPanel
+
+        panel = MarketPanel.from_frame(self.df)
+
+        self.assertListEqual(list(panel.symbols), ['AAPL', 'MSFT'])
+        self.assertListEqual(list(panel.offsets), [0, 3, 6])
+        self.assertEqual(panel.bounds('MSFT'), (3, 6))
+        self.assertListEqual(list(panel.get('MSFT')['Close']), [1.0, 2.0, 3.0])
+        self.assertListEqual(list(panel.values('AAPL', 'Close')), [10.0, 20.0, 30.0])
+        self.assertListEqual(list(panel.positions()), [0, 1, 2, 0, 1, 2])
+        self.assertListEqual(list(panel.last_rows()), [2, 5])
+        self.assertNotIn('XXX', panel)
+        self.assertListEqual([s for s, _ in panel.iter_symbols(['MSFT', 'XXX'])], ['MSFT'])
+
+    def test_sorted_input_is_not_copied(self):
+        """Test, ob bereits sortierte Daten ohne Kopie übernommen werden"""
+        from utils.market_panel import MarketPanel
+
+        sorted_df = MarketPanel.from_frame(self.df).frame
+        panel = MarketPanel.from_frame(sorted_df)
+        self.assertIs(panel.frame, sorted_df)
+
+# Test für Spaltenauswahl und kompakte Datentypen
+class TestCompactMarketData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        dates = pd.date_range(start='2023-01-02', periods=3, freq='B', name='Date')
+        self.df = pd.concat([
+            pd.DataFrame({'Open': 1.0, 'Close': [1.0, 2.0, 3.0], 'Volume': 100.0, 'Symbol': symbol}, index=dates)
+            for symbol in ['AAPL', 'MSFT']
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_aliases_share_memory(self):
+        """Test, ob Kleinbuchstaben-Spalten keine Kopien sind und nur einmal gezählt werden"""
+        import numpy as np
+        from utils.data_manager import compact_market_data, memory_report
+
+        result = compact_market_data(self.df, categorical_symbols=True)
+
+        self.assertIsInstance(result['Symbol'].dtype, pd.CategoricalDtype)
+        self.assertEqual(compact_market_data(self.df)['Symbol'].dtype, object)
+        self.assertTrue(np.shares_memory(result['Close'].to_numpy(), result['close'].to_numpy()))
+        report = memory_report(result)
+        self.assertEqual(report['columns']['close'], 0)
+        self.assertLess(report['total_bytes'], memory_report(self.df)['total_bytes'] + 3 * 8 * len(self.df))
+
+    @patch('norgatedata.status', return_value=False)
+    def test_load_market_data_projection(self, mock_status):
+        """Test, ob load_market_data nur die angefragten Spalten in float32 liefert"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        cache_file = os.path.join(self.tmp_dir, 'cache.parquet')
+        self.df.to_parquet(cache_file)
+        mdm = EnhancedMarketDataManager(cache_file=cache_file)
+
+        result = mdm.load_market_data(symbols=['MSFT'], columns=['close'], price_dtype='float32')
+
+        self.assertCountEqual(result.columns, ['Close', 'Symbol', 'close'])
+        self.assertEqual(result['Close'].dtype, 'float32')
+        self.assertListEqual(list(result['Symbol'].unique()), ['MSFT'])
+
+# Test für die Abdeckung des Caches je Symbol
+class TestCacheCoverage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def make_bars(symbol, start, end):
+        dates = pd.date_range(start=start, end=end, freq='B', name='Date')
+        return pd.DataFrame({'Close': 100.0, 'Symbol': symbol}, index=dates)
+
+    def test_gaps_cover_head_and_tail(self):
+        """Test, ob nur die Zeiträume vor und nach der Abdeckung als Lücke gelten"""
+        from utils.cache_coverage import CacheCoverage
+
+        coverage = CacheCoverage(os.path.join(self.tmp_dir, 'coverage.json'))
+        coverage.extend(['AAPL', 'MSFT'], '2020-01-01', '2020-12-31')
+
+        gaps = coverage.gaps(['AAPL', 'NEW'], '2019-06-01', '2021-03-01')
+        self.assertDictEqual(gaps, {
+            ('2019-06-01', '2019-12-31'): ['AAPL'],
+            ('2021-01-01', '2021-03-01'): ['AAPL'],
+            ('2019-06-01', '2021-03-01'): ['NEW']
+        })
+        self.assertDictEqual(coverage.gaps(['MSFT'], '2020-03-01', '2020-06-30'), {})
+
+    def test_concurrent_saves_merge_coverage(self):
+        """Test, ob Prozesse mit verschiedenen Symbolen die Abdeckung des anderen nicht überschreiben"""
+        import glob
+        import multiprocessing
+        from utils.cache_coverage import CacheCoverage
+
+        path = os.path.join(self.tmp_dir, 'coverage.json')
+        loaded_before = CacheCoverage(path)
+        loaded_before.load()
+
+        def extend_and_save(symbol):
+            coverage = CacheCoverage(path)
+            coverage.load()
+            coverage.extend([symbol], '2020-01-01', '2020-12-31')
+            coverage.save()
+
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=extend_and_save, args=(f'SYM{i}',)) for i in range(6)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # Eine vorher geladene Instanz überschreibt die Änderungen der anderen Prozesse nicht
+        loaded_before.extend(['AAPL'], '2021-01-01', '2021-06-30')
+        loaded_before.save()
+        self.assertListEqual(sorted(CacheCoverage(path).symbols()), ['AAPL'] + [f'SYM{i}' for i in range(6)])
+        self.assertListEqual(glob.glob(os.path.join(self.tmp_dir, '*.tmp')), [])
+
+    @patch('utils.data_manager.latest_trading_date', return_value=None)
+    @patch('norgatedata.status', return_value=True)
+    @patch('utils.data_downloader.download_all_stock_data')
+    def test_only_uncovered_head_is_downloaded(self, mock_download, mock_status, mock_latest):
+        """Test, ob ein älterer Zeitraum einmalig nachgeladen wird ohne das Cache-Alter zu ändern"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        cache_file = os.path.join(self.tmp_dir, 'cache.parquet')
+        self.make_bars('AAPL', '2023-01-02', '2023-01-06').to_parquet(cache_file)
+        old_mtime = (datetime.now() - timedelta(days=3)).timestamp()
+        os.utime(cache_file, (old_mtime, old_mtime))
+        mock_download.return_value = self.make_bars('AAPL', '2022-12-26', '2022-12-30')
+
+        mdm = EnhancedMarketDataManager(cache_file=cache_file)
+        rows = mdm.fill_coverage_gaps(['AAPL'], '2022-12-25', '2023-01-06')
+
+        self.assertEqual(rows, 5)
+        mock_download.assert_called_once()
+        self.assertEqual(mock_download.call_args.args, (['AAPL'], '2022-12-25', '2023-01-01'))
+        self.assertEqual(len(pd.read_parquet(cache_file)), 10)
+        self.assertAlmostEqual(os.path.getmtime(cache_file), old_mtime, places=3)
+
+        # Zweite Anfrage im selben Zeitraum: keine Norgate-Aufrufe
+        mock_download.reset_mock()
+        fresh = EnhancedMarketDataManager(cache_file=cache_file)
+        self.assertEqual(fresh.fill_coverage_gaps(['AAPL'], '2022-12-25', '2023-01-06'), 0)
+        mock_download.assert_not_called()
+
+    @patch('utils.data_manager.latest_trading_date', return_value=None)
+    @patch('norgatedata.status', return_value=True)
+    @patch('utils.data_downloader.download_all_stock_data')
+    def test_failed_symbols_stay_uncovered(self, mock_download, mock_status, mock_latest):
+        """Test, ob nur geladene Symbole und Symbole ohne Daten im Zeitraum als abgedeckt gelten"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        cache_file = os.path.join(self.tmp_dir, 'cache.parquet')
+        pd.concat([self.make_bars(symbol, '2023-01-02', '2023-01-06')
+                   for symbol in ('AAPL', 'NEW', 'FAIL')]).to_parquet(cache_file)
+
+        def fake_download(symbols, start_date, end_date, no_data=None):
+            # NEW: noch nicht gelistet, FAIL: Download-Fehler
+            no_data.append('NEW')
+            return self.make_bars('AAPL', '2022-12-26', '2022-12-30')
+        mock_download.side_effect = fake_download
+
+        mdm = EnhancedMarketDataManager(cache_file=cache_file)
+        mdm.fill_coverage_gaps(['AAPL', 'NEW', 'FAIL'], '2022-12-25', '2023-01-06')
+
+        gaps = mdm.coverage.gaps(['AAPL', 'NEW', 'FAIL'], '2022-12-25', '2023-01-06')
+        self.assertDictEqual(gaps, {('2022-12-25', '2023-01-01'): ['FAIL']})
+
+# Test für den gemeinsamen Symbol-Store aller Watchlists
+class TestSharedSymbolStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def fake_download(symbols, start_date, end_date, no_data=None):
+        dates = pd.date_range(start=start_date, end=end_date, freq='B', name='Date')
+        return pd.concat([pd.DataFrame({'Close': 100.0, 'Symbol': symbol}, index=dates) for symbol in symbols])
+
+    @patch('utils.data_manager.latest_trading_date', return_value=None)
+    @patch('norgatedata.status', return_value=True)
+    @patch('utils.data_downloader.download_all_stock_data')
+    @patch('utils.data_manager.get_watchlist_symbols')
+    @patch('utils.data_manager.Config.get_project_path')
+    def test_overlapping_watchlists_share_symbols(self, mock_path, mock_members, mock_download, mock_status,
+                                                  mock_latest):
+        """Test, ob überlappende Watchlists gemeinsame Symbole nur einmal laden und speichern"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        mock_path.side_effect = lambda *parts: os.path.join(self.tmp_dir, *parts)
+        members = {'Liste A': ['AAPL', 'MSFT'], 'Liste B': ['AAPL', 'GOOGL']}
+        mock_members.side_effect = lambda name: members[name]
+        mock_download.side_effect = self.fake_download
+
+        list_a = EnhancedMarketDataManager(watchlist_name='Liste A')
+        self.assertEqual(list_a.storage, 'shared')
+        list_a.load_market_data(start_date='2023-01-02', end_date='2023-01-06')
+
+        result = EnhancedMarketDataManager(watchlist_name='Liste B').load_market_data(
+            start_date='2023-01-02', end_date='2023-01-06')
+
+        # Für Liste B wird nur das fehlende Symbol geladen
+        self.assertListEqual([c.args[0] for c in mock_download.call_args_list], [['AAPL', 'MSFT'], ['GOOGL']])
+        self.assertListEqual(sorted(result['Symbol'].unique()), ['AAPL', 'GOOGL'])
+        self.assertEqual(len(result), 10)
+        self.assertEqual(len(list_a.store.read()), 15)
+
+# Test für den Panel-Cache im Speicher
+class TestPanelCache(unittest.TestCase):
+
+    @staticmethod
+    def make_panel(rows):
+        return pd.DataFrame({'Close': [1.0] * rows, 'Symbol': 'AAPL'},
+                            index=pd.date_range('2023-01-02', periods=rows, name='Date'))
+
+    def test_lru_eviction_within_budget(self):
+        """Test, ob bei Budgetüberschreitung der am längsten ungenutzte Eintrag verworfen wird"""
+        from utils.panel_cache import PanelCache
+        from utils.data_manager import memory_report
+
+        panel = self.make_panel(100)
+        size = memory_report(panel)['total_bytes']
+        cache = PanelCache(max_bytes=2 * size, ttl=60)
+
+        cache.put('a', panel)
+        cache.put('b', panel)
+        self.assertIsNotNone(cache.get('a'))  # 'a' zuletzt genutzt
+        cache.put('c', panel)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 2 * size)
+
+    def test_loader_called_once_and_entries_expire(self):
+        """Test, ob Panels aus dem Speicher kommen und nach Ablauf neu geladen werden"""
+        from utils.panel_cache import PanelCache
+
+        now = [0.0]
+        cache = PanelCache(max_bytes=10 ** 9, ttl=60, clock=lambda: now[0])
+        loader = MagicMock(return_value=self.make_panel(5))
+
+        first = cache.get_or_load('key', loader)
+        first['Neu'] = 1.0  # Flache Kopie - der Cache bleibt unverändert
+        second = cache.get_or_load('key', loader)
+        self.assertEqual(loader.call_count, 1)
+        self.assertNotIn('Neu', second.columns)
+
+        now[0] = 61.0
+        cache.get_or_load('key', loader)
+        self.assertEqual(loader.call_count, 2)
+
+# Test für das speicherabgebildete Datum x Symbol Panel
+class TestMemmapPanel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        dates = pd.date_range(start='2023-01-02', periods=4, freq='B', name='Date')
+        self.df = pd.concat([
+            pd.DataFrame({'Close': [1.0, 2.0, 3.0, 4.0], 'Volume': 10.0, 'Symbol': 'AAPL'}, index=dates),
+            # MSFT ohne ersten Bar
+            pd.DataFrame({'Close': [20.0, 30.0, 40.0], 'Volume': 20.0, 'Symbol': 'MSFT'}, index=dates[1:])
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_build_open_and_roundtrip(self):
+        """Test, ob das Panel als Memmap geöffnet wird und den Long-Ausschnitt korrekt liefert"""
+        import numpy as np
+        from utils.memmap_panel import MemmapPanel
+
+        root = os.path.join(self.tmp_dir, 'panel')
+        MemmapPanel.build(self.df, root)
+        panel = MemmapPanel.open(root)
+
+        self.assertEqual(panel.shape, (4, 2))
+        self.assertIsInstance(panel.field('Close'), np.memmap)
+        self.assertTrue(np.isnan(panel.frame('Close').loc['2023-01-02', 'MSFT']))
+
+        result = panel.to_long(symbols=['MSFT', 'XXX'], start_date='2023-01-03')
+        self.assertListEqual(list(result['Close']), [20.0, 30.0, 40.0])
+        self.assertTrue((result['Symbol'] == 'MSFT').all())
+        self.assertEqual(len(panel.to_long()), len(self.df))
+
+    def test_manager_rebuilds_after_cache_change(self):
+        """Test, ob der Manager das Panel nur bei geändertem Cache neu aufbaut"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        cache_file = os.path.join(self.tmp_dir, 'cache.parquet')
+        self.df.to_parquet(cache_file)
+        mdm = EnhancedMarketDataManager(cache_file=cache_file)
+
+        first = mdm.open_panel()
+        self.assertEqual(mdm.open_panel().meta['built_at'], first.meta['built_at'])
+
+        newer = (datetime.now() + timedelta(seconds=5)).timestamp()
+        os.utime(cache_file, (newer, newer))
+        self.assertNotEqual(mdm.open_panel().meta['built_at'], first.meta['built_at'])
+
+# Test für die Aktualitätsprüfung über das letzte Norgate-Handelsdatum
+class TestNorgateUpdateProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'cache.parquet')
+        dates = pd.date_range(start='2023-01-02', periods=5, freq='B', name='Date')
+        pd.DataFrame({'Close': 1.0, 'Symbol': 'AAPL'}, index=dates).to_parquet(self.cache_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_validity_follows_latest_trading_date(self):
+        """Test, ob nur ein neuerer Bar bei Norgate den Cache ungültig macht, unabhängig vom Dateialter"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        old = (datetime.now() - timedelta(days=10)).timestamp()
+        os.utime(self.cache_file, (old, old))
+        mdm = EnhancedMarketDataManager(cache_file=self.cache_file, max_age_days=1)
+
+        with patch('utils.data_manager.latest_trading_date', return_value=pd.Timestamp('2023-01-06')):
+            self.assertTrue(mdm.is_cache_valid())
+
+        os.utime(self.cache_file)
+        with patch('utils.data_manager.latest_trading_date', return_value=pd.Timestamp('2023-01-09')):
+            self.assertFalse(mdm.is_cache_valid())
+
+    def test_past_end_date_ignores_newer_bars(self):
+        """Test, ob ein Zeitraum in der Vergangenheit trotz neuerer Bars bei Norgate gültig bleibt"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        mdm = EnhancedMarketDataManager(cache_file=self.cache_file, max_age_days=1)
+        with patch('utils.data_manager.latest_trading_date', return_value=pd.Timestamp('2023-03-01')):
+            self.assertTrue(mdm.is_cache_valid(end_date='2023-01-06'))
+            self.assertFalse(mdm.is_cache_valid(end_date='2023-01-10'))
+            self.assertFalse(mdm.is_cache_valid())
+
+    def test_coverage_ends_at_latest_trading_date(self):
+        """Test, ob die Abdeckung nur bis zum letzten bei Norgate verfügbaren Tag reicht"""
+        from utils.data_manager import EnhancedMarketDataManager
+
+        today = pd.Timestamp(datetime.now().date())
+        with patch('utils.data_manager.latest_trading_date', return_value=today - timedelta(days=3)):
+            self.assertEqual(EnhancedMarketDataManager._coverage_end(),
+                             (today - timedelta(days=3)).strftime('%Y-%m-%d'))
+            self.assertEqual(EnhancedMarketDataManager._coverage_end('2023-01-06'), '2023-01-06')
+        with patch('utils.data_manager.latest_trading_date', return_value=None):
+            self.assertEqual(EnhancedMarketDataManager._coverage_end(),
+                             (today - timedelta(days=1)).strftime('%Y-%m-%d'))
+
+    @patch('norgatedata.last_quoted_date', return_value='2023-01-06')
+    @patch('norgatedata.status', return_value=True)
+    def test_probe_is_cached(self, mock_status, mock_last_quoted):
+        """Test, ob das Referenzsymbol nur einmal innerhalb der TTL abgefragt wird"""
+        from utils.norgate_update_probe import latest_trading_date, invalidate_latest_trading_date
+
+        invalidate_latest_trading_date()
+        self.assertEqual(latest_trading_date(), pd.Timestamp('2023-01-06'))
+        latest_trading_date()
+        mock_last_quoted.assert_called_once_with('$SPX')
+        invalidate_latest_trading_date()
+
+# Test für die vektorisierte Indikator-Engine
+class TestIndicatorEngine(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        rng = np.random.default_rng(1)
+        frames = []
+        # Unterschiedliche Längen, damit die Symbole nicht am selben Tag beginnen
+        for symbol, periods in [('AAA', 80), ('BBB', 60)]:
+            dates = pd.date_range(end='2023-06-30', periods=periods, freq='B', name='Date')
+            close = 100 + np.cumsum(rng.normal(size=periods))
+            frames.append(pd.DataFrame({
+                'High': close + 1, 'Low': close - 1, 'Close': close, 'Symbol': symbol
+            }, index=dates))
+        self.df = pd.concat(frames)
+
+    def test_matches_ta_per_symbol(self):
+        """Test, ob die Indikatoren den ta-Werten je Symbol entsprechen"""
+        import numpy as np
+        import ta
+        from screeners.indicators import IndicatorEngine
+
+        engine = IndicatorEngine.from_frame(self.df)
+        frame = engine.panel.frame
+        reference = {
+            'ema': lambda s: ta.trend.ema_indicator(s['Close'], 10),
+            'rsi': lambda s: ta.momentum.rsi(s['Close']),
+            'macd': lambda s: ta.trend.macd_diff(s['Close']),
+            'roc': lambda s: ta.momentum.roc(s['Close'], 5),
+            'atr': lambda s: ta.volatility.average_true_range(s['High'], s['Low'], s['Close'], 14).replace(0, np.nan)
+        }
+        results = {
+            'ema': engine.ema(10), 'rsi': engine.rsi(), 'macd': engine.macd_diff(),
+            'roc': engine.roc(5), 'atr': engine.atr(14)
+        }
+        for name, func in reference.items():
+            expected = np.concatenate([func(group).to_numpy() for _, group in frame.groupby('Symbol', sort=False)])
+            np.testing.assert_allclose(results[name], expected, rtol=1e-9, equal_nan=True, err_msg=name)
+
+    def test_no_bleed_across_symbols(self):
+        """Test, ob jedes Symbol mit einer eigenen Anlaufphase beginnt"""
+        import numpy as np
+        from screeners.indicators import IndicatorEngine
+
+        engine = IndicatorEngine.from_frame(self.df)
+        start, _ = engine.panel.bounds('BBB')
+        ema = engine.ema(10)
+        self.assertTrue(np.isnan(ema[start:start + 9]).all())
+        self.assertFalse(np.isnan(ema[start + 9]))
+        self.assertTrue(np.isnan(engine.roc(5)[start:start + 5]).all())
+        self.assertIs(engine.ema(10), ema)
+
+# Test für den gespeicherten Indikator-Zustand
+class TestIndicatorStateStore(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(2)
+        dates = pd.date_range(end='2023-06-30', periods=80, freq='B', name='Date')
+        self.df = pd.concat([
+            pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=80)), 'Symbol': symbol}, index=dates)
+            for symbol in ['AAA', 'BBB']
+        ])
+        self.cut = dates[60]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _store(self):
+        from screeners.indicator_state import IndicatorStateStore
+        return IndicatorStateStore(ema_windows=[10], path=os.path.join(self.temp_dir, 'state.parquet'))
+
+    def test_incremental_update_matches_full_history(self):
+        """Test, ob die Fortsetzung des Zustands der vollständigen Berechnung entspricht"""
+        import numpy as np
+        from screeners.indicators import IndicatorEngine
+
+        self.assertEqual(self._store().update(self.df[self.df.index <= self.cut]), 122)
+        store = self._store()  # Neu aus der Datei geladen
+        self.assertEqual(store.required_start(['AAA', 'BBB'], '2020-01-01'), self.cut.strftime('%Y-%m-%d'))
+        self.assertEqual(store.update(self.df[self.df.index >= self.cut]), 38)
+        self.assertEqual(store.update(self.df[self.df.index >= self.cut]), 0)
+
+        engine = IndicatorEngine.from_frame(self.df)
+        last_rows = engine.panel.last_rows()
+        latest = store.latest(['AAA', 'BBB'])
+        np.testing.assert_allclose(latest['EMA_10'], engine.ema(10)[last_rows], rtol=1e-9)
+        np.testing.assert_allclose(latest['RSI_14'], engine.rsi(14)[last_rows], rtol=1e-9)
+        np.testing.assert_allclose(latest['MACD_12_26_9'], engine.macd_diff()[last_rows], rtol=1e-9)
+
+    def test_adjusted_prices_drop_state(self):
+        """Test, ob rückwirkend geänderte Kurse den Zustand des Symbols verwerfen"""
+        store = self._store()
+        store.update(self.df[self.df.index <= self.cut])
+
+        adjusted = self.df[self.df.index >= self.cut].copy()
+        adjusted.loc[adjusted['Symbol'] == 'AAA', 'Close'] *= 0.5
+        store.update(adjusted)
+
+        self.assertListEqual(store.missing(['AAA', 'BBB']), ['AAA'])
+        self.assertEqual(store.required_start(['AAA', 'BBB'], '2020-01-01'), '2020-01-01')
+
+# Test für das Screening zum Stichtag
+class TestLatestOnlyScreening(unittest.TestCase):
+
+    def test_lookback_start_covers_bars(self):
+        """Test, ob das berechnete Startdatum genügend Handelstage enthält"""
+        from screeners.run_screener import lookback_start
+
+        start = lookback_start('2024-06-28', 140)
+        self.assertGreaterEqual(len(pd.bdate_range(start, '2024-06-28')), 140)
+        self.assertLess(len(pd.bdate_range(start, '2024-06-28')), 252)
+
+    def test_screen_as_of_matches_full_history(self):
+        """Test, ob das Lookback-Fenster am Stichtag dieselben Treffer liefert wie die volle Historie"""
+        import numpy as np
+        from screeners.ema_touch import EmaTouchScreener
+
+        rng = np.random.default_rng(3)
+        dates = pd.date_range(end='2024-06-28', periods=400, freq='B', name='Date')
+        frames = []
+        for i in range(100):
+            close = 100 + np.cumsum(rng.normal(size=len(dates)))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6, 'Symbol': f"S{i:03d}"}, index=dates))
+        df = pd.concat(frames)
+        screener = EmaTouchScreener(min_price=1, min_volume=1)
+
+        full = screener.screen(df)
+        expected = sorted(full.loc[full['Date'] == dates[-1], 'Symbol'])
+        window = df[df.index >= dates[-screener.lookback_bars]]
+        result = screener.screen_as_of(window)
+
+        self.assertTrue(expected)
+        self.assertListEqual(sorted(result['Symbol']), expected)
+        self.assertTrue((result['Date'] == dates[-1]).all())
+
+# Test für das gemeinsame Screening mehrerer Screener
+class TestBatchScreening(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(4)
+        dates = pd.date_range(end='2024-06-28', periods=300, freq='B', name='Date')
+        frames = []
+        for i in range(40):
+            close = 100 + np.cumsum(rng.normal(scale=2, size=len(dates)))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6, 'Symbol': f"S{i:03d}"}, index=dates))
+        self.df = pd.concat(frames)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_pass_matches_individual_screens(self):
+        """Test, ob ein gemeinsamer Lauf dieselben Ergebnisse liefert und Indikatoren nur einmal berechnet"""
+        from screeners import run_screener
+        from screeners.ema_touch import EmaTouchScreener
+        from screeners.indicators import IndicatorEngine
+        from screeners.roc130 import ROC130Screener
+
+        configs = [
+            {'screener_type': 'ema_touch', 'parameters': {'min_price': 1, 'min_volume': 1}},
+            {'screener_type': 'ema_touch', 'parameters': {'min_price': 1, 'min_volume': 1, 'touch_threshold': 0.05}},
+            {'screener_type': 'roc130', 'parameters': {'roc_threshold': 10.0}}
+        ]
+        compute = IndicatorEngine.compute
+        with patch.object(run_screener, 'get_symbols', return_value=['S000']), \
+             patch.object(run_screener, 'load_market_panel', return_value=self.df) as load, \
+             patch.object(run_screener, 'EnhancedMarketDataManager'), \
+             patch('config.config.Config.get_project_path', side_effect=lambda *p: os.path.join(self.temp_dir, p[-1])), \
+             patch.object(IndicatorEngine, 'compute', autospec=True, side_effect=compute) as computed:
+            results = run_screener.run_batch_screening(configs, end_date='2024-06-28')
+
+        self.assertEqual(load.call_count, 1)
+        self.assertListEqual(list(results), ['ema_touch', 'ema_touch_2', 'roc130'])
+        # EMA, RSI, MACD und ROC - die zweite EMA-Konfiguration teilt alle Spalten
+        self.assertEqual(computed.call_count, 4)
+
+        expected = EmaTouchScreener(min_price=1, min_volume=1, touch_threshold=0.05).screen(self.df)
+        pd.testing.assert_frame_equal(results['ema_touch_2'].reset_index(drop=True),
+                                      expected.reset_index(drop=True))
+        expected = ROC130Screener(roc_threshold=10.0).screen(self.df)
+        self.assertFalse(expected.empty)
+        pd.testing.assert_frame_equal(results['roc130'].reset_index(drop=True), expected.reset_index(drop=True))
+
+# Test für das Screening über Symbol-Shards
+class TestShardedScreening(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        rng = np.random.default_rng(5)
+        dates = pd.date_range(end='2024-06-28', periods=300, freq='B', name='Date')
+        frames = []
+        for i in range(12):
+            close = 100 + np.cumsum(rng.normal(size=len(dates[i:])))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6 + i, 'Symbol': f"S{i:03d}"}, index=dates[i:]))
+        self.df = pd.concat(frames)
+
+    def test_shard_bounds_split_between_symbols(self):
+        """Test, ob Shards nur an Symbolgrenzen geschnitten werden und alle Zeilen abdecken"""
+        import numpy as np
+        from screeners.sharded import shard_bounds
+
+        offsets = np.array([0, 10, 15, 40, 41, 60])
+        bounds = shard_bounds(offsets, 3)
+
+        self.assertEqual(bounds[0][0], 0)
+        self.assertEqual(bounds[-1][1], 60)
+        for (_, end), (start, _) in zip(bounds[:-1], bounds[1:]):
+            self.assertEqual(end, start)
+            self.assertIn(end, offsets)
+
+    def test_sharded_matches_sequential(self):
+        """Test, ob das Screening in Worker-Prozessen dasselbe Ergebnis liefert wie ein Lauf über alle Daten"""
+        import pickle
+        from screeners.base_screener import DetachedProgress
+        from screeners.ema_touch import EmaTouchScreener
+        from screeners.sharded import screen_sharded
+
+        screener = EmaTouchScreener(min_price=1, min_volume=1, touch_threshold=0.05)
+        self.assertIsInstance(pickle.loads(pickle.dumps(screener)).process_manager, DetachedProgress)
+
+        expected = screener.screen(self.df)
+        expected_as_of = screener.screen_as_of(self.df)
+        with patch('config.config.Config.SCREENER_MIN_SYMBOLS_PER_SHARD', 3):
+            result = screen_sharded(screener, self.df, workers=2, process_manager=MagicMock(stop_requested=False))
+            result_as_of = screen_sharded(screener, self.df, workers=2, as_of=True,
+                                          process_manager=MagicMock(stop_requested=False))
+
+        self.assertFalse(expected.empty)
+        for actual, wanted in ((result, expected), (result_as_of, expected_as_of)):
+            pd.testing.assert_frame_equal(actual.sort_values(['Date', 'Symbol']).reset_index(drop=True),
+                                          wanted.sort_values(['Date', 'Symbol']).reset_index(drop=True),
+                                          check_dtype=False)
+
+    def test_index_membership_added_once_after_merge(self):
+        """Test, ob die Index-Zugehörigkeit einmal für das zusammengeführte Ergebnis angefügt wird"""
+        from screeners.ema_touch import EmaTouchScreener
+        from screeners.sharded import screen_sharded
+
+        def join(data, index_name, column_name):
+            data = data.copy()
+            data[column_name] = True
+            return data
+        membership = MagicMock()
+        membership.join.side_effect = join
+
+        screener = EmaTouchScreener(min_price=1, min_volume=1, touch_threshold=0.05, required_indices=['S&P 500'])
+        with patch('config.config.Config.SCREENER_MIN_SYMBOLS_PER_SHARD', 3), \
+                patch('screeners.ema_touch.get_index_membership_cache', return_value=membership):
+            expected = screener.screen(self.df)
+            membership.join.reset_mock()
+            result = screen_sharded(screener, self.df, workers=2, process_manager=MagicMock(stop_requested=False))
+
+        membership.join.assert_called_once()
+        self.assertEqual(len(membership.join.call_args.args[0]), len(expected))
+        self.assertEqual(len(result), len(expected))
+        self.assertTrue(result['In_S&P_500'].all())
+        self.assertListEqual(screener.required_indices, ['S&P 500'])
+
+# Test für das historische Replay eines Screeners
+class TestScreenerReplay(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        rng = np.random.default_rng(6)
+        dates = pd.date_range(end='2024-06-28', periods=300, freq='B', name='Date')
+        frames = []
+        for i in range(20):
+            close = 100 + np.cumsum(rng.normal(scale=2, size=len(dates)))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6, 'Symbol': f"S{i:03d}"}, index=dates))
+        self.df = pd.concat(frames)
+        self.dates = dates
+
+    def test_replay_matches_daily_screens(self):
+        """Test, ob das Signal-Panel für jeden Tag dieselben Treffer enthält wie ein Screening zum Stichtag"""
+        from screeners.roc130 import ROC130Screener
+
+        screener = ROC130Screener(roc_period=20, roc_threshold=10.0)
+        start_date = self.dates[-60]
+        signals = screener.replay(self.df, start_date=start_date.strftime('%Y-%m-%d'))
+
+        self.assertFalse(signals.empty)
+        self.assertListEqual(list(signals.columns), ['Date', 'Symbol', 'Score'])
+        self.assertGreaterEqual(signals['Date'].min(), start_date)
+        for date in self.dates[-60::7]:
+            daily = screener.screen_as_of(self.df[self.df.index <= date])
+            replayed = signals[signals['Date'] == date]
+            self.assertListEqual(sorted(replayed['Symbol']), sorted(daily['Symbol']))
+            self.assertListEqual(sorted(replayed['Score']), sorted(daily['ROC']))
+
+    def test_roc_screen_applies_price_and_volume(self):
+        """Test, ob der ROC130-Screener Symbole unter min_price bzw. min_volume ausschließt"""
+        from screeners.roc130 import ROC130Screener
+
+        df = self.df.copy()
+        df.loc[df['Symbol'] == 'S000', 'Volume'] = 10.0
+        unfiltered = ROC130Screener(roc_period=20, roc_threshold=10.0, min_volume=1).screen(df)
+        result = ROC130Screener(roc_period=20, roc_threshold=10.0, min_volume=1000).screen(df)
+
+        self.assertIn('S000', set(unfiltered['Symbol']))
+        self.assertNotIn('S000', set(result['Symbol']))
+        self.assertEqual(len(result), (unfiltered['Symbol'] != 'S000').sum())
+
+    def test_strategy_holds_after_signal(self):
+        """Test, ob die Signal-Strategie nach einem Treffer hold_days Bars long ist"""
+        from strategies.screener_signal import ScreenerSignalStrategy
+
+        signals = pd.DataFrame({'Date': [self.dates[10], self.dates[12]], 'Symbol': ['S001', 'S001'],
+                                'Score': [1.0, 1.0]})
+        strategy = ScreenerSignalStrategy('roc130', hold_days=3, signals=signals)
+        result = strategy.generate_signals(self.df[self.df['Symbol'].isin(['S000', 'S001'])])
+
+        self.assertFalse(result.loc[result['Symbol'] == 'S000', 'signal'].any())
+        held = result.loc[result['Symbol'] == 'S001', 'signal'].to_numpy()
+        self.assertListEqual(list(held[9:17]), [False, True, True, True, True, True, False, False])
+
+# Test für den Ausdrucks-Screener
+class TestExpressionScreener(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        rng = np.random.default_rng(7)
+        dates = pd.date_range(end='2024-06-28', periods=300, freq='B', name='Date')
+        frames = []
+        for i in range(20):
+            close = 100 + np.cumsum(rng.normal(scale=2, size=len(dates)))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6, 'Symbol': f"S{i:03d}"}, index=dates))
+        self.df = pd.concat(frames)
+
+    def test_compile_deduplicates_indicators(self):
+        """Test, ob gleiche Indikatoren nur einmal angefordert werden und Syntaxfehler erkannt werden"""
+        from screeners.expression import ExpressionScreener, compile_expression
+
+        screener = ExpressionScreener('close > ema(20) and (close - ema(20)) / ema(20) < 0.05 or RSI(14) < 30')
+        self.assertDictEqual(screener.indicator_columns(), {'EMA_20': ('ema', 20), 'RSI_14': ('rsi', 14)})
+        self.assertIs(compile_expression('close > ema(20)'), compile_expression('close > ema(20)'))
+        for expression in ('close >', 'close + 1', 'close > foo(3)', 'ema(x) > 1', 'close > 1 and 2'):
+            with self.assertRaises(ValueError):
+                ExpressionScreener(expression)
+
+    def test_matches_handwritten_screeners(self):
+        """Test, ob Ausdrücke dieselben Treffer liefern wie die Screener-Klassen"""
+        from screeners.ema_touch import EmaTouchScreener
+        from screeners.expression import ExpressionScreener
+        from screeners.roc130 import ROC130Screener
+
+        expected = ROC130Screener(roc_period=20, roc_threshold=10.0, min_price=1, min_volume=1).screen(self.df)
+        result = ExpressionScreener('roc(20) crosses_above 10', min_price=1, min_volume=1).screen(self.df)
+        self.assertFalse(expected.empty)
+        self.assertListEqual(sorted(zip(result['Date'], result['Symbol'])),
+                             sorted(zip(expected['Date'], expected['Symbol'])))
+
+        expected = EmaTouchScreener(min_price=1, min_volume=1).screen(self.df)
+        result = ExpressionScreener('low <= ema(20) and close > ema(20) and (ema(20) - low) / ema(20) <= 0.02 '
+                                    'and rsi(14) < 70 and macd(12, 26, 9) > 0', min_price=1, min_volume=1).screen(self.df)
+        self.assertFalse(expected.empty)
+        self.assertListEqual(sorted(zip(result['Date'], result['Symbol'])),
+                             sorted(zip(expected['Date'], expected['Symbol'])))
+
+    def test_not_excludes_warmup_bars(self):
+        """Test, ob 'not' in der Anlaufphase (NaN-Indikator) keine Treffer erzeugt"""
+        from screeners.expression import ExpressionScreener
+
+        result = ExpressionScreener('not (roc(20) > 1000)', min_price=1, min_volume=1).screen(self.df)
+        negated = ExpressionScreener('not (close > 1000 or roc(20) > 1000)', min_price=1, min_volume=1).screen(self.df)
+        first_dates = self.df.index.unique().sort_values()[:20]
+
+        self.assertEqual(len(result), len(self.df) - 20 * 20)
+        self.assertFalse(result['Date'].isin(first_dates).any())
+        self.assertEqual(len(negated), len(result))
+
+# Test für den Ranking-Screener
+class TestRankingScreener(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        rng = np.random.default_rng(8)
+        dates = pd.date_range(end='2024-06-28', periods=80, freq='B', name='Date')
+        frames = []
+        for i in range(30):
+            # Unterschiedlich lange Historien, damit nicht jedes Datum alle Symbole hat
+            close = 100 + np.cumsum(rng.normal(scale=2, size=len(dates) - i))
+            frames.append(pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 3, 'Close': close,
+                                        'Volume': 1e6, 'Symbol': f"S{i:03d}"}, index=dates[i:]))
+        self.df = pd.concat(frames)
+
+    def expected(self, n, ascending):
+        from screeners.indicators import IndicatorEngine
+
+        df = self.df.reset_index()
+        engine = IndicatorEngine.from_frame(df)
+        df = engine.panel.frame
+        df['Score'] = engine.roc(20)
+        ranked = df.dropna(subset=['Score']).sort_values(['Date', 'Score'], ascending=[True, ascending])
+        return ranked.groupby('Date').head(n)
+
+    def test_top_and_bottom_n_per_date(self):
+        """Test, ob je Datum genau die N besten bzw. schlechtesten Symbole in richtiger Reihenfolge gewählt werden"""
+        from screeners.ranking import RankingScreener
+
+        for bottom in (False, True):
+            result = RankingScreener('roc(20)', top_n=5, bottom=bottom, min_price=1, min_volume=1).screen(self.df)
+            expected = self.expected(5, ascending=bottom)
+
+            self.assertListEqual(list(zip(result['Date'], result['Symbol'])),
+                                 list(zip(expected['Date'], expected['Symbol'])))
+            self.assertTrue((result.groupby('Date')['Rank'].apply(list) == result.groupby('Date')['Rank'].apply(
+                lambda ranks: list(range(1, len(ranks) + 1)))).all())
+
+    def test_infinite_scores_are_ranked(self):
+        """Test, ob ±inf normal gerankt wird und nur NaN nicht zählt"""
+        import numpy as np
+        from screeners.ranking import top_n
+
+        scores = np.array([[1.0, np.inf, np.nan, -np.inf, 2.0]])
+        for n in (2, 4, 5):
+            _, columns, ranks = top_n(scores, n)
+            self.assertListEqual(list(columns), [1, 4, 0, 3][:n])
+            self.assertListEqual(list(ranks), list(range(1, min(n, 4) + 1)))
+        _, columns, _ = top_n(scores, 4, largest=False)
+        self.assertListEqual(list(columns), [3, 0, 4, 1])
+
+    def test_chunks_and_shards_match(self):
+        """Test, ob das Ergebnis unabhängig von Datumsblöcken und Symbol-Shards ist"""
+        from screeners import ranking
+        from screeners.ranking import RankingScreener
+
+        screener = RankingScreener('roc(20)', top_n=4, min_price=1, min_volume=1)
+        expected = screener.screen(self.df)
+        with patch.object(ranking, 'RANK_CHUNK_ROWS', 7):
+            pd.testing.assert_frame_equal(screener.screen(self.df), expected)
+
+        symbols = self.df['Symbol'].unique()
+        parts = [screener.screen(self.df[self.df['Symbol'].isin(symbols[i::3])]) for i in range(3)]
+        merged = screener.merge_results(parts)
+        self.assertListEqual(list(zip(merged['Date'], merged['Symbol'], merged['Rank'])),
+                             list(zip(expected['Date'], expected['Symbol'], expected['Rank'])))
+
+# Test für die Screener- und Strategie-Registry
+class TestPluginRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package = os.path.join(self.temp_dir, 'registry_plugins')
+        os.makedirs(package)
+        open(os.path.join(package, '__init__.py'), 'w').close()
+        with open(os.path.join(package, 'slow_demo.py'), 'w') as f:
+            f.write(
+                'raise ImportError("Modul darf für den Katalog nicht importiert werden")\n'
+                'class SlowDemoStrategy:\n'
+                '    """Demo-Strategie"""\n'
+                '    def __init__(self, window: int = 10, threshold=-0.5, label: Optional[str] = None, data: pd.DataFrame = None):\n'
+                '        """\n'
+                '        Args:\n'
+                '            window: Fensterlänge\n'
+                '            threshold: Schwelle\n'
+                '        """\n'
+            )
+        with open(os.path.join(package, 'helpers.py'), 'w') as f:
+            f.write('class Helper:\n    pass\n')
+        sys.path.insert(0, self.temp_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.temp_dir)
+        sys.modules.pop('registry_plugins', None)
+        shutil.rmtree(self.temp_dir)
+
+    def test_catalog_without_import(self):
+        """Test, ob der Katalog aus dem Quelltext entsteht, ohne die Plugin-Module zu importieren"""
+        from utils.plugin_registry import PluginRegistry
+
+        registry = PluginRegistry('registry_plugins', 'Strategy')
+        catalog = registry.catalog()
+
+        self.assertEqual([entry['id'] for entry in catalog], ['slow_demo'])
+        self.assertEqual(catalog[0]['description'], 'Demo-Strategie')
+        self.assertListEqual(catalog[0]['parameters'], [
+            {'name': 'window', 'type': 'int', 'default': 10, 'required': False, 'description': 'Fensterlänge'},
+            {'name': 'threshold', 'type': 'float', 'default': -0.5, 'required': False, 'description': 'Schwelle'},
+            {'name': 'label', 'type': 'str', 'default': None, 'required': False, 'description': ''}
+        ])
+        self.assertNotIn('registry_plugins.slow_demo', sys.modules)
+        self.assertIs(registry.schemas(), registry.schemas())
+        with self.assertRaises(ValueError):
+            registry.get_class('slow_demo')
+
+    def test_project_plugins(self):
+        """Test, ob Screener und Strategien des Projekts gefunden und ihre Klassen zwischengespeichert werden"""
+        from screeners.ema_touch import EmaTouchScreener
+        from utils.plugin_registry import get_screener_registry, get_strategy_registry
+        from webapp.backend.services.backtest_service import get_available_strategies
+
+        screeners = get_screener_registry()
+        self.assertTrue({'ema_touch', 'roc130', 'expression', 'ranking'} <= set(screeners.ids()))
+        self.assertIs(screeners.get_class('ema_touch'), EmaTouchScreener)
+        with self.assertRaises(ValueError):
+            screeners.get_class('unknown')
+
+        strategies = {entry['id']: entry for entry in get_available_strategies()}
+        self.assertIn('mean_reversion', strategies)
+        self.assertListEqual([p['name'] for p in strategies['mean_reversion']['parameters']], ['gap_threshold'])
+        self.assertEqual(strategies, {entry['id']: entry for entry in get_strategy_registry().catalog()})
+
+# Test für den vektorisierten ROC130-Scan
+class TestRoc130Crossovers(unittest.TestCase):
+
+    def test_crossover_on_last_bar(self):
+        """Test, ob nur Durchbrüche am letzten Bar gefunden werden und kurze Historien ignoriert werden"""
+        from screeners.roc130 import roc_crossovers
+
+        dates = pd.date_range(start='2023-01-02', periods=5, freq='B', name='Date')
+        df = pd.concat([
+            # ROC(2) am vorletzten Bar 10%, am letzten 50% -> Durchbruch über 40%
+            pd.DataFrame({'Close': [100.0, 100.0, 100.0, 110.0, 150.0], 'Symbol': 'UP'}, index=dates),
+            # Bereits über der Schwelle
+            pd.DataFrame({'Close': [100.0, 100.0, 150.0, 150.0, 210.0], 'Symbol': 'HIGH'}, index=dates),
+            # Zu kurz für ROC(2) am Vortag
+            pd.DataFrame({'Close': [100.0, 200.0], 'Symbol': 'SHORT'}, index=dates[-2:])
+        ])
+        df['Symbol'] = df['Symbol'].astype('category')
+
+        matches = roc_crossovers(df, period=2, roc_threshold=40.0)
+
+        self.assertEqual([m['symbol'] for m in matches], ['UP'])
+        self.assertAlmostEqual(matches[0]['roc_yesterday'], 50.0)
+        self.assertAlmostEqual(matches[0]['roc_day_before'], 10.0)
+
 # Test für die MeanReversionStrategy Klasse
 class TestMeanReversionStrategy(unittest.TestCase):
     
@@ -226,6 +1552,57 @@ class TestWatchlistFunctions(unittest.TestCase):
         # Prüfen, ob das Ergebnis eine leere Liste ist
         self.assertEqual(result, [])
 
+# Test für den Watchlist-Cache
+class TestWatchlistCache(unittest.TestCase):
+    
+    def setUp(self):
+        from utils.norgate_watchlist_symbols import invalidate_watchlist_cache
+        invalidate_watchlist_cache()
+    
+    tearDown = setUp
+    
+    @patch('utils.norgate_watchlist_symbols.norgatedata.status')
+    @patch('utils.norgate_watchlist_symbols.norgatedata.watchlists')
+    @patch('utils.norgate_watchlist_symbols.norgatedata.watchlist_symbols')
+    def test_watchlists_are_cached_until_invalidated(self, mock_watchlist_symbols, mock_watchlists, mock_status):
+        """Test, ob Watchlist-Namen und -Mitglieder nur einmal von Norgate geladen werden"""
+        from utils.norgate_watchlist_symbols import get_watchlist_symbols, invalidate_watchlist_cache
+        
+        mock_status.return_value = True
+        mock_watchlists.return_value = ['S&P 500', 'Nasdaq 100']
+        mock_watchlist_symbols.return_value = ['AAPL', 'MSFT']
+        
+        for _ in range(3):
+            self.assertEqual(get_watchlist_symbols('S&P 500'), ['AAPL', 'MSFT'])
+        self.assertEqual(mock_status.call_count, 1)
+        self.assertEqual(mock_watchlists.call_count, 1)
+        self.assertEqual(mock_watchlist_symbols.call_count, 1)
+        
+        # Gezielte Invalidierung lädt nur die Mitglieder neu
+        invalidate_watchlist_cache('S&P 500')
+        get_watchlist_symbols('S&P 500')
+        self.assertEqual(mock_watchlists.call_count, 1)
+        self.assertEqual(mock_watchlist_symbols.call_count, 2)
+        
+        # Ohne Cache wird immer Norgate abgefragt
+        get_watchlist_symbols('S&P 500', use_cache=False)
+        self.assertEqual(mock_watchlists.call_count, 2)
+    
+    def test_entries_expire_after_ttl(self):
+        """Test, ob Einträge nach Ablauf der TTL neu geladen werden"""
+        from utils.ttl_cache import TTLCache
+        
+        now = [0.0]
+        cache = TTLCache(ttl=10, clock=lambda: now[0])
+        loader = MagicMock(side_effect=[['A'], ['B']])
+        
+        self.assertEqual(cache.get_or_load('key', loader), ['A'])
+        now[0] = 9.9
+        self.assertEqual(cache.get_or_load('key', loader), ['A'])
+        now[0] = 10.0
+        self.assertEqual(cache.get_or_load('key', loader), ['B'])
+        self.assertEqual(loader.call_count, 2)
+
 # Alle Tests ausführen
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
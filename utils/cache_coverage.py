@@ -0,0 +1,227 @@
+"""Abgedeckter Zeitraum je Symbol für die Marktdaten-Caches"""
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.parquet_store import StoreLock, unique_tmp_path
+
+
+class CacheCoverage:
+    """
+    Merkt sich je Symbol den lückenlos angefragten Zeitraum [start, end].
+
+    Gespeichert wird der angefragte und nicht der tatsächlich vorhandene
+    Zeitraum: ein Symbol, das erst 2018 gelistet wurde, gilt nach einer
+    Anfrage ab 2015 trotzdem als ab 2015 abgedeckt und wird nicht bei jedem
+    Aufruf erneut nach älteren Daten gefragt.
+
+    Mehrere Prozesse können dieselbe Datei fortschreiben: Änderungen werden
+    gemerkt und beim Speichern unter einer prozessübergreifenden Sperre auf den
+    aktuellen Dateistand angewendet, statt ihn mit dem eigenen Stand zu überschreiben.
+    """
+
+    _instances: Dict[Path, "CacheCoverage"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path, lock_path=None):
+        """
+        Args:
+            path: Pfad zur JSON-Datei
+            lock_path: Optional, Sperrdatei für Schreibzugriffe (z.B. die des Stores,
+                Standard: neben der JSON-Datei)
+        """
+        self.path = Path(path)
+        self.file_lock = StoreLock.for_path(lock_path if lock_path is not None else self.path.with_suffix(".lock"))
+        self._ranges: Optional[Dict[str, List[str]]] = None
+        self._loaded_mtime: Optional[float] = None
+        # Seit dem letzten Speichern: ersetzter Gesamtstand und Erweiterungen (symbols, start, end)
+        self._replacement: Optional[Dict[str, List[str]]] = None
+        self._pending: List[Tuple[List[str], Optional[str], Optional[str]]] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_path(cls, path, lock_path=None) -> "CacheCoverage":
+        """Liefert die prozessweit geteilte Instanz für eine Datei (mehrere Manager, ein Store)."""
+        path = Path(path).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, lock_path)
+            return cls._instances[path]
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _read_file(self) -> Dict[str, List[str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("symbols", {})
+        except Exception as e:
+            logging.error(f"Abdeckungsdatei nicht lesbar, wird neu aufgebaut: {e}")
+            return {}
+
+    def _current(self) -> Dict[str, List[str]]:
+        """Dateistand (bzw. ersetzter Stand) mit den noch nicht gespeicherten Erweiterungen."""
+        ranges = dict(self._replacement) if self._replacement is not None else self._read_file()
+        for symbols, start_date, end_date in self._pending:
+            self._apply(ranges, symbols, start_date, end_date)
+        return ranges
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> Dict[str, List[str]]:
+        """Lädt die Abdeckung (Symbol -> [Start, Ende] als 'YYYY-MM-DD'), neu bei Änderungen anderer Prozesse."""
+        with self._lock:
+            mtime = self._mtime()
+            if self._ranges is None or (self._replacement is None and mtime != self._loaded_mtime):
+                self._ranges = self._current()
+                self._loaded_mtime = mtime
+            return self._ranges
+
+    def save(self) -> None:
+        """
+        Schreibt die Abdeckung atomar: liest unter der Sperre den aktuellen Dateistand,
+        wendet die eigenen Änderungen darauf an und ersetzt die Datei.
+        """
+        with self._lock, self.file_lock():
+            ranges = self._current()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = unique_tmp_path(self.path)
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"updated_at": datetime.now().isoformat(), "symbols": ranges}, f)
+                os.replace(tmp_path, self.path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            self._ranges = ranges
+            self._loaded_mtime = self._mtime()
+            self._replacement = None
+            self._pending = []
+
+    def get(self, symbol: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Abgedeckter Zeitraum eines Symbols oder None."""
+        entry = self.load().get(symbol)
+        if entry is None:
+            return None
+        return pd.Timestamp(entry[0]), pd.Timestamp(entry[1])
+
+    def symbols(self) -> List[str]:
+        return list(self.load())
+
+    def extend(self, symbols: List[str], start_date: Optional[str] = None,
+               end_date: Optional[str] = None) -> None:
+        """
+        Erweitert die Abdeckung der Symbole um einen geladenen Zeitraum.
+
+        Überschneidet sich der Zeitraum nicht mit der bisherigen Abdeckung, wird
+        er stattdessen übernommen - es wird nur ein zusammenhängender Bereich geführt.
+
+        Args:
+            symbols: Symbole, deren Daten für den Zeitraum geladen wurden
+            start_date: Optional, Beginn (None = schließt an die bisherige Abdeckung an)
+            end_date: Optional, Ende (None = schließt an die bisherige Abdeckung an)
+        """
+        with self._lock:
+            self._apply(self.load(), symbols, start_date, end_date)
+            self._pending.append((list(symbols), start_date, end_date))
+
+    @staticmethod
+    def _apply(ranges: Dict[str, List[str]], symbols: List[str],
+               start_date: Optional[str], end_date: Optional[str]) -> None:
+        """Erweitert die Zeiträume in `ranges` (siehe extend)."""
+        one_day = pd.Timedelta(days=1)
+        for symbol in symbols:
+            current = ranges.get(symbol)
+            if current is None:
+                if start_date is not None and end_date is not None:
+                    ranges[symbol] = [start_date, end_date]
+                continue
+            start = pd.Timestamp(start_date) if start_date else pd.Timestamp(current[0])
+            end = pd.Timestamp(end_date) if end_date else pd.Timestamp(current[1])
+            touches = start <= pd.Timestamp(current[1]) + one_day and end >= pd.Timestamp(current[0]) - one_day
+            if touches:
+                ranges[symbol] = [min(start.strftime("%Y-%m-%d"), current[0]),
+                                  max(end.strftime("%Y-%m-%d"), current[1])]
+            else:
+                ranges[symbol] = [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+
+    def extend_from_ranges(self, date_ranges: pd.DataFrame) -> None:
+        """
+        Erweitert die Abdeckung um vorhandene Daten (z.B. nach dem Import einer Datei).
+
+        Args:
+            date_ranges: DataFrame mit Index Symbol und Spalten 'first', 'last'
+        """
+        for symbol, row in date_ranges.iterrows():
+            self.extend([symbol], pd.Timestamp(row["first"]).strftime("%Y-%m-%d"),
+                        pd.Timestamp(row["last"]).strftime("%Y-%m-%d"))
+
+    def reset(self, symbols: List[str], start_date: str, end_date: str) -> None:
+        """Setzt die Abdeckung neu (z.B. nach einem vollständigen Neuaufbau des Caches)."""
+        with self._lock:
+            self._replacement = {symbol: [start_date, end_date] for symbol in symbols}
+            self._pending = []
+            self._ranges = dict(self._replacement)
+
+    def initialize(self, date_ranges: pd.DataFrame) -> None:
+        """
+        Übernimmt die Abdeckung aus vorhandenen Daten (für Caches ohne Abdeckungsdatei).
+
+        Args:
+            date_ranges: DataFrame mit Index Symbol und Spalten 'first', 'last'
+        """
+        with self._lock:
+            self._replacement = {
+                symbol: [pd.Timestamp(row["first"]).strftime("%Y-%m-%d"),
+                         pd.Timestamp(row["last"]).strftime("%Y-%m-%d")]
+                for symbol, row in date_ranges.iterrows()
+            }
+            self._pending = []
+            self._ranges = dict(self._replacement)
+
+    def gaps(self, symbols: List[str], start_date: Optional[str],
+             end_date: str) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Ermittelt die nicht abgedeckten Zeiträume, gruppiert nach Zeitraum.
+
+        Args:
+            symbols: Angefragte Symbole
+            start_date: Optional, angefragter Beginn (None = keine Prüfung am Anfang)
+            end_date: Angefragtes Ende
+
+        Returns:
+            Dictionary (Start, Ende) -> Symbole mit genau dieser Lücke
+        """
+        one_day = pd.Timedelta(days=1)
+        end_ts = pd.Timestamp(end_date)
+        start_ts = pd.Timestamp(start_date) if start_date else None
+
+        gaps = defaultdict(list)
+        for symbol in symbols:
+            covered = self.get(symbol)
+            if covered is None:
+                if start_ts is not None:
+                    gaps[(start_ts.strftime("%Y-%m-%d"), end_ts.strftime("%Y-%m-%d"))].append(symbol)
+                continue
+            covered_start, covered_end = covered
+            # Lücken reichen immer bis an den abgedeckten Bereich, damit er lückenlos bleibt
+            if start_ts is not None and start_ts < covered_start:
+                head_end = covered_start - one_day
+                gaps[(start_ts.strftime("%Y-%m-%d"), head_end.strftime("%Y-%m-%d"))].append(symbol)
+            if covered_end < end_ts:
+                tail_start = covered_end + one_day
+                gaps[(tail_start.strftime("%Y-%m-%d"), end_ts.strftime("%Y-%m-%d"))].append(symbol)
+        return dict(gaps)
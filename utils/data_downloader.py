@@ -1,10 +1,13 @@
 import logging
+from typing import List, Optional
 import pandas as pd
 import norgatedata
+from config.config import Config
+from utils.parallel_download import iter_downloads
 from webapp.backend.services.screener_process import ScreenerProcess
 
-def download_stock_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
-    """Lädt Daten für ein einzelnes Symbol."""
+def download_stock_data(symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+    """Lädt Daten für ein einzelnes Symbol (leerer DataFrame: keine Daten im Zeitraum, None: Fehler)."""
     logging.info(f"Downloading data for {symbol} from {start_date} to {end_date}...")
     
     try:
@@ -19,7 +22,7 @@ def download_stock_data(symbol: str, start_date: str, end_date: str) -> pd.DataF
         
         if pricedata is None or len(pricedata) == 0:
             logging.warning(f"No data returned for {symbol}.")
-            return None
+            return pd.DataFrame()
             
         # Füge Symbol als Spalte hinzu
         pricedata['Symbol'] = symbol
@@ -29,13 +32,20 @@ def download_stock_data(symbol: str, start_date: str, end_date: str) -> pd.DataF
         logging.error(f"Error downloading data for {symbol}: {e}")
         return None
 
-def download_all_stock_data(symbols: list, start_date: str, end_date: str) -> pd.DataFrame:
+def download_all_stock_data(symbols: list, start_date: str, end_date: str,
+                            max_workers: Optional[int] = None,
+                            rate_limit: Optional[float] = None,
+                            no_data: Optional[List[str]] = None) -> pd.DataFrame:
     """Lädt Daten für mehrere Symbole.
     
     Args:
         symbols: Liste der zu ladenden Symbole
         start_date: Startdatum im Format 'YYYY-MM-DD'
         end_date: Enddatum im Format 'YYYY-MM-DD'
+        max_workers: Optional, Anzahl paralleler Downloads (Standard aus Config, 1 = sequentiell)
+        rate_limit: Optional, maximale Norgate-Aufrufe pro Sekunde über alle Worker (Standard aus Config)
+        no_data: Optional, Liste, an die Symbole ohne Daten im Zeitraum angehängt werden
+            (z.B. vor dem Listing) - im Gegensatz zu fehlgeschlagenen Downloads
     
     Returns:
         DataFrame mit den kombinierten Daten aller Symbole
@@ -46,8 +56,12 @@ def download_all_stock_data(symbols: list, start_date: str, end_date: str) -> pd
     """
     if not symbols:
         raise ValueError("Keine Symbole zum Download angegeben")
+    if max_workers is None:
+        max_workers = Config.DOWNLOAD_MAX_WORKERS
+    if rate_limit is None:
+        rate_limit = Config.DOWNLOAD_RATE_LIMIT
 
-    all_data = []
+    results = {}
     total_symbols = len(symbols)
     process_manager = ScreenerProcess()
     successful_downloads = 0
@@ -58,31 +72,35 @@ def download_all_stock_data(symbols: list, start_date: str, end_date: str) -> pd
     process_manager.update_progress(total_symbols, 0, None)
     
     try:
-        for i, symbol in enumerate(symbols, 1):
-            if process_manager.stop_requested:
-                logging.info("Download-Prozess wurde gestoppt")
-                break
+        downloads = iter_downloads(
+            symbols,
+            lambda symbol: download_stock_data(symbol, start_date, end_date),
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            should_stop=lambda: process_manager.stop_requested
+        )
+        for i, (symbol, data) in enumerate(downloads, 1):
+            if data is not None and not data.empty:
+                results[symbol] = data
+                successful_downloads += 1
+            else:
+                failed_downloads += 1
+                if data is not None and no_data is not None:
+                    no_data.append(symbol)
 
             # Update progress
-            process_manager.update_progress(total_symbols, i - 1, symbol)
-            
-            try:
-                data = download_stock_data(symbol, start_date, end_date)
-                if data is not None and not data.empty:
-                    all_data.append(data)
-                    successful_downloads += 1
-                else:
-                    failed_downloads += 1
-            except Exception as e:
-                logging.error(f"Fehler beim Download von {symbol}: {e}")
-                failed_downloads += 1
-                continue
+            process_manager.update_progress(total_symbols, i, symbol)
                 
             # Log progress
             if i % 10 == 0 or i == total_symbols:  # Log alle 10 Symbole oder am Ende
                 logging.info(f"Fortschritt: {i}/{total_symbols} ({i/total_symbols*100:.1f}%)")
                 logging.info(f"Erfolgreich: {successful_downloads}, Fehlgeschlagen: {failed_downloads}")
         
+        if process_manager.stop_requested:
+            logging.info("Download-Prozess wurde gestoppt")
+        
+        # Reihenfolge der Eingabe beibehalten, unabhängig von der Abschlussreihenfolge
+        all_data = [results[symbol] for symbol in symbols if symbol in results]
         if not all_data:
             raise RuntimeError("Keine Daten heruntergeladen")
             
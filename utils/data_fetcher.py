@@ -11,7 +11,9 @@ import logging
 import norgatedata
 from utils.norgate_database_symbols import get_database_symbols
 from utils.norgate_watchlist_symbols import get_watchlist_symbols
-from typing import Optional, List, Tuple
+from utils.parallel_download import iter_downloads
+from utils.ingestion_checkpoint import IngestionCheckpoint
+from typing import Callable, Optional, List, Tuple
 
 # Step 1
 # Set up logging to display log messages in the console
@@ -29,7 +31,8 @@ def fetch_ohlcv_data(symbol: str, start_date: str, end_date: str) -> Optional[pd
         end_date: Enddatum (YYYY-MM-DD)
     
     Returns:
-        DataFrame mit OHLCV Daten oder None bei Fehler
+        DataFrame mit OHLCV Daten, leerer DataFrame wenn Norgate keine Bars im
+        Zeitraum hat, oder None bei Fehler
     """
     try:
         logging.info(f"Lade OHLCV Daten für {symbol}...")
@@ -45,7 +48,7 @@ def fetch_ohlcv_data(symbol: str, start_date: str, end_date: str) -> Optional[pd
         
         if df is None or df.empty:
             logging.warning(f"Keine Daten für {symbol} gefunden")
-            return None
+            return pd.DataFrame()
             
         # Symbol als Spalte hinzufügen
         df['Symbol'] = symbol
@@ -57,9 +60,94 @@ def fetch_ohlcv_data(symbol: str, start_date: str, end_date: str) -> Optional[pd
         return None
 
 # Step 3
+# Stream the downloaded data into a parquet file with bounded memory and checkpoints
+def stream_ohlcv_to_parquet(symbols: List[str], start_date: str, end_date: str,
+                            save_path: str, max_workers: int = 1,
+                            rate_limit: Optional[float] = None,
+                            batch_rows: int = 250_000,
+                            resume: bool = True,
+                            should_stop: Optional[Callable[[], bool]] = None) -> Tuple[int, int]:
+    """
+    Lädt OHLCV Daten und schreibt sie batchweise mit Checkpoints auf die Platte.
+    
+    Statt alle Symbole im Speicher zu sammeln und am Ende zusammenzuführen, wird
+    jeweils nur ein Batch von höchstens `batch_rows` Zeilen gepuffert und als
+    Part-Datei gesichert. Ein Manifest vermerkt die gespeicherten Symbole, sodass
+    ein erneuter Aufruf nach Absturz oder Stopp beim ersten fehlenden Symbol
+    weitermacht. Symbole mit Download-Fehler werden nicht vermerkt und beim
+    nächsten Aufruf erneut geladen. Erst wenn alle Symbole geladen sind, werden
+    die Parts zur Zieldatei zusammengefügt.
+    
+    Args:
+        symbols: Liste der zu ladenden Symbole
+        start_date: Startdatum (YYYY-MM-DD)
+        end_date: Enddatum (YYYY-MM-DD)
+        save_path: Speicherpfad für die Parquet-Datei
+        max_workers: Anzahl paralleler Downloads (1 = sequentiell)
+        rate_limit: Optional, maximale Norgate-Aufrufe pro Sekunde
+        batch_rows: Zeilen pro Batch bzw. Row-Group
+        resume: Bestehenden Checkpoint fortsetzen (False = neu beginnen)
+        should_stop: Optional, Funktion die True liefert wenn abgebrochen werden soll
+    
+    Returns:
+        Tupel (geschriebene Zeilen, Anzahl Symbole mit Daten). Bei Abbruch (0, 0),
+        der Checkpoint bleibt dann für die Wiederaufnahme erhalten.
+    """
+    checkpoint = IngestionCheckpoint(save_path, start_date, end_date)
+    if not resume:
+        checkpoint.clear()
+        checkpoint = IngestionCheckpoint(save_path, start_date, end_date)
+    
+    pending = checkpoint.pending_symbols(symbols)
+    total = len(symbols)
+    done = total - len(pending)
+    if done:
+        logging.info(f"Setze Ingestion fort: {done}/{total} Symbole bereits gespeichert")
+    
+    should_stop = should_stop or (lambda: False)
+    frames, empty_symbols, failed_symbols, buffered_rows = [], [], [], 0
+    
+    downloads = iter_downloads(
+        pending,
+        lambda symbol: fetch_ohlcv_data(symbol, start_date, end_date),
+        max_workers=max_workers,
+        rate_limit=rate_limit,
+        should_stop=should_stop
+    )
+    for i, (symbol, df) in enumerate(downloads, done + 1):
+        logging.info(f"Fortschritt: {i}/{total} ({i/total*100:.1f}%)")
+        
+        if df is None:
+            # Fehler (z.B. Norgate kurz nicht erreichbar) - bleibt offen für die Wiederaufnahme
+            failed_symbols.append(symbol)
+        elif df.empty:
+            empty_symbols.append(symbol)
+        else:
+            frames.append(df)
+            buffered_rows += len(df)
+        
+        if buffered_rows >= batch_rows:
+            checkpoint.commit_batch(frames, empty_symbols)
+            frames, empty_symbols, buffered_rows = [], [], 0
+    
+    # Rest sichern - auch bei Stopp, damit nichts verloren geht
+    checkpoint.commit_batch(frames, empty_symbols)
+    
+    if failed_symbols:
+        logging.warning(f"{len(failed_symbols)} Symbole fehlgeschlagen, werden beim nächsten Aufruf erneut geladen")
+    if checkpoint.pending_symbols(symbols):
+        logging.info(f"Ingestion unterbrochen, Checkpoint gespeichert: {checkpoint.directory}")
+        return 0, 0
+    
+    loaded_symbols = len(checkpoint.completed_symbols()) - len(checkpoint.manifest["empty_symbols"])
+    rows = checkpoint.finalize(batch_rows=batch_rows)
+    return rows, loaded_symbols
+
+# Step 4
 # Define the function to fetch OHLCV data for all symbols
 def fetch_all_ohlcv_data(start_date: str, end_date: str, 
-                        save_path: str) -> None:
+                        save_path: str, max_workers: int = 1,
+                        rate_limit: Optional[float] = None) -> None:
     """
     Lädt OHLCV Daten für alle Aktien (aktiv und delistet).
     
@@ -67,7 +155,11 @@ def fetch_all_ohlcv_data(start_date: str, end_date: str,
         start_date: Startdatum (YYYY-MM-DD)
         end_date: Enddatum (YYYY-MM-DD) 
         save_path: Speicherpfad für die Parquet-Datei
+        max_workers: Anzahl paralleler Downloads (1 = sequentiell)
+        rate_limit: Optional, maximale Norgate-Aufrufe pro Sekunde
     """
+    from webapp.backend.services.screener_process import ScreenerProcess
+    
     # Aktive Symbole laden
     active_symbols = get_database_symbols('US Equities')
     # active_details = get_symbol_details(active_symbols)
@@ -80,41 +172,26 @@ def fetch_all_ohlcv_data(start_date: str, end_date: str,
     # all_details = active_details + delisted_details
     all_symbols = active_symbols + delisted_symbols
     
-    # DataFrame für alle Daten
-    all_data = []
-    
-    # Fortschrittsanzeige
-    total = len(all_symbols)
-    for i, (symbol) in enumerate(all_symbols, 1):
-    # for i, (symbol, name) in enumerate(all_symbols, 1):
-        logging.info(f"Fortschritt: {i}/{total} ({i/total*100:.1f}%)")
-        
-        df = fetch_ohlcv_data(symbol, start_date, end_date)
-        if df is not None:
-            # Firmenname hinzufügen
-            # df['Company_Name'] = name
-            all_data.append(df)
-    
-    if not all_data:
-        logging.error("Keine Daten geladen!")
-        return
-        
-    # Alle Daten zusammenführen
-    final_df = pd.concat(all_data, ignore_index=False)
-    
     print(f"Inside fetch_all_ohlcv_data, save_path is: {save_path}")
-    # Daten speichern
+    # Daten laden und fortlaufend speichern
     try:
-        final_df.to_parquet(save_path)
+        rows, loaded = stream_ohlcv_to_parquet(
+            all_symbols, start_date, end_date, save_path,
+            max_workers=max_workers, rate_limit=rate_limit,
+            should_stop=lambda: ScreenerProcess().stop_requested
+        )
+        if rows == 0:
+            logging.error("Keine Daten geladen oder Ingestion unterbrochen - erneuter Aufruf setzt fort")
+            return
         logging.info(f"Daten erfolgreich gespeichert unter: {save_path}")
-        logging.info(f"Datensatz enthält {len(final_df)} Zeilen für {len(all_symbols)} Aktien")
-        # logging.info(f"Datensatz enthält {len(final_df)} Zeilen für {len(all_details)} Aktien")
+        logging.info(f"Datensatz enthält {rows} Zeilen für {loaded} Aktien")
     except Exception as e:
         logging.error(f"Fehler beim Speichern der Daten: {str(e)}")
 
 # Gets all symbols from a specific watchlist
 # Example: Get all symbols from the S&P 500 watchlist
-def fetch_all_ohlcv_data_from_list(watchlist_name: str, start_date: str, end_date: str, save_path: str) -> None:
+def fetch_all_ohlcv_data_from_list(watchlist_name: str, start_date: str, end_date: str, save_path: str,
+                                   max_workers: int = 1, rate_limit: Optional[float] = None) -> None:
     """
     Lädt OHLCV Daten für alle aktiven Aktien einer Watchliste.
     
@@ -123,39 +200,32 @@ def fetch_all_ohlcv_data_from_list(watchlist_name: str, start_date: str, end_dat
         start_date: Startdatum (YYYY-MM-DD)
         end_date: Enddatum (YYYY-MM-DD) 
         save_path: Speicherpfad für die Parquet-Datei
+        max_workers: Anzahl paralleler Downloads (1 = sequentiell)
+        rate_limit: Optional, maximale Norgate-Aufrufe pro Sekunde
     """
+    from webapp.backend.services.screener_process import ScreenerProcess
+    
     # Symbole laden
     symbols = get_watchlist_symbols(watchlist_name)
     if not symbols:
         logging.error("Keine Symbole geladen!")
         return
 
-    # DataFrame für alle Daten
-    all_data = []
+    if not save_path:
+        save_path = f"data/raw/{watchlist_name.replace(' ', '_').lower()}_data.parquet"
     
-    # Fortschrittsanzeige
-    for i, symbol in enumerate(symbols, 1):
-        logging.info(f"Fortschritt: {i}/{len(symbols)} ({i/len(symbols)*100:.1f}%)")
-        
-        df = fetch_ohlcv_data(symbol, start_date, end_date)
-        if df is not None:
-            all_data.append(df)
-    
-    if not all_data:
-        logging.error("Keine Daten geladen!")
-        return
-        
-    # Alle Daten zusammenführen
-    final_df = pd.concat(all_data, ignore_index=False)
-    
-    # Daten speichern
+    # Daten laden und fortlaufend speichern
     try:
-        if not save_path:
-            save_path = f"data/raw/{watchlist_name.replace(' ', '_').lower()}_data.parquet"
-            
-        final_df.to_parquet(save_path)
+        rows, loaded = stream_ohlcv_to_parquet(
+            symbols, start_date, end_date, save_path,
+            max_workers=max_workers, rate_limit=rate_limit,
+            should_stop=lambda: ScreenerProcess().stop_requested
+        )
+        if rows == 0:
+            logging.error("Keine Daten geladen oder Ingestion unterbrochen - erneuter Aufruf setzt fort")
+            return
         logging.info(f"Daten erfolgreich gespeichert unter: {save_path}")
-        logging.info(f"Datensatz enthält {len(final_df)} Zeilen für {len(symbols)} Aktien")
+        logging.info(f"Datensatz enthält {rows} Zeilen für {loaded} Aktien")
     except Exception as e:
         logging.error(f"Fehler beim Speichern der Daten: {str(e)}")
 
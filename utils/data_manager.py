@@ -2,12 +2,18 @@ import os
 import re
 import logging
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
+
+import pyarrow.parquet as pq
 
 from config.config import Config
+from utils.cache_coverage import CacheCoverage
+from utils.memmap_panel import MemmapPanel
+from utils.norgate_update_probe import latest_trading_date
 from utils.norgate_watchlist_symbols import get_watchlist_symbols
+from utils.parquet_store import PartitionedParquetStore
 
 def sanitize_filename(name: str) -> str:
     """
@@ -25,8 +31,103 @@ def sanitize_filename(name: str) -> str:
     sanitized = re.sub(r'[^\w\-_]', '', sanitized)
     return sanitized.lower()
 
+# Kleinbuchstaben-Aliase für die backtesting_engine (teilen sich den Speicher mit dem Original)
+COLUMN_ALIASES = {
+    'Close': 'close',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Volume': 'volume'
+}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+def memory_report(df: pd.DataFrame) -> Dict[str, object]:
+    """
+    Ermittelt den tatsächlichen Speicherbedarf eines DataFrames.
+    
+    Spalten, die sich einen Puffer teilen (z.B. 'close' als Alias von 'Close'),
+    werden nur einmal gezählt.
+    
+    Args:
+        df: Zu messender DataFrame
+        
+    Returns:
+        Dictionary mit rows, total_bytes, bytes_per_row, index_bytes und columns (Bytes je Spalte)
+    """
+    seen = set()
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if series.dtype.kind in 'biufcmM':
+            values = series.to_numpy()
+            key = (values.__array_interface__['data'][0], values.nbytes)
+            if key in seen:
+                columns[name] = 0
+                continue
+            seen.add(key)
+        columns[name] = int(series.memory_usage(deep=True, index=False))
+    
+    index_bytes = int(df.index.memory_usage(deep=True))
+    total = index_bytes + sum(columns.values())
+    return {
+        'rows': len(df),
+        'total_bytes': total,
+        'bytes_per_row': total / len(df) if len(df) else 0.0,
+        'index_bytes': index_bytes,
+        'columns': columns
+    }
+
+def compact_market_data(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                        price_dtype: Optional[str] = None,
+                        categorical_symbols: bool = False,
+                        lowercase_aliases: bool = True) -> pd.DataFrame:
+    """
+    Projiziert Spalten und wandelt sie in speichersparende Datentypen um.
+    
+    Args:
+        df: Marktdaten mit 'Symbol'-Spalte
+        columns: Optional, zu behaltende Spalten ('Symbol' bleibt immer erhalten,
+                 Kleinbuchstaben-Namen werden auf das Original abgebildet)
+        price_dtype: Optional, Datentyp für Open/High/Low/Close (z.B. 'float32')
+        categorical_symbols: 'Symbol' als Kategorie statt Python-Strings speichern (Opt-in, da
+            groupby('Symbol') und Joins über die Symbol-Spalte sich für Kategorien anders verhalten)
+        lowercase_aliases: Kleinbuchstaben-Spalten als Alias auf dieselben Daten anlegen
+        
+    Returns:
+        Neuer DataFrame, Daten werden wo möglich ohne Kopie übernommen
+    """
+    wanted = None
+    if columns is not None:
+        originals = {alias: original for original, alias in COLUMN_ALIASES.items()}
+        wanted = {originals.get(name, name) for name in columns} | {'Symbol'}
+    
+    arrays = {}
+    for name in df.columns:
+        if name in COLUMN_ALIASES.values() or (wanted is not None and name not in wanted):
+            continue
+        series = df[name]
+        if name == 'Symbol' and categorical_symbols:
+            arrays[name] = series.astype('category').array
+        elif name in PRICE_COLUMNS and price_dtype is not None:
+            arrays[name] = series.to_numpy(dtype=price_dtype)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            arrays[name] = series.array
+        else:
+            arrays[name] = series.to_numpy()
+    
+    if lowercase_aliases:
+        for original, alias in COLUMN_ALIASES.items():
+            if original in arrays:
+                # Gleiches Array - kein zweiter Puffer
+                arrays[alias] = arrays[original]
+    
+    # copy=False hält jede Spalte in einem eigenen Block, die Aliase bleiben Views
+    return pd.DataFrame(arrays, index=df.index, copy=False)
+
 class EnhancedMarketDataManager:
-    def __init__(self, watchlist_name: Optional[str] = None, cache_file=None, max_age_days=1):
+    def __init__(self, watchlist_name: Optional[str] = None, cache_file=None, max_age_days=1,
+                 storage: Optional[str] = None, refresh_mode: str = "full"):
         """
         Initialisiert den erweiterten Market Data Manager.
         
@@ -34,7 +135,21 @@ class EnhancedMarketDataManager:
             watchlist_name: Optional, Name der Norgate Watchlist
             cache_file: Optional, Pfad zur Parquet-Datei
             max_age_days: Maximales Alter der Cache-Datei in Tagen
+            storage: 'file' für eine einzelne Parquet-Datei, 'partitioned' für einen
+                     nach Symbol-Bucket und Jahr partitionierten Store, 'shared' für den
+                     gemeinsamen Symbol-Store aller Watchlists. Standard: Config.WATCHLIST_STORAGE
+                     für Watchlists ohne eigene Cache-Datei, sonst 'file'
+            refresh_mode: 'full' lädt bei veraltetem Cache alles neu, 'incremental'
+                          lädt nur die fehlenden Bars seit dem letzten gespeicherten Datum
+                          (im Modus 'shared' immer inkrementell)
         """
+        if storage is None:
+            storage = Config.WATCHLIST_STORAGE if watchlist_name is not None and cache_file is None else "file"
+        if storage not in ("file", "partitioned", "shared"):
+            raise ValueError(f"Unbekannter Speichermodus: {storage}")
+        if refresh_mode not in ("full", "incremental"):
+            raise ValueError(f"Unbekannter Aktualisierungsmodus: {refresh_mode}")
+
         if cache_file is None:
             if watchlist_name is not None:
                 # Erstelle einen sprechenden Dateinamen für die Watchlist
@@ -47,24 +162,461 @@ class EnhancedMarketDataManager:
         self.cache_file = Path(cache_file)
         self.max_age_days = max_age_days
         self.watchlist_name = watchlist_name
+        self.storage = storage
+        # Im gemeinsamen Store nie alles neu laden - andere Watchlists teilen die Daten
+        self.refresh_mode = "incremental" if storage == "shared" else refresh_mode
         
-    def is_cache_valid(self) -> bool:
-        """Prüft ob Cache-Datei existiert und aktuell ist."""
-        if not self.cache_file.exists():
-            logging.info(f"Cache-Datei existiert nicht: {self.cache_file}")
+        self.store = None
+        if storage == "shared":
+            # Ein Store für alle Watchlists, die Watchlist bestimmt nur die Symbolauswahl
+            self.store = PartitionedParquetStore(Config.get_project_path('data', 'raw', 'market_store'))
+        elif storage == "partitioned":
+            # Partitionierter Store liegt neben der Cache-Datei (gleicher Name ohne Endung)
+            self.store = PartitionedParquetStore(self.cache_file.with_suffix(''))
+        
+        if self.store is not None:
+            # Gleiche Sperre wie die Partitionen des Stores
+            self.coverage = CacheCoverage.for_path(self.store.root / '_coverage.json', self.store.lock.path)
+        else:
+            self.coverage = CacheCoverage.for_path(self.cache_file.with_suffix('.coverage.json'))
+        
+    def _cache_marker(self) -> Path:
+        """Datei, deren Änderungszeitpunkt das Alter des Caches bestimmt."""
+        if self.store is not None:
+            return self.store.manifest_path
+        return self.cache_file
+        
+    def _migrate_file_cache(self) -> None:
+        """Übernimmt eine bestehende Einzeldatei einmalig in den partitionierten bzw. gemeinsamen Store."""
+        if self.store is None or not self.cache_file.exists():
+            return
+        
+        if self.storage == "shared":
+            imported = self.store.read_manifest().get('imported_files', [])
+            if self.cache_file.name in imported:
+                return
+            logging.info(f"Übernehme Watchlist-Cache in gemeinsamen Store: {self.cache_file}")
+            data = pd.read_parquet(self.cache_file)
+            self.store.write(data, mode="merge")
+            dates = pd.Series(pd.to_datetime(data.index))
+            self.coverage.extend_from_ranges(dates.groupby(data['Symbol'].values).agg(['min', 'max']).rename(
+                columns={'min': 'first', 'max': 'last'}))
+            self.coverage.save()
+            self.store.write_manifest(imported_files=imported + [self.cache_file.name])
+            return
+        
+        if self.store.exists():
+            return
+        logging.info(f"Übernehme bestehenden Cache in partitionierten Store: {self.cache_file}")
+        self.store.write(pd.read_parquet(self.cache_file), mode="overwrite")
+        # Alter der ursprünglichen Datei beibehalten
+        mtime = self.cache_file.stat().st_mtime
+        os.utime(self.store.manifest_path, (mtime, mtime))
+        
+    def _resolve_symbols(self, symbols: Optional[List[str]] = None) -> Optional[List[str]]:
+        """Im gemeinsamen Store bestimmt die Watchlist-Mitgliedschaft die Symbolauswahl."""
+        if symbols is None and self.storage == "shared" and self.watchlist_name:
+            return get_watchlist_symbols(self.watchlist_name)
+        return symbols
+        
+    def is_cache_valid(self, symbols: Optional[List[str]] = None,
+                       end_date: Optional[str] = None) -> bool:
+        """
+        Prüft ob Cache-Datei existiert und aktuell ist.
+        
+        Maßgeblich ist das letzte bei Norgate verfügbare Handelsdatum: der Cache
+        ist veraltet, sobald Norgate einen neueren Bar hat. Nur wenn Norgate nicht
+        erreichbar ist, entscheidet das Dateialter (max_age_days).
+        
+        Im gemeinsamen Store wird die Aktualität je Symbol über die Abdeckung
+        geprüft, da andere Watchlists den Store jederzeit verändern.
+        
+        Args:
+            symbols: Optional, zu prüfende Symbole (nur im Modus 'shared')
+            end_date: Optional, Ende des benötigten Zeitraums - neuere Bars bei
+                Norgate machen den Cache dann nicht ungültig
+        """
+        self._migrate_file_cache()
+        if self.storage == "shared":
+            return self._shared_symbols_fresh(self._resolve_symbols(symbols), end_date)
+        marker = self._cache_marker()
+        if not marker.exists():
+            logging.info(f"Cache-Datei existiert nicht: {marker}")
             return False
+        
+        # Aktuell ist der Cache genau dann, wenn Norgate bis end_date keinen neueren Bar hat
+        latest = latest_trading_date()
+        if latest is not None:
+            cutoff = latest if end_date is None else min(latest, pd.Timestamp(end_date))
+            try:
+                stored = self._latest_stored_date()
+            except Exception as e:
+                logging.warning(f"Letztes Datum im Cache nicht lesbar: {e}")
+                stored = None
+            if stored is not None:
+                if stored < cutoff:
+                    logging.info(f"Neue Daten bei Norgate: Cache bis {stored.date()}, verfügbar bis {cutoff.date()}")
+                    return False
+                return True
             
-        # Prüfe Alter der Datei
-        file_age = datetime.now() - datetime.fromtimestamp(self.cache_file.stat().st_mtime)
+        # Ohne Norgate: Prüfe Alter der Datei
+        file_age = datetime.now() - datetime.fromtimestamp(marker.stat().st_mtime)
         if file_age.days > self.max_age_days:
             logging.info(f"Cache ist älter als {self.max_age_days} Tage.")
             return False
             
         return True
         
+    def _shared_symbols_fresh(self, symbols: Optional[List[str]], end_date: Optional[str] = None) -> bool:
+        """Prüft ob alle Symbole im gemeinsamen Store bis end_date bzw. bis vor max_age_days abgedeckt sind."""
+        if not self.store.exists():
+            logging.info(f"Gemeinsamer Store existiert nicht: {self.store.root}")
+            return False
+        coverage = self._load_coverage()
+        if symbols is None:
+            symbols = coverage.symbols()
+        
+        latest = latest_trading_date()
+        if latest is not None:
+            cutoff = latest
+        else:
+            # Ohne Norgate: Abdeckung endet spätestens gestern, siehe _coverage_end
+            cutoff = pd.Timestamp(datetime.now().date()) - timedelta(days=self.max_age_days + 1)
+        if end_date is not None:
+            cutoff = min(cutoff, pd.Timestamp(end_date))
+        stale = [symbol for symbol in symbols
+                 if coverage.get(symbol) is None or coverage.get(symbol)[1] < cutoff]
+        if stale:
+            logging.info(f"{len(stale)} von {len(symbols)} Symbolen im gemeinsamen Store sind veraltet")
+            return False
+        return True
+        
+    def _panel_root(self) -> Path:
+        """Verzeichnis des Memmap-Panels (neben bzw. im Cache)."""
+        if self.store is not None:
+            return self.store.root / '_panel'
+        return self.cache_file.with_suffix('.panel')
+        
+    def _source_version(self) -> Optional[float]:
+        """Stand des Caches: jüngste Änderung von Cache und Abdeckung."""
+        times = [path.stat().st_mtime for path in (self._cache_marker(), self.coverage.path) if path.exists()]
+        return max(times) if times else None
+        
+    def open_panel(self, fields: Optional[List[str]] = None, dtype: str = 'float64',
+                   rebuild: bool = False) -> MemmapPanel:
+        """
+        Öffnet den Cache als speicherabgebildetes Datum x Symbol Panel.
+        
+        Das Panel wird aus dem Cache erstellt, wenn es fehlt oder der Cache sich
+        seit dem Erstellen geändert hat. Danach kostet das Öffnen unabhängig von
+        der Datenmenge nur Millisekunden und alle Prozesse teilen sich die Daten
+        im Page-Cache.
+        
+        Args:
+            fields: Optional, Felder beim Neuaufbau (Standard: OHLCV)
+            dtype: Datentyp beim Neuaufbau
+            rebuild: Panel unabhängig vom Stand neu erstellen
+            
+        Returns:
+            MemmapPanel
+        """
+        self._migrate_file_cache()
+        root = self._panel_root()
+        version = self._source_version()
+        if version is None:
+            raise RuntimeError(f"Kein Cache vorhanden für das Panel: {self._cache_marker()}")
+        
+        if not rebuild and MemmapPanel.exists(root):
+            panel = MemmapPanel.open(root)
+            if panel.source_version is not None and panel.source_version >= version:
+                return panel
+            logging.info("Cache wurde seit dem Erstellen des Panels geändert, baue neu auf")
+        
+        logging.info(f"Erstelle Memmap-Panel: {root}")
+        return MemmapPanel.build(self._read_cache(columns=fields), root, fields=fields,
+                                 dtype=dtype, source_version=version)
+        
+    def _read_cache(self, start_date: Optional[str] = None,
+                    end_date: Optional[str] = None,
+                    symbols: Optional[List[str]] = None,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Liest den Cache. Beim partitionierten Store werden Datums- und
+        Symbolfilter direkt an den Parquet-Reader weitergegeben, Spalten
+        werden in beiden Modi nur gelesen wenn sie angefragt sind.
+        """
+        if columns is not None:
+            originals = {alias: original for original, alias in COLUMN_ALIASES.items()}
+            columns = list(dict.fromkeys(['Symbol'] + [originals.get(c, c) for c in columns]))
+        if self.store is not None:
+            return self.store.read(start_date=start_date, end_date=end_date, symbols=symbols, columns=columns)
+        if columns is None:
+            return pd.read_parquet(self.cache_file)
+        available = set(pq.read_schema(self.cache_file).names)
+        return pd.read_parquet(self.cache_file, columns=[c for c in columns if c in available])
+        
+    def _write_cache(self, df: pd.DataFrame) -> None:
+        """Schreibt Daten in den Cache."""
+        if self.store is not None:
+            self.store.write(df, mode="merge")
+        else:
+            df.to_parquet(self.cache_file)
+        
+    def _last_stored_dates(self, symbols: Optional[List[str]] = None) -> pd.Series:
+        """Liefert das letzte gespeicherte Datum je Symbol (Series Symbol -> Datum)."""
+        if self.store is not None:
+            return self.store.last_dates(symbols)
+        if not self.cache_file.exists():
+            return pd.Series(dtype="datetime64[ns]")
+        
+        # Nur die Symbol-Spalte lesen, der Datums-Index wird mitgeladen
+        cached = pd.read_parquet(self.cache_file, columns=['Symbol'])
+        if symbols:
+            cached = cached[cached['Symbol'].isin(symbols)]
+        dates = pd.Series(pd.to_datetime(cached.index))
+        return dates.groupby(cached['Symbol'].values).max()
+        
+    def _latest_stored_date(self) -> Optional[pd.Timestamp]:
+        """Letztes Datum im Cache, beim Einzeldatei-Cache aus den Parquet-Statistiken."""
+        if self.store is not None:
+            return self.store.latest_date()
+        if not self.cache_file.exists():
+            return None
+        
+        parquet_file = pq.ParquetFile(self.cache_file)
+        index_columns = parquet_file.schema_arrow.pandas_metadata.get('index_columns', []) \
+            if parquet_file.schema_arrow.pandas_metadata else []
+        date_column = next((c for c in index_columns if isinstance(c, str)), None)
+        if date_column is not None:
+            position = parquet_file.schema_arrow.get_field_index(date_column)
+            maxima = []
+            for i in range(parquet_file.metadata.num_row_groups):
+                statistics = parquet_file.metadata.row_group(i).column(position).statistics
+                if statistics is None or not statistics.has_min_max:
+                    maxima = None
+                    break
+                maxima.append(statistics.max)
+            if maxima:
+                return pd.Timestamp(max(maxima))
+        
+        # Ohne Statistiken: nur den Datums-Index lesen
+        last = self._last_stored_dates()
+        return pd.Timestamp(last.max()) if not last.empty else None
+        
+    def _stored_date_ranges(self) -> pd.DataFrame:
+        """Erstes und letztes gespeichertes Datum je Symbol (Spalten 'first', 'last')."""
+        if self.store is not None:
+            return self.store.date_ranges()
+        if not self.cache_file.exists():
+            return pd.DataFrame(columns=['first', 'last'])
+        
+        cached = pd.read_parquet(self.cache_file, columns=['Symbol'])
+        dates = pd.Series(pd.to_datetime(cached.index))
+        return dates.groupby(cached['Symbol'].values).agg(['min', 'max']).rename(
+            columns={'min': 'first', 'max': 'last'})
+        
+    def _load_coverage(self) -> CacheCoverage:
+        """Lädt die Abdeckung; für ältere Caches wird sie einmalig aus den Daten abgeleitet."""
+        self._migrate_file_cache()
+        if not self.coverage.exists() and self._cache_marker().exists():
+            logging.info("Keine Abdeckungsdatei vorhanden, leite Zeiträume aus dem Cache ab")
+            self.coverage.initialize(self._stored_date_ranges())
+            self.coverage.save()
+        return self.coverage
+        
+    @staticmethod
+    def _coverage_end(end_date: Optional[str] = None) -> str:
+        """
+        Ende der Abdeckung für eine Anfrage bis end_date. Abgedeckt ist nur, was
+        Norgate bereits liefert (letztes verfügbares Handelsdatum) - sonst könnte
+        ein noch fehlender Tag dauerhaft als geladen gelten. Nur wenn Norgate
+        nicht erreichbar ist, gilt der gestrige Tag als Grenze.
+        """
+        latest = latest_trading_date()
+        if latest is not None:
+            covered = latest.strftime("%Y-%m-%d")
+        else:
+            covered = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        if end_date is None:
+            return covered
+        return min(pd.Timestamp(end_date).strftime("%Y-%m-%d"), covered)
+        
+    def fill_coverage_gaps(self, symbols: Optional[List[str]] = None,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None) -> int:
+        """
+        Lädt nur die Zeiträume nach, die der Cache für die Anfrage noch nicht abdeckt
+        (Anfang vor dem ersten bzw. Ende nach dem letzten abgedeckten Datum).
+        
+        Die jüngsten max_age_days Tage bleiben der normalen Aktualisierung
+        überlassen, das Alter des Caches wird durch das Nachladen nicht verändert.
+        
+        Args:
+            symbols: Optional, angefragte Symbole (Standard: Watchlist bzw. alle abgedeckten)
+            start_date: Optional, Startdatum im Format 'YYYY-MM-DD'
+            end_date: Optional, Enddatum im Format 'YYYY-MM-DD' (Standard: heute)
+            
+        Returns:
+            Anzahl der neu geladenen Zeilen
+        """
+        import norgatedata
+        from utils.data_downloader import download_all_stock_data
+        
+        coverage = self._load_coverage()
+        if symbols is None:
+            symbols = get_watchlist_symbols(self.watchlist_name) if self.watchlist_name else coverage.symbols()
+        if end_date is None:
+            end_date = datetime.now().strftime("%Y-%m-%d")
+        
+        recent = (datetime.now() - timedelta(days=self.max_age_days + 1)).strftime("%Y-%m-%d")
+        gaps = {
+            (gap_start, gap_end): gap_symbols
+            for (gap_start, gap_end), gap_symbols in coverage.gaps(symbols, start_date, end_date).items()
+            if gap_start <= recent
+        }
+        if not gaps:
+            return 0
+        if not norgatedata.status():
+            logging.warning("Norgate Data Utility ist nicht aktiv, Lücken im Cache werden nicht gefüllt")
+            return 0
+        
+        new_frames = []
+        for (gap_start, gap_end), gap_symbols in sorted(gaps.items()):
+            logging.info(f"Lade Lücke {gap_start} bis {gap_end} für {len(gap_symbols)} Symbole nach...")
+            no_data = []
+            try:
+                frame = download_all_stock_data(gap_symbols, gap_start, gap_end, no_data=no_data)
+                new_frames.append(frame)
+                covered = list(frame['Symbol'].unique())
+            except RuntimeError as e:
+                logging.info(f"Keine Daten für {gap_start} bis {gap_end}: {e}")
+                covered = []
+            # Keine Daten im Zeitraum (z.B. vor dem Listing) gilt als abgedeckt,
+            # fehlgeschlagene Downloads bleiben Lücken und werden erneut angefragt
+            covered += no_data
+            if covered:
+                coverage.extend(covered, gap_start, self._coverage_end(gap_end))
+        
+        new_frames = [frame for frame in new_frames if frame is not None and not frame.empty]
+        if new_frames:
+            new_data = pd.concat(new_frames)
+            marker = self._cache_marker()
+            mtime = marker.stat().st_mtime if marker.exists() else None
+            self._merge_into_cache(new_data)
+            if mtime is not None:
+                # Historische Lücken machen den Cache nicht aktuell
+                os.utime(marker, (mtime, mtime))
+        coverage.save()
+        
+        rows = sum(len(frame) for frame in new_frames)
+        logging.info(f"Cache-Lücken gefüllt: {rows} Zeilen für {sum(len(s) for s in gaps.values())} Anfragen")
+        return rows
+        
+    def _merge_into_cache(self, new_data: pd.DataFrame) -> None:
+        """Führt neue Bars mit dem bestehenden Cache zusammen."""
+        if self.store is not None:
+            self.store.write(new_data, mode="merge")
+            return
+        
+        existing = pd.read_parquet(self.cache_file) if self.cache_file.exists() else None
+        if existing is None:
+            new_data.to_parquet(self.cache_file)
+            return
+        
+        combined = pd.concat([existing, new_data])
+        # Doppelte Bars (Symbol + Datum) durch die neueren ersetzen
+        keys = pd.DataFrame({'Date': combined.index, 'Symbol': combined['Symbol'].values})
+        combined = combined[~keys.duplicated(keep='last').values]
+        # Gleiche Reihenfolge wie beim Download: je Symbol chronologisch
+        combined = combined.sort_index(kind='stable').sort_values('Symbol', kind='stable')
+        combined.to_parquet(self.cache_file)
+        
+    def refresh_incremental(self, symbols: Optional[List[str]] = None,
+                            end_date: Optional[str] = None,
+                            default_start_date: Optional[str] = None) -> int:
+        """
+        Aktualisiert den Cache inkrementell: je Symbol werden nur die Bars nach dem
+        letzten gespeicherten Datum geladen und an den Cache angefügt.
+        
+        Args:
+            symbols: Optional, zu aktualisierende Symbole (Standard: Watchlist bzw. Cache-Inhalt)
+            end_date: Optional, Enddatum im Format 'YYYY-MM-DD' (Standard: heute)
+            default_start_date: Optional, Startdatum für Symbole ohne Cache-Daten
+            
+        Returns:
+            Anzahl der neu geladenen Zeilen
+        """
+        from utils.data_downloader import download_all_stock_data
+        
+        if end_date is None:
+            end_date = datetime.now().strftime("%Y-%m-%d")
+        if default_start_date is None:
+            default_start_date = f"{datetime.now().year - 5}-01-01"
+        
+        last_dates = self._last_stored_dates(symbols)
+        if symbols is None:
+            symbols = get_watchlist_symbols(self.watchlist_name) if self.watchlist_name else list(last_dates.index)
+        if not symbols:
+            raise ValueError("Keine Symbole für die Aktualisierung gefunden")
+        
+        # Symbole nach Startdatum gruppieren - nach einem normalen Handelstag
+        # haben fast alle Symbole dasselbe letzte Datum, also ein einziger Batch
+        end_ts = pd.Timestamp(end_date)
+        batches = {}
+        for symbol in symbols:
+            last = last_dates.get(symbol)
+            if last is None or pd.isna(last):
+                start = default_start_date
+            else:
+                next_day = pd.Timestamp(last) + timedelta(days=1)
+                if next_day > end_ts:
+                    continue
+                start = next_day.strftime("%Y-%m-%d")
+            batches.setdefault(start, []).append(symbol)
+        
+        if not batches:
+            logging.info("Cache ist auf dem neuesten Stand, keine neuen Bars zu laden")
+            os.utime(self._cache_marker())
+            return 0
+        
+        coverage = self._load_coverage()
+        new_frames = []
+        for start, batch_symbols in sorted(batches.items()):
+            logging.info(f"Lade {len(batch_symbols)} Symbole ab {start} nach...")
+            no_data = []
+            try:
+                frame = download_all_stock_data(batch_symbols, start, end_date, no_data=no_data)
+                new_frames.append(frame)
+                covered = list(frame['Symbol'].unique())
+            except RuntimeError as e:
+                logging.warning(f"Keine neuen Daten ab {start}: {e}")
+                covered = []
+            # Kein neuer Bar vorhanden (z.B. Wochenende) ist kein Fehler, fehlgeschlagene
+            # Symbole bleiben dagegen offen und werden beim nächsten Mal erneut geladen
+            covered += no_data
+            if covered:
+                coverage.extend(covered, start, self._coverage_end(end_date))
+        
+        new_frames = [frame for frame in new_frames if frame is not None and not frame.empty]
+        if not new_frames:
+            coverage.save()
+            os.utime(self._cache_marker())
+            return 0
+        
+        new_data = pd.concat(new_frames)
+        self._merge_into_cache(new_data)
+        coverage.save()
+        logging.info(f"Inkrementelle Aktualisierung: {len(new_data)} neue Zeilen für "
+                     f"{new_data['Symbol'].nunique()} Symbole")
+        return len(new_data)
+        
     def load_market_data(self, start_date: Optional[str] = None, 
                          end_date: Optional[str] = None,
-                         symbols: Optional[List[str]] = None) -> pd.DataFrame:
+                         symbols: Optional[List[str]] = None,
+                         columns: Optional[List[str]] = None,
+                         price_dtype: Optional[str] = None,
+                         categorical_symbols: bool = False,
+                         lowercase_aliases: bool = True) -> pd.DataFrame:
         """
         Lädt Marktdaten aus Cache oder via Norgate.
         
@@ -72,16 +624,29 @@ class EnhancedMarketDataManager:
             start_date: Optional, Startdatum im Format 'YYYY-MM-DD'
             end_date: Optional, Enddatum im Format 'YYYY-MM-DD'
             symbols: Optional, Liste der zu ladenden Symbole
+            columns: Optional, nur diese Spalten laden ('Symbol' ist immer enthalten)
+            price_dtype: Optional, Datentyp für Open/High/Low/Close (z.B. 'float32')
+            categorical_symbols: 'Symbol' als kategorische Spalte zurückgeben (z.B. für Screener-Panels)
+            lowercase_aliases: 'close', 'open', ... als Alias ohne Kopie anlegen
             
         Returns:
             DataFrame mit Marktdaten
         """
+        symbols = self._resolve_symbols(symbols)
+        
+        # Zeiträume außerhalb der bisherigen Abdeckung gezielt nachladen
+        if self._cache_marker().exists() or self.cache_file.exists():
+            try:
+                self.fill_coverage_gaps(symbols, start_date, end_date)
+            except Exception as e:
+                logging.error(f"Fehler beim Füllen der Cache-Lücken: {e}")
+        
         # Lade alle Daten aus dem Cache
         df = None
-        if self.is_cache_valid():
-            logging.info(f"Lade Daten aus Cache: {self.cache_file}")
+        if self.is_cache_valid(symbols, end_date):
+            logging.info(f"Lade Daten aus Cache: {self.store.root if self.store is not None else self.cache_file}")
             try:
-                df = pd.read_parquet(self.cache_file)
+                df = self._read_cache(start_date, end_date, symbols, columns)
                 # Index zu DateTime konvertieren falls nötig
                 if not isinstance(df.index, pd.DatetimeIndex):
                     df.index = pd.to_datetime(df.index)
@@ -89,6 +654,20 @@ class EnhancedMarketDataManager:
                 logging.error(f"Fehler beim Laden des Cache: {e}")
                 df = None
         
+        # Veralteter Cache: nur fehlende Bars nachladen statt alles neu
+        if df is None and self.refresh_mode == "incremental" and self._cache_marker().exists():
+            try:
+                refresh_symbols = symbols
+                if refresh_symbols is None and self.watchlist_name:
+                    refresh_symbols = get_watchlist_symbols(self.watchlist_name)
+                self.refresh_incremental(refresh_symbols, end_date=end_date, default_start_date=start_date)
+                df = self._read_cache(start_date, end_date, symbols, columns)
+                if not isinstance(df.index, pd.DatetimeIndex):
+                    df.index = pd.to_datetime(df.index)
+            except Exception as e:
+                logging.error(f"Fehler bei der inkrementellen Aktualisierung: {e}")
+                df = None
+        
         # Wenn Cache nicht gültig oder Laden fehlgeschlagen
         if df is None:
             logging.info("Aktualisiere Cache mit neuen Daten...")
@@ -115,42 +694,50 @@ class EnhancedMarketDataManager:
                     raise ValueError("Keine Daten heruntergeladen")
                     
                 # Speichere in Cache
-                df.to_parquet(self.cache_file)
+                self._write_cache(df)
+                # Nur tatsächlich geladene Symbole gelten als abgedeckt
+                downloaded = list(df['Symbol'].unique())
+                if self.store is None:
+                    # Die Einzeldatei wird komplett ersetzt
+                    self.coverage.reset(downloaded, start_date, self._coverage_end(end_date))
+                else:
+                    self.coverage.extend(downloaded, start_date, self._coverage_end(end_date))
+                self.coverage.save()
                 logging.info(f"Neue Daten im Cache gespeichert: {self.cache_file}")
                 
             except Exception as e:
                 logging.error(f"Fehler beim Aktualisieren der Daten: {e}")
                 # Wenn wir hier einen alten Cache haben, versuchen wir ihn zu laden
-                if self.cache_file.exists():
+                if self._cache_marker().exists():
                     logging.warning("Versuche alten Cache zu laden...")
-                    df = pd.read_parquet(self.cache_file)
+                    df = self._read_cache(start_date, end_date, symbols, columns)
                 else:
                     raise RuntimeError("Keine Daten verfügbar - weder Cache noch Download erfolgreich")
         
-        # Filtere nach Datum wenn angegeben
+        # Filter zu einer Maske zusammenfassen - nur kopieren wenn Zeilen wegfallen
+        mask = None
         if start_date:
-            df = df[df.index >= pd.Timestamp(start_date)]
+            mask = df.index >= pd.Timestamp(start_date)
         if end_date:
-            df = df[df.index <= pd.Timestamp(end_date)]
+            upper = df.index <= pd.Timestamp(end_date)
+            mask = upper if mask is None else mask & upper
             
         # Filtere nach Symbolen wenn angegeben
         if symbols:
-            df = df[df['Symbol'].isin(symbols)]
-            
-        # Normalisiere Spaltennamen für Konsistenz mit backtesting_engine.py
-        column_mapping = {
-            'Close': 'close',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Volume': 'volume'
-        }
+            in_symbols = df['Symbol'].isin(symbols).to_numpy()
+            mask = in_symbols if mask is None else mask & in_symbols
         
-        for original, normalized in column_mapping.items():
-            if original in df.columns and normalized not in df.columns:
-                df[normalized] = df[original]
+        if mask is not None and not mask.all():
+            df = df[mask]
             
-        return df
+        # Spaltenauswahl, kompakte Datentypen und Aliase für backtesting_engine.py
+        return compact_market_data(
+            df,
+            columns=columns,
+            price_dtype=price_dtype,
+            categorical_symbols=categorical_symbols,
+            lowercase_aliases=lowercase_aliases
+        )
 
 # Beispiel für die Verwendung
 if __name__ == "__main__":
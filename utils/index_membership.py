@@ -0,0 +1,232 @@
+"""Zeitpunktgenaue Index-Zugehörigkeit als Datum x Symbol Matrix"""
+import json
+import logging
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import norgatedata
+
+from config.config import Config
+from utils.data_manager import sanitize_filename
+from utils.parallel_download import iter_downloads
+
+
+def index_column_name(index_name: str) -> str:
+    """Spaltenname für die Zugehörigkeit zu einem Index, z.B. 'In_S&P_500'."""
+    return f'In_{index_name.replace(" ", "_")}'
+
+
+def fetch_index_membership(symbol: str, index_name: str,
+                           start_date: str, end_date: str) -> Optional[pd.Series]:
+    """
+    Holt die tägliche Index-Zugehörigkeit eines Symbols von Norgate.
+
+    Returns:
+        Bool-Series mit DatetimeIndex (leer, wenn Norgate keine Zugehörigkeit
+        liefert) oder None bei Fehler
+    """
+    try:
+        data = norgatedata.index_constituent_timeseries(
+            symbol,
+            index_name,
+            padding_setting=norgatedata.PaddingType.NONE,
+            start_date=start_date,
+            end_date=end_date,
+            timeseriesformat='pandas-dataframe'
+        )
+    except Exception as e:
+        logging.warning(f"Fehler bei Index-Prüfung für {symbol} in {index_name}: {e}")
+        return None
+
+    if data is None or data.empty:
+        return pd.Series(dtype=bool, name=symbol)
+    if 'Index Constituent' not in data.columns:
+        logging.warning(f"'Index Constituent' Spalte nicht gefunden für {symbol} in {index_name}")
+        return None
+    return data['Index Constituent'].astype(bool).rename(symbol)
+
+
+class IndexMembershipCache:
+    """
+    Hält pro Index eine Datum x Symbol Bool-Matrix der Index-Zugehörigkeit.
+
+    Die Matrix wird höchstens einmal pro Tag von Norgate aufgebaut, auf der
+    Platte gespeichert und per Array-Zugriff an beliebige Panels angefügt.
+    Fehlende Symbole werden nachgeladen, ohne die Matrix neu aufzubauen.
+    """
+
+    def __init__(self, cache_dir=None, max_workers: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Optional, Verzeichnis für die Matrizen
+            max_workers: Optional, parallele Norgate-Abfragen (Standard aus Config)
+        """
+        if cache_dir is None:
+            cache_dir = Config.get_project_path('data', 'processed', 'index_membership')
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers or Config.DOWNLOAD_MAX_WORKERS
+        self._matrices: Dict[str, pd.DataFrame] = {}
+        self._meta: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, index_name: str):
+        base = self.cache_dir / sanitize_filename(index_name)
+        return base.with_suffix('.parquet'), base.with_suffix('.json')
+
+    def _load(self, index_name: str) -> None:
+        """Lädt Matrix und Metadaten von der Platte in den Speicher."""
+        if index_name in self._matrices:
+            return
+        matrix_path, meta_path = self._paths(index_name)
+        if matrix_path.exists() and meta_path.exists():
+            try:
+                self._matrices[index_name] = pd.read_parquet(matrix_path)
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    self._meta[index_name] = json.load(f)
+                return
+            except Exception as e:
+                logging.error(f"Fehler beim Laden der Index-Matrix {matrix_path}: {e}")
+        self._matrices[index_name] = pd.DataFrame(dtype=bool)
+        self._meta[index_name] = {}
+
+    def _save(self, index_name: str) -> None:
+        matrix_path, meta_path = self._paths(index_name)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = matrix_path.with_suffix('.tmp')
+        self._matrices[index_name].to_parquet(tmp_path)
+        os.replace(tmp_path, matrix_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(self._meta[index_name], f, indent=2)
+
+    def get_matrix(self, index_name: str, symbols: List[str],
+                   start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Liefert die Zugehörigkeitsmatrix für die angefragten Symbole und Zeiträume.
+
+        Args:
+            index_name: Name des Index (z.B. 'S&P 500')
+            symbols: Benötigte Symbole
+            start_date: Startdatum im Format 'YYYY-MM-DD'
+            end_date: Enddatum im Format 'YYYY-MM-DD'
+
+        Returns:
+            Bool-DataFrame (Index: Datum, Spalten: Symbole)
+        """
+        with self._lock:
+            self._load(index_name)
+            meta = self._meta[index_name]
+            matrix = self._matrices[index_name]
+
+            # Neuaufbau wenn veraltet oder der Zeitraum nicht abgedeckt ist
+            outdated = (
+                meta.get('built_on') != date.today().isoformat()
+                or meta.get('start_date', '9999') > start_date
+                or meta.get('end_date', '0000') < end_date
+            )
+            if outdated:
+                start_date = min(start_date, meta.get('start_date', start_date))
+                end_date = max(end_date, meta.get('end_date', end_date))
+                matrix = pd.DataFrame(dtype=bool)
+                missing = list(dict.fromkeys(symbols))
+            else:
+                start_date, end_date = meta['start_date'], meta['end_date']
+                missing = [s for s in dict.fromkeys(symbols) if s not in matrix.columns]
+
+            if missing:
+                logging.info(f"Baue Index-Zugehörigkeit für {len(missing)} Symbole in {index_name} auf...")
+                columns = {}
+                downloads = iter_downloads(
+                    missing,
+                    lambda symbol: fetch_index_membership(symbol, index_name, start_date, end_date),
+                    max_workers=self.max_workers
+                )
+                failed = []
+                for symbol, series in downloads:
+                    # Fehlgeschlagene Abfragen nicht als 'nie enthalten' speichern -
+                    # sie fehlen in der Matrix und werden beim nächsten join erneut geladen
+                    if series is None:
+                        failed.append(symbol)
+                        continue
+                    # Symbole ohne Zugehörigkeit werden als 'nie enthalten' vermerkt
+                    columns[symbol] = series
+                if failed:
+                    logging.warning(f"Index-Zugehörigkeit für {len(failed)} Symbole in {index_name} "
+                                    f"nicht verfügbar, wird erneut angefragt")
+                if not columns and not outdated:
+                    return matrix
+
+                new_columns = pd.DataFrame(columns)
+                matrix = pd.concat([matrix, new_columns], axis=1) if not matrix.empty else new_columns
+                matrix = matrix.sort_index().fillna(False).astype(bool)
+                matrix.index.name = 'Date'
+
+                self._matrices[index_name] = matrix
+                self._meta[index_name] = {
+                    'built_on': date.today().isoformat(),
+                    'start_date': start_date,
+                    'end_date': end_date
+                }
+                self._save(index_name)
+
+            return matrix
+
+    def join(self, data: pd.DataFrame, index_name: str,
+             column_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Fügt die Index-Zugehörigkeit als Bool-Spalte an ein Panel an.
+
+        Args:
+            data: DataFrame mit DatetimeIndex oder 'Date'-Spalte und 'Symbol'-Spalte
+            index_name: Name des Index
+            column_name: Optional, Name der Zielspalte (Standard: 'In_<Index>')
+
+        Returns:
+            DataFrame mit zusätzlicher Bool-Spalte
+        """
+        column_name = column_name or index_column_name(index_name)
+        if data.empty:
+            data[column_name] = pd.Series(dtype=bool)
+            return data
+
+        if 'Date' in data.columns:
+            dates = pd.DatetimeIndex(data['Date'])
+        elif isinstance(data.index, pd.DatetimeIndex):
+            dates = data.index
+        else:
+            raise ValueError("DataFrame benötigt einen DatetimeIndex oder eine 'Date'-Spalte")
+        symbols = data['Symbol'].to_numpy()
+        matrix = self.get_matrix(
+            index_name,
+            list(pd.unique(symbols)),
+            dates.min().strftime('%Y-%m-%d'),
+            dates.max().strftime('%Y-%m-%d')
+        )
+
+        # Ein einziger Array-Zugriff statt eines Norgate-Aufrufs pro Symbol
+        rows = matrix.index.get_indexer(dates, method='ffill') if len(matrix.index) else np.full(len(dates), -1)
+        cols = matrix.columns.get_indexer(symbols)
+        valid = (rows >= 0) & (cols >= 0)
+        values = np.zeros(len(data), dtype=bool)
+        values[valid] = matrix.to_numpy()[rows[valid], cols[valid]]
+
+        data[column_name] = values
+        return data
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_index_membership_cache() -> IndexMembershipCache:
+    """Liefert den prozessweit geteilten Index-Cache."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = IndexMembershipCache()
+    return _default_cache
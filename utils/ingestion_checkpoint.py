@@ -0,0 +1,151 @@
+"""Checkpoints für die wiederaufnehmbare Massen-Ingestion von Marktdaten"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.parquet_store import StreamingParquetWriter
+
+MANIFEST_FILE = "manifest.json"
+
+
+class IngestionCheckpoint:
+    """
+    Verwaltet die Zwischenstände einer Ingestion in `<save_path>.checkpoint/`.
+
+    Jeder abgeschlossene Batch wird als eigene Part-Datei geschrieben und erst
+    danach im Manifest als erledigt vermerkt. Nach einem Absturz oder Stopp
+    werden beim nächsten Lauf alle im Manifest erfassten Symbole übersprungen.
+    """
+
+    def __init__(self, save_path, start_date: str, end_date: str):
+        """
+        Args:
+            save_path: Zieldatei der Ingestion
+            start_date: Startdatum (YYYY-MM-DD)
+            end_date: Enddatum (YYYY-MM-DD)
+        """
+        self.save_path = Path(save_path)
+        self.directory = Path(f"{save_path}.checkpoint")
+        self.start_date = start_date
+        self.end_date = end_date
+        self.manifest = self._load()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    def _new_manifest(self) -> dict:
+        return {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "created_at": datetime.now().isoformat(),
+            "parts": [],
+            "empty_symbols": []
+        }
+
+    def _load(self) -> dict:
+        """Lädt ein bestehendes Manifest, sofern es zum angefragten Zeitraum passt."""
+        if not self.manifest_path.exists():
+            return self._new_manifest()
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logging.error(f"Checkpoint-Manifest nicht lesbar, starte neu: {e}")
+            self.clear()
+            return self._new_manifest()
+
+        if (manifest.get("start_date"), manifest.get("end_date")) != (self.start_date, self.end_date):
+            logging.warning("Checkpoint gehört zu einem anderen Zeitraum, starte neu")
+            self.clear()
+            return self._new_manifest()
+
+        logging.info(f"Checkpoint gefunden: {len(self.completed_symbols(manifest))} Symbole bereits gespeichert")
+        return manifest
+
+    def _save(self) -> None:
+        """Schreibt das Manifest atomar."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def completed_symbols(self, manifest: Optional[dict] = None) -> set:
+        """Alle Symbole, die bereits gespeichert oder als leer erkannt wurden."""
+        manifest = manifest or self.manifest
+        completed = set(manifest.get("empty_symbols", []))
+        for part in manifest.get("parts", []):
+            completed.update(part["symbols"])
+        return completed
+
+    def pending_symbols(self, symbols: List[str]) -> List[str]:
+        """Filtert die noch zu ladenden Symbole (Reihenfolge bleibt erhalten)."""
+        completed = self.completed_symbols()
+        return [symbol for symbol in symbols if symbol not in completed]
+
+    def commit_batch(self, frames: List[pd.DataFrame], empty_symbols: List[str]) -> None:
+        """
+        Persistiert einen Batch und vermerkt seine Symbole im Manifest.
+
+        Args:
+            frames: DataFrames der geladenen Symbole
+            empty_symbols: Symbole ohne Daten (werden ebenfalls nicht erneut geladen)
+        """
+        if frames:
+            part_name = f"part-{len(self.manifest['parts']):05d}.parquet"
+            part_path = self.directory / part_name
+            batch = pd.concat(frames, ignore_index=False)
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f"_{part_name}.tmp"
+            pq.write_table(pa.Table.from_pandas(batch, preserve_index=True), tmp_path)
+            os.replace(tmp_path, part_path)
+
+            self.manifest["parts"].append({
+                "file": part_name,
+                "rows": len(batch),
+                "symbols": list(batch["Symbol"].unique())
+            })
+
+        self.manifest["empty_symbols"].extend(empty_symbols)
+        self._save()
+
+    def finalize(self, batch_rows: int = 250_000) -> int:
+        """
+        Fügt alle Part-Dateien zur Zieldatei zusammen und entfernt den Checkpoint.
+
+        Args:
+            batch_rows: Zeilen pro Row-Group der Zieldatei
+
+        Returns:
+            Anzahl der geschriebenen Zeilen
+        """
+        tmp_path = f"{self.save_path}.tmp"
+        with StreamingParquetWriter(tmp_path, batch_rows=batch_rows) as writer:
+            for part in self.manifest["parts"]:
+                # Part für Part lesen - der Speicherbedarf bleibt auf einen Batch begrenzt
+                writer.write(pd.read_parquet(self.directory / part["file"]))
+
+        if writer.rows_written == 0:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, self.save_path)
+
+        self.clear()
+        return writer.rows_written
+
+    def clear(self) -> None:
+        """Entfernt das Checkpoint-Verzeichnis."""
+        shutil.rmtree(self.directory, ignore_errors=True)
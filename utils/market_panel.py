@@ -0,0 +1,143 @@
+"""Nach Symbol sortiertes Marktdaten-Panel mit Offset-Tabelle"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class MarketPanel:
+    """
+    Marktdaten im Long-Format, einmalig nach Symbol und Datum sortiert.
+
+    Für jedes Symbol wird der Bereich [start, end) seiner Zeilen in einer
+    Offset-Tabelle gehalten (CSR-Layout). Der Zugriff auf ein Symbol ist damit
+    ein Slice ohne Kopie statt eines Vergleichs über alle Zeilen, und die
+    Iteration über alle Symbole ist linear in der Zeilenanzahl.
+
+    Beispiel:
+        panel = MarketPanel.from_frame(df)
+        for symbol, symbol_data in panel.iter_symbols():
+            ...
+        closes = panel.values('AAPL', 'Close')
+    """
+
+    def __init__(self, frame: pd.DataFrame, symbols: np.ndarray, offsets: np.ndarray,
+                 symbol_column: str = 'Symbol'):
+        """
+        Args:
+            frame: Bereits nach Symbol und Datum sortierter DataFrame
+            symbols: Eindeutige Symbole in Sortierreihenfolge
+            offsets: Start-Offsets je Symbol plus Endoffset (Länge len(symbols) + 1)
+            symbol_column: Name der Symbol-Spalte
+        """
+        self.frame = frame
+        self.symbols = symbols
+        self.offsets = offsets
+        self.symbol_column = symbol_column
+        self._lookup: Dict[str, int] = {symbol: i for i, symbol in enumerate(symbols)}
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol_column: str = 'Symbol') -> 'MarketPanel':
+        """
+        Baut ein Panel aus einem DataFrame mit Symbol-Spalte.
+
+        Args:
+            df: DataFrame mit DatetimeIndex (oder 'Date'-Spalte) und Symbol-Spalte
+            symbol_column: Name der Symbol-Spalte
+
+        Returns:
+            MarketPanel
+        """
+        if symbol_column not in df.columns:
+            raise ValueError(f"DataFrame benötigt eine '{symbol_column}'-Spalte")
+
+        codes, symbols = pd.factorize(df[symbol_column], sort=True)
+        symbols = np.asarray(symbols, dtype=object)
+        if 'Date' in df.columns:
+            dates = pd.DatetimeIndex(df['Date']).asi8
+        elif isinstance(df.index, pd.DatetimeIndex):
+            dates = df.index.asi8
+        else:
+            dates = np.arange(len(df))
+
+        # Nur sortieren wenn nötig - Download-Ergebnisse liegen meist schon je Symbol vor
+        order = np.lexsort((dates, codes))
+        if np.array_equal(order, np.arange(len(df))):
+            frame = df
+        else:
+            frame = df.take(order)
+            codes = codes[order]
+
+        counts = np.bincount(codes, minlength=len(symbols))
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(frame, symbols, offsets, symbol_column)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._lookup
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    def bounds(self, symbol: str) -> Tuple[int, int]:
+        """Zeilenbereich [start, end) eines Symbols."""
+        i = self._lookup[symbol]
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def get(self, symbol: str) -> pd.DataFrame:
+        """Zeilen eines Symbols als Slice des sortierten Frames (ohne Kopie)."""
+        start, end = self.bounds(symbol)
+        return self.frame.iloc[start:end]
+
+    def column(self, name: str, dtype=None) -> np.ndarray:
+        """
+        Spalte als zusammenhängendes NumPy-Array (wird zwischengespeichert).
+
+        Args:
+            name: Spaltenname
+            dtype: Optional, Ziel-Datentyp
+        """
+        key = (name, np.dtype(dtype).str if dtype is not None else None)
+        if key not in self._columns:
+            values = self.frame[name].to_numpy(dtype=dtype)
+            self._columns[key] = np.ascontiguousarray(values)
+        return self._columns[key]
+
+    def values(self, symbol: str, name: str) -> np.ndarray:
+        """Werte einer Spalte für ein Symbol als Array-View."""
+        start, end = self.bounds(symbol)
+        return self.column(name)[start:end]
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Datum je Zeile in Panel-Reihenfolge."""
+        if 'Date' in self.frame.columns:
+            return pd.DatetimeIndex(self.frame['Date'])
+        return pd.DatetimeIndex(self.frame.index)
+
+    def group_ids(self) -> np.ndarray:
+        """Symbol-Nummer je Zeile (0 .. n_symbols - 1)."""
+        return np.repeat(np.arange(self.n_symbols), np.diff(self.offsets))
+
+    def positions(self) -> np.ndarray:
+        """Position jeder Zeile innerhalb ihres Symbols (0 = erster Bar)."""
+        return np.arange(len(self.frame)) - np.repeat(self.offsets[:-1], np.diff(self.offsets))
+
+    def last_rows(self) -> np.ndarray:
+        """Zeilennummer des jeweils letzten Bars je Symbol."""
+        return self.offsets[1:] - 1
+
+    def iter_symbols(self, symbols: Optional[List[str]] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Iteriert über (Symbol, Zeilen-Slice).
+
+        Args:
+            symbols: Optional, nur diese Symbole (unbekannte werden übersprungen)
+        """
+        selected = self.symbols if symbols is None else [s for s in symbols if s in self._lookup]
+        for symbol in selected:
+            yield symbol, self.get(symbol)
@@ -0,0 +1,177 @@
+"""Datum x Symbol Panel als NumPy-Memmap für Lesezugriffe ohne Kopie"""
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+DATES_FILE = "dates.npy"
+DEFAULT_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class MemmapPanel:
+    """
+    OHLCV-Daten als unkomprimierte Datum x Symbol Matrizen, eine .npy-Datei je Feld.
+
+    Die Dateien werden mit mmap_mode='r' geöffnet: das Öffnen kostet unabhängig
+    von der Datenmenge nur das Lesen der Header, und mehrere Prozesse teilen
+    sich die Seiten im Page-Cache des Betriebssystems. Fehlende Bars sind NaN.
+
+    Beispiel:
+        panel = MemmapPanel.open(path)
+        closes = panel.frame('Close')          # DataFrame-View, Index Datum, Spalten Symbole
+        aapl = panel.field('Close')[:, panel.symbol_index(['AAPL'])[0]]
+    """
+
+    def __init__(self, root: Path, dates: pd.DatetimeIndex, symbols: pd.Index, meta: dict):
+        self.root = Path(root)
+        self.dates = dates
+        self.symbols = symbols
+        self.meta = meta
+        self._fields: Dict[str, np.ndarray] = {}
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.meta['fields'])
+
+    @property
+    def source_version(self) -> Optional[float]:
+        """Stand der Quelldaten beim Erstellen (z.B. Änderungszeit des Caches)."""
+        return self.meta.get('source_version')
+
+    @property
+    def shape(self):
+        return len(self.dates), len(self.symbols)
+
+    @staticmethod
+    def exists(root) -> bool:
+        return (Path(root) / META_FILE).exists()
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, root, fields: Optional[List[str]] = None,
+              dtype: str = 'float64', source_version: Optional[float] = None) -> 'MemmapPanel':
+        """
+        Schreibt Marktdaten im Long-Format als Panel.
+
+        Args:
+            df: DataFrame mit DatetimeIndex, 'Symbol'-Spalte und Feldspalten
+            root: Zielverzeichnis (wird atomar ersetzt)
+            fields: Optional, zu speichernde Spalten (Standard: OHLCV soweit vorhanden)
+            dtype: Datentyp der Matrizen
+            source_version: Optional, Stand der Quelldaten für spätere Aktualitätsprüfung
+
+        Returns:
+            Geöffnetes MemmapPanel
+        """
+        root = Path(root)
+        if fields is None:
+            fields = [field for field in DEFAULT_FIELDS if field in df.columns]
+
+        dates = pd.DatetimeIndex(df.index)
+        symbol_values = df['Symbol'].to_numpy()
+        all_dates = pd.DatetimeIndex(np.unique(dates.values), name='Date')
+        all_symbols = pd.Index(np.unique(symbol_values.astype(str)), name='Symbol')
+        rows = all_dates.get_indexer(dates)
+        cols = all_symbols.get_indexer(symbol_values)
+
+        tmp_root = root.with_name(f"{root.name}.tmp")
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        tmp_root.mkdir(parents=True)
+
+        for field in fields:
+            matrix = np.lib.format.open_memmap(
+                tmp_root / f"{field}.npy", mode='w+', dtype=dtype, shape=(len(all_dates), len(all_symbols))
+            )
+            matrix[:] = np.nan
+            matrix[rows, cols] = df[field].to_numpy(dtype=dtype)
+            matrix.flush()
+            del matrix
+
+        np.save(tmp_root / DATES_FILE, all_dates.asi8)
+        meta = {
+            'fields': fields,
+            'symbols': list(all_symbols),
+            'dtype': dtype,
+            'rows': len(df),
+            'built_at': datetime.now().isoformat(),
+            'source_version': source_version
+        }
+        with open(tmp_root / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        # Bereits geöffnete Memmaps behalten ihre (gelöschten) Dateien bis zum Schließen
+        shutil.rmtree(root, ignore_errors=True)
+        os.replace(tmp_root, root)
+        return cls.open(root)
+
+    @classmethod
+    def open(cls, root) -> 'MemmapPanel':
+        """Öffnet ein Panel, die Matrizen werden erst beim Zugriff eingeblendet."""
+        root = Path(root)
+        with open(root / META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        dates = pd.DatetimeIndex(np.load(root / DATES_FILE).view('datetime64[ns]'), name='Date')
+        symbols = pd.Index(meta['symbols'], name='Symbol')
+        return cls(root, dates, symbols, meta)
+
+    def field(self, name: str) -> np.ndarray:
+        """Matrix eines Feldes (Datum x Symbol) als schreibgeschützte Memmap."""
+        if name not in self._fields:
+            if name not in self.meta['fields']:
+                raise KeyError(f"Feld nicht im Panel vorhanden: {name}")
+            self._fields[name] = np.load(self.root / f"{name}.npy", mmap_mode='r')
+        return self._fields[name]
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """Feld als DataFrame-View (Index: Datum, Spalten: Symbole) ohne Kopie."""
+        return pd.DataFrame(self.field(name), index=self.dates, columns=self.symbols, copy=False)
+
+    def symbol_index(self, symbols: List[str]) -> np.ndarray:
+        """Spaltennummern der Symbole (-1 für unbekannte Symbole)."""
+        return self.symbols.get_indexer(symbols)
+
+    def to_long(self, symbols: Optional[List[str]] = None,
+                start_date: Optional[str] = None,
+                end_date: Optional[str] = None,
+                fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Liefert einen Ausschnitt im Long-Format wie load_market_data.
+
+        Es wird nur der angefragte Ausschnitt gelesen und kopiert.
+
+        Args:
+            symbols: Optional, Symbole (Standard: alle)
+            start_date: Optional, Startdatum im Format 'YYYY-MM-DD'
+            end_date: Optional, Enddatum im Format 'YYYY-MM-DD'
+            fields: Optional, Felder (Standard: alle)
+
+        Returns:
+            DataFrame mit DatetimeIndex 'Date', Feldspalten und 'Symbol', je Symbol chronologisch
+        """
+        fields = fields or self.fields
+        first = self.dates.searchsorted(pd.Timestamp(start_date)) if start_date else 0
+        last = self.dates.searchsorted(pd.Timestamp(end_date), side='right') if end_date else len(self.dates)
+        if symbols is None:
+            cols = np.arange(len(self.symbols))
+        else:
+            cols = self.symbol_index(symbols)
+            cols = cols[cols >= 0]
+
+        # Symbol-major Reihenfolge: Transponieren, dann zeilenweise abflachen
+        blocks = {field: self.field(field)[first:last, cols].T for field in fields}
+        # Ein Bar existiert, wenn mindestens ein Feld belegt ist
+        present = np.zeros((len(cols), last - first), dtype=bool)
+        for block in blocks.values():
+            present |= ~np.isnan(block)
+        present = present.ravel()
+
+        dates = np.tile(self.dates[first:last].values, len(cols))[present]
+        frame = pd.DataFrame({field: block.ravel()[present] for field, block in blocks.items()},
+                             index=pd.DatetimeIndex(dates, name='Date'))
+        frame['Symbol'] = np.repeat(self.symbols[cols].to_numpy(), last - first)[present]
+        return frame
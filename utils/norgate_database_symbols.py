@@ -2,6 +2,8 @@ import norgatedata
 import pandas as pd
 import logging
 
+from utils.symbol_metadata import get_symbol_metadata_cache
+
 # Logging konfigurieren
 logging.basicConfig(
     level=logging.INFO,
@@ -42,16 +44,11 @@ def count_equity_symbols(symbols: list) -> int:
     """
     Zählt Aktien-Symbole mit Fehlerbehandlung.
     """
-    counter = 0
-    for symbol in symbols:
-        try:
-            if norgatedata.subtype1(symbol) == 'Equity':
-                counter += 1
-        except Exception as e:
-            logging.warning(f"Fehler beim Prüfen von Symbol {symbol}: {str(e)}")
-            continue
-            
-    return counter
+    try:
+        return len(get_symbol_metadata_cache().filter_subtype(symbols, 'Equity'))
+    except Exception as e:
+        logging.warning(f"Fehler beim Prüfen der Symbole: {str(e)}")
+        return 0
 
 def get_active_symbols() -> list:
     """
@@ -68,11 +65,8 @@ def get_active_symbols() -> list:
         # Aktive Symbole abrufen
         symbols = norgatedata.symbols(norgatedata.SymbolType.ACTIVE)
         
-        # Filtere auf Aktien
-        equity_symbols = [
-            symbol for symbol in symbols 
-            if norgatedata.subtype1(symbol) == 'Equity'
-        ]
+        # Filtere auf Aktien über den lokalen Metadaten-Cache
+        equity_symbols = get_symbol_metadata_cache().filter_subtype(symbols, 'Equity')
         
         logging.info(f"Erfolgreich {len(equity_symbols)} aktive Aktien-Symbole geladen")
         return equity_symbols
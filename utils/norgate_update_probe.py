@@ -0,0 +1,58 @@
+"""Ermittelt das letzte bei Norgate verfügbare Handelsdatum"""
+import logging
+from typing import Optional
+
+import pandas as pd
+import norgatedata
+
+from config.config import Config
+from utils.ttl_cache import TTLCache
+
+_probe_cache = TTLCache(Config.NORGATE_PROBE_TTL)
+
+
+def _probe(reference_symbol: str) -> Optional[pd.Timestamp]:
+    if not norgatedata.status():
+        logging.warning("Norgate Data Utility ist nicht aktiv, Aktualitätsprüfung über Norgate nicht möglich")
+        return None
+    try:
+        value = norgatedata.last_quoted_date(reference_symbol)
+    except (Exception, SystemExit) as e:
+        # norgatedata beendet bei Verbindungsfehlern den Prozess per sys.exit
+        logging.warning(f"Letztes Handelsdatum von {reference_symbol} nicht abrufbar: {e}")
+        return None
+    if value is None:
+        return None
+    # ISO-Datum, ggf. mit Zeitzone - nur der Kalendertag zählt
+    return pd.Timestamp(str(value)[:10])
+
+
+def latest_trading_date(reference_symbol: Optional[str] = None,
+                        use_cache: bool = True) -> Optional[pd.Timestamp]:
+    """
+    Letztes Handelsdatum, für das Norgate bereits Daten hat.
+
+    Abgefragt wird das letzte Kursdatum eines Referenzsymbols (Standard: $SPX).
+    Das Ergebnis wird für Config.NORGATE_PROBE_TTL Sekunden zwischengespeichert,
+    Fehlschläge werden nicht gespeichert.
+
+    Args:
+        reference_symbol: Optional, Referenzsymbol (Standard aus Config)
+        use_cache: False erzwingt eine neue Abfrage
+
+    Returns:
+        Datum oder None wenn Norgate nicht erreichbar ist
+    """
+    reference_symbol = reference_symbol or Config.NORGATE_REFERENCE_SYMBOL
+    if not use_cache:
+        _probe_cache.invalidate(reference_symbol)
+    return _probe_cache.get_or_load(
+        reference_symbol,
+        lambda: _probe(reference_symbol),
+        cache_if=lambda value: value is not None
+    )
+
+
+def invalidate_latest_trading_date() -> None:
+    """Verwirft das zwischengespeicherte Handelsdatum (z.B. nach einem Norgate-Update)."""
+    _probe_cache.invalidate()
@@ -1,5 +1,9 @@
 import norgatedata
 import logging
+from typing import Optional
+
+from config.config import Config
+from utils.ttl_cache import TTLCache
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -7,39 +11,81 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
     
+# Watchlists ändern sich höchstens einmal täglich - Namen und Mitglieder werden
+# daher prozessweit zwischengespeichert statt bei jedem Aufruf Norgate abzufragen
+_watchlist_cache = TTLCache(ttl=Config.WATCHLIST_CACHE_TTL)
+_WATCHLIST_NAMES_KEY = ('__watchlists__',)
+
+def invalidate_watchlist_cache(watchlist_name: Optional[str] = None) -> None:
+    """
+    Verwirft zwischengespeicherte Watchlist-Daten.
+    
+    Args:
+        watchlist_name: Optional, nur die Mitglieder dieser Watchlist verwerfen.
+                        Ohne Angabe werden alle Einträge inkl. Watchlist-Namen verworfen.
+    """
+    if watchlist_name is None:
+        _watchlist_cache.invalidate()
+    else:
+        _watchlist_cache.invalidate(('symbols', watchlist_name))
+
+def _load_watchlist_names() -> list:
+    # Prüfen ob Norgate Data Utility läuft
+    if not norgatedata.status():
+        raise ConnectionError("Norgate Data Utility ist nicht aktiv")
+    return norgatedata.watchlists() or []
+
+def get_watchlist_names(use_cache: bool = True) -> list:
+    """
+    Holt die Namen aller Norgate Watchlisten.
+    
+    Args:
+        use_cache: Zwischengespeicherte Namen verwenden (False = immer Norgate abfragen)
+        
+    Returns:
+        Liste der Watchlist-Namen
+        
+    Raises:
+        ConnectionError: Wenn die Norgate Data Utility nicht aktiv ist
+    """
+    if not use_cache:
+        invalidate_watchlist_cache()
+    # Leere Listen werden nicht gecacht, damit ein später gestarteter Norgate-Dienst greift
+    return _watchlist_cache.get_or_load(_WATCHLIST_NAMES_KEY, _load_watchlist_names, cache_if=bool)
+
 # Gets all symbols from a specific watchlist
 # Example: Get all symbols from the S&P 500 watchlist
-def get_watchlist_symbols(watchlist_name: str) -> list:
+def get_watchlist_symbols(watchlist_name: str, use_cache: bool = True) -> list:
     """
     Holt Symbole aus verschiedenen Norgate Watchlisten mit Fehlerbehandlung.
     
     Args:
         watchlist_name: Name der jeweiligen Norgate Watchliste
+        use_cache: Zwischengespeicherte Daten verwenden (False = immer Norgate abfragen)
         
     Returns:
         Liste der Symbole oder leere Liste bei Fehler
     """
     try:
-        # Prüfen ob Norgate Data Utility läuft
-        if not norgatedata.status():
-            raise ConnectionError("Norgate Data Utility ist nicht aktiv")        # Get all active watchlists from norgatedata
-        all_watchlists = norgatedata.watchlists()
+        all_watchlists = get_watchlist_names(use_cache=use_cache)
         # Suche nach der gewünschten Watchlist
         if watchlist_name not in all_watchlists:
             logging.error(f"Watchlist: {watchlist_name} nicht gefunden! Verfügbare Watchlists: {all_watchlists}")
             return []
             
-        logging.info(f"Gefundene Watchlist: {watchlist_name}")
-  
+        def load_symbols() -> list:
+            logging.info(f"Gefundene Watchlist: {watchlist_name}")
+            return norgatedata.watchlist_symbols(watchlist_name)
         
         # Symbole abrufen
-        symbols = norgatedata.watchlist_symbols(watchlist_name)
+        symbols = _watchlist_cache.get_or_load(('symbols', watchlist_name), load_symbols, cache_if=bool)
         if not symbols:
             logging.error(f"Keine Symbole in der Watchlist {watchlist_name} gefunden")
             return []
             
         logging.info(f"Erfolgreich {len(symbols)} Symbole aus {watchlist_name} geladen")
-        return symbols
+        # Kopie zurückgeben, damit Aufrufer den Cache nicht verändern
+        return list(symbols)
         
     except ConnectionError as e:
         # Verbindungsfehler zur Norgate Data Utility
@@ -0,0 +1,221 @@
+"""Prozessweiter LRU-Cache geladener Marktdaten-Panels"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from config.config import Config
+from utils.data_manager import EnhancedMarketDataManager, memory_report
+from utils.norgate_update_probe import latest_trading_date
+
+
+class PanelCache:
+    """
+    Hält geladene Marktdaten im Speicher, begrenzt durch ein Speicherbudget.
+
+    Bei Überschreitung des Budgets werden die am längsten nicht genutzten
+    Panels verworfen. Einträge verfallen zusätzlich nach `ttl` Sekunden, damit
+    offene Zeiträume ('bis heute') nach einer Datenaktualisierung neu geladen werden.
+
+    Zurückgegeben werden flache Kopien: neue oder ersetzte Spalten verändern den
+    Cache nicht, In-place-Änderungen an bestehenden Werten dagegen schon.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_bytes: Optional, Speicherbudget in Bytes (Standard aus Config)
+            ttl: Optional, Gültigkeitsdauer eines Eintrags in Sekunden (Standard aus Config)
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.max_bytes = Config.PANEL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = Config.PANEL_CACHE_TTL if ttl is None else ttl
+        self._clock = clock
+        # key -> (Ablaufzeit, Bytes, DataFrame), Reihenfolge = zuletzt genutzt am Ende
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, pd.DataFrame]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """Liefert ein gültiges Panel (flache Kopie) oder None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, frame = entry
+            if self._clock() >= expires_at:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return frame.copy(deep=False)
+
+    def put(self, key: Hashable, frame: pd.DataFrame) -> None:
+        """Speichert ein Panel und verdrängt bei Bedarf die ältesten Einträge."""
+        size = memory_report(frame)['total_bytes']
+        if size > self.max_bytes:
+            logging.info(f"Panel mit {size / 1e6:.0f} MB überschreitet das Cache-Budget, wird nicht gespeichert")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self._bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            self._entries[key] = (self._clock() + self.ttl, size, frame)
+            self._bytes += size
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Liefert das Panel zu `key` oder lädt es über `loader`.
+
+        Parallele Anfragen für denselben Key warten auf einen einzigen Ladevorgang.
+        """
+        frame = self.get(key)
+        if frame is not None:
+            self.hits += 1
+            return frame
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            frame = self.get(key)
+            if frame is not None:
+                self.hits += 1
+                return frame
+            self.misses += 1
+            frame = loader()
+            if frame is not None and not frame.empty:
+                self.put(key, frame)
+            return frame.copy(deep=False) if frame is not None else frame
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Entfernt Einträge.
+
+        Args:
+            predicate: Optional, nur Keys entfernen für die predicate(key) wahr ist
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Kennzahlen des Caches (Einträge, Speicher, Treffer)."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_panel_cache() -> PanelCache:
+    """Liefert den prozessweit geteilten Panel-Cache."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PanelCache()
+    return _default_cache
+
+
+def panel_key(mdm: EnhancedMarketDataManager, start_date: Optional[str], end_date: Optional[str],
+              symbols: Optional[List[str]] = None, columns: Optional[List[str]] = None,
+              **options) -> Tuple:
+    """Cache-Key eines Panels: Datenquelle, Watchlist, Symbole, Zeitraum, Spalten und Ladeoptionen."""
+    source = str(mdm.store.root if mdm.store is not None else mdm.cache_file)
+    return (
+        source,
+        mdm.watchlist_name,
+        tuple(symbols) if symbols else None,
+        start_date,
+        end_date,
+        tuple(columns) if columns else None,
+        tuple(sorted(options.items()))
+    )
+
+
+def load_market_panel(mdm: EnhancedMarketDataManager, start_date: Optional[str] = None,
+                      end_date: Optional[str] = None, symbols: Optional[List[str]] = None,
+                      columns: Optional[List[str]] = None, use_cache: bool = True,
+                      **options) -> pd.DataFrame:
+    """
+    Lädt Marktdaten über den Panel-Cache.
+
+    Args:
+        mdm: Market Data Manager der Datenquelle
+        start_date: Optional, Startdatum im Format 'YYYY-MM-DD'
+        end_date: Optional, Enddatum im Format 'YYYY-MM-DD'
+        symbols: Optional, Liste der zu ladenden Symbole
+        columns: Optional, nur diese Spalten laden
+        use_cache: False lädt direkt über den Manager
+        **options: Weitere Optionen für load_market_data (z.B. price_dtype)
+
+    Returns:
+        DataFrame mit Marktdaten (nicht in-place verändern)
+    """
+    def loader():
+        return mdm.load_market_data(start_date=start_date, end_date=end_date,
+                                    symbols=symbols, columns=columns, **options)
+
+    if not use_cache:
+        return loader()
+    key = panel_key(mdm, start_date, end_date, symbols, columns, **options)
+    if end_date is None or end_date >= datetime.now().strftime("%Y-%m-%d"):
+        # Offene Zeiträume gelten nur bis zum nächsten Norgate-Update
+        key += (latest_trading_date(),)
+    return get_panel_cache().get_or_load(key, loader)
+
+
+def warm_panel_cache(watchlists: List[str], start_date: str, end_date: str, **options) -> int:
+    """
+    Lädt die Panels der angegebenen Watchlists vorab in den Cache.
+
+    Args:
+        watchlists: Namen der Watchlists
+        start_date: Startdatum im Format 'YYYY-MM-DD'
+        end_date: Enddatum im Format 'YYYY-MM-DD'
+        **options: Optionen wie beim späteren Abruf (bestimmen den Cache-Key)
+
+    Returns:
+        Anzahl erfolgreich geladener Panels
+    """
+    warmed = 0
+    for watchlist_name in watchlists:
+        started = time.perf_counter()
+        try:
+            panel = load_market_panel(EnhancedMarketDataManager(watchlist_name=watchlist_name),
+                                      start_date, end_date, **options)
+            warmed += 1
+            logging.info(f"Panel-Cache für {watchlist_name} vorgeladen: {len(panel)} Zeilen "
+                         f"in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logging.error(f"Fehler beim Vorladen von {watchlist_name}: {e}")
+    return warmed
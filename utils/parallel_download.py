@@ -0,0 +1,102 @@
+"""Parallele, begrenzte Downloads von Norgate-Zeitreihen"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+
+class RateLimiter:
+    """
+    Thread-sicherer Rate-Limiter: höchstens `calls_per_second` Aufrufe pro Sekunde,
+    gleichmäßig über alle Worker verteilt.
+    """
+
+    def __init__(self, calls_per_second: Optional[float] = None):
+        self.interval = 1.0 / calls_per_second if calls_per_second else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blockiert bis der nächste Aufruf erlaubt ist."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def iter_downloads(symbols: List[str],
+                   fetch: Callable[[str], Optional[pd.DataFrame]],
+                   max_workers: int = 1,
+                   rate_limit: Optional[float] = None,
+                   should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, Optional[pd.DataFrame]]]:
+    """
+    Lädt Symbole mit begrenzter Parallelität und liefert die Ergebnisse in
+    Abschlussreihenfolge.
+
+    Es sind nie mehr als `max_workers` Downloads gleichzeitig eingereiht, damit
+    ein Stopp-Wunsch schnell greift und nicht tausende Aufträge abgebrochen
+    werden müssen.
+
+    Args:
+        symbols: Liste der zu ladenden Symbole
+        fetch: Funktion, die ein Symbol lädt (DataFrame oder None)
+        max_workers: Anzahl paralleler Downloads (1 = sequentiell)
+        rate_limit: Optional, maximale Aufrufe pro Sekunde über alle Worker
+        should_stop: Optional, Funktion die True liefert wenn abgebrochen werden soll
+
+    Yields:
+        Tupel (Symbol, DataFrame oder None)
+    """
+    limiter = RateLimiter(rate_limit)
+    should_stop = should_stop or (lambda: False)
+
+    def limited_fetch(symbol: str) -> Optional[pd.DataFrame]:
+        limiter.wait()
+        return fetch(symbol)
+
+    # Sequentieller Pfad ohne Thread-Overhead
+    if max_workers <= 1:
+        for symbol in symbols:
+            if should_stop():
+                return
+            try:
+                yield symbol, limited_fetch(symbol)
+            except Exception as e:
+                logging.error(f"Fehler beim Download von {symbol}: {e}")
+                yield symbol, None
+        return
+
+    pending = {}
+    remaining = iter(symbols)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="norgate-download") as executor:
+        try:
+            while True:
+                # Warteschlange bis zur Worker-Anzahl auffüllen
+                while len(pending) < max_workers and not should_stop():
+                    symbol = next(remaining, None)
+                    if symbol is None:
+                        break
+                    pending[executor.submit(limited_fetch, symbol)] = symbol
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol = pending.pop(future)
+                    try:
+                        yield symbol, future.result()
+                    except Exception as e:
+                        logging.error(f"Fehler beim Download von {symbol}: {e}")
+                        yield symbol, None
+        finally:
+            for future in pending:
+                future.cancel()
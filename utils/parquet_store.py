@@ -0,0 +1,465 @@
+import json
+import logging
+import os
+import threading
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Dateiname der Metadaten im Wurzelverzeichnis des Stores
+MANIFEST_FILE = "_store.json"
+# Dateiname der Daten innerhalb einer Partition
+PARTITION_FILE = "data.parquet"
+# Sperrdatei für Schreibzugriffe mehrerer Prozesse
+LOCK_FILE = "_store.lock"
+
+
+def symbol_bucket(symbol: str, num_buckets: int) -> int:
+    """
+    Ordnet ein Symbol stabil einem Bucket zu.
+
+    Args:
+        symbol: Aktien-Symbol
+        num_buckets: Anzahl der Buckets im Store
+
+    Returns:
+        Bucket-Nummer zwischen 0 und num_buckets - 1
+    """
+    # crc32 ist im Gegensatz zu hash() über Prozesse hinweg stabil
+    return zlib.crc32(symbol.encode("utf-8")) % num_buckets
+
+
+def unique_tmp_path(path: Path) -> Path:
+    """Temporäre Datei neben `path`, eindeutig je Prozess und Aufruf (Präfix '_': von Datasets ignoriert)."""
+    return path.parent / f"_{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+class StoreLock:
+    """
+    Exklusive Schreibsperre eines Stores über Threads und Prozesse hinweg.
+
+    Innerhalb eines Prozesses teilen sich alle Instanzen für dasselbe Verzeichnis
+    eine (wiedereintrittsfähige) Sperre, zwischen Prozessen sperrt eine Datei im
+    Wurzelverzeichnis (fcntl.flock bzw. msvcrt.locking unter Windows).
+    """
+
+    _instances: Dict[Path, "StoreLock"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Pfad der Sperrdatei
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    @classmethod
+    def for_path(cls, path) -> "StoreLock":
+        """Liefert die prozessweit geteilte Sperre für eine Sperrdatei."""
+        path = Path(path).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _lock_file(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gibt nach etwa 10 Sekunden auf - weiter warten
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(self) -> None:
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    @contextmanager
+    def __call__(self) -> Iterator[None]:
+        with self._lock:
+            # Die Datei nur beim äußersten Aufruf sperren (verschachtelte Schreibzugriffe)
+            if self._depth == 0:
+                self._lock_file()
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._unlock_file()
+
+
+class StreamingParquetWriter:
+    """
+    Schreibt Marktdaten inkrementell in eine Parquet-Datei.
+
+    Eingehende DataFrames werden gepuffert und bei Erreichen von `batch_rows`
+    als Row-Group geschrieben, sodass der Speicherbedarf unabhängig von der
+    Gesamtgröße des Datensatzes bleibt. Das Schema wird durch den ersten Batch
+    festgelegt; fehlende Spalten späterer Batches werden mit Nullwerten gefüllt.
+
+    Verwendung:
+        with StreamingParquetWriter(path) as writer:
+            for df in frames:
+                writer.write(df)
+    """
+
+    def __init__(self, path, batch_rows: int = 250_000, compression: str = "snappy"):
+        """
+        Args:
+            path: Zieldatei
+            batch_rows: Zeilen pro Row-Group (Puffergröße)
+            compression: Parquet-Kompression
+        """
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self.compression = compression
+        self.schema = None
+        self._columns = None
+        self._index_name = None
+        self.rows_written = 0
+        self._writer = None
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Puffert einen DataFrame und schreibt bei Bedarf eine Row-Group."""
+        if df is None or df.empty:
+            return
+        self._buffer.append(df)
+        self._buffered_rows += len(df)
+        if self._buffered_rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Schreibt den Puffer als Row-Group."""
+        if not self._buffer:
+            return
+        batch = pd.concat(self._buffer, ignore_index=False)
+        self._buffer = []
+        self._buffered_rows = 0
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(batch, preserve_index=True)
+            self.schema = table.schema
+            self._columns = list(batch.columns)
+            self._index_name = batch.index.name
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        else:
+            # Spalten an das Schema des ersten Batches angleichen
+            batch = batch.reindex(columns=self._columns)
+            batch.index.name = self._index_name
+            table = pa.Table.from_pandas(batch, schema=self.schema, preserve_index=True)
+
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+
+    def close(self) -> None:
+        """Schreibt verbleibende Daten und schließt die Datei."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PartitionedParquetStore:
+    """
+    Partitionierter Parquet-Speicher für Marktdaten.
+
+    Layout: <root>/bucket=<nn>/year=<yyyy>/data.parquet
+
+    Datums-, Symbol- und Spaltenfilter werden an den Parquet-Reader
+    weitergereicht, sodass nur die benötigten Partitionen und Row-Groups
+    gelesen werden.
+    """
+
+    def __init__(self, root, num_buckets: int = 16, row_group_size: int = 50_000):
+        """
+        Args:
+            root: Wurzelverzeichnis des Stores
+            num_buckets: Anzahl der Symbol-Buckets (wird beim ersten Schreiben festgelegt)
+            row_group_size: Maximale Zeilen pro Row-Group
+        """
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+
+        # Bei existierendem Store gilt die gespeicherte Bucket-Anzahl
+        manifest = self.read_manifest()
+        self.num_buckets = manifest.get("num_buckets", num_buckets)
+        self.lock = StoreLock.for_path(self.root / LOCK_FILE)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def exists(self) -> bool:
+        """Prüft ob der Store bereits Daten enthält."""
+        return self.manifest_path.exists()
+
+    def read_manifest(self) -> dict:
+        """Liest die Metadaten des Stores (leeres Dict wenn nicht vorhanden)."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"Fehler beim Lesen der Store-Metadaten {self.manifest_path}: {e}")
+            return {}
+
+    def write_manifest(self, **updates) -> None:
+        """Aktualisiert die Metadaten des Stores atomar."""
+        with self.lock():
+            manifest = self.read_manifest()
+            manifest.update(updates)
+            manifest["num_buckets"] = self.num_buckets
+            manifest["updated_at"] = datetime.now().isoformat()
+
+            tmp_path = unique_tmp_path(self.manifest_path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+
+    def partition_path(self, bucket: int, year: int) -> Path:
+        return self.root / f"bucket={bucket:02d}" / f"year={year}" / PARTITION_FILE
+
+    @staticmethod
+    def _to_long_format(df: pd.DataFrame) -> pd.DataFrame:
+        """Wandelt den Datums-Index in eine 'Date'-Spalte um."""
+        frame = df.copy()
+        if isinstance(frame.index, pd.DatetimeIndex):
+            frame.index.name = "Date"
+            frame = frame.reset_index()
+        if "Date" not in frame.columns:
+            raise ValueError("DataFrame benötigt einen DatetimeIndex oder eine 'Date'-Spalte")
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        return frame
+
+    def write(self, df: pd.DataFrame, mode: str = "merge") -> None:
+        """
+        Schreibt Marktdaten in den Store.
+
+        Args:
+            df: DataFrame mit DatetimeIndex und 'Symbol'-Spalte
+            mode: 'merge' führt mit bestehenden Partitionen zusammen (neuere Zeilen
+                  gewinnen), 'overwrite' ersetzt die betroffenen Partitionen
+        """
+        if mode not in ("merge", "overwrite"):
+            raise ValueError(f"Unbekannter Schreibmodus: {mode}")
+        if df is None or df.empty:
+            logging.warning("Keine Daten zum Schreiben in den Store")
+            return
+        if "Symbol" not in df.columns:
+            raise ValueError("DataFrame benötigt eine 'Symbol'-Spalte")
+
+        frame = self._to_long_format(df)
+        buckets = frame["Symbol"].map(lambda s: symbol_bucket(s, self.num_buckets))
+        years = frame["Date"].dt.year
+
+        written = 0
+        # Lesen, Zusammenführen und Ersetzen einer Partition darf sich nicht mit
+        # anderen Schreibzugriffen (Threads oder Prozesse) überschneiden
+        with self.lock():
+            for (bucket, year), part in frame.groupby([buckets, years], sort=False):
+                path = self.partition_path(int(bucket), int(year))
+
+                if mode == "merge" and path.exists():
+                    existing = pd.read_parquet(path)
+                    part = pd.concat([existing, part], ignore_index=True)
+                    part = part.drop_duplicates(subset=["Symbol", "Date"], keep="last")
+
+                # Sortierung nach Symbol/Datum sorgt für enge Row-Group-Statistiken
+                part = part.sort_values(["Symbol", "Date"]).reset_index(drop=True)
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = unique_tmp_path(path)
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                try:
+                    pq.write_table(table, tmp_path, row_group_size=self.row_group_size)
+                    os.replace(tmp_path, path)
+                finally:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                written += 1
+
+            # Letztes Datum im Manifest - Aktualitätsprüfung ohne Lesen der Partitionen
+            max_date = frame["Date"].max().strftime("%Y-%m-%d")
+            previous = self.read_manifest().get("max_date")
+            self.write_manifest(max_date=max(max_date, previous) if previous else max_date)
+        logging.info(f"{len(frame)} Zeilen in {written} Partitionen geschrieben: {self.root}")
+
+    def _dataset(self) -> ds.Dataset:
+        partitioning = ds.partitioning(
+            pa.schema([("bucket", pa.int32()), ("year", pa.int32())]),
+            flavor="hive"
+        )
+        return ds.dataset(
+            self.root,
+            format="parquet",
+            partitioning=partitioning
+        )
+
+    def build_filter(self, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None,
+                     symbols: Optional[List[str]] = None) -> Optional[ds.Expression]:
+        """
+        Baut den Filterausdruck für Partitionen und Zeilen.
+
+        Returns:
+            pyarrow Filterausdruck oder None wenn kein Filter nötig ist
+        """
+        conditions = []
+
+        if symbols:
+            buckets = sorted({symbol_bucket(s, self.num_buckets) for s in symbols})
+            conditions.append(ds.field("bucket").isin(buckets))
+            conditions.append(ds.field("Symbol").isin(list(symbols)))
+
+        if start_date:
+            start = pd.Timestamp(start_date)
+            conditions.append(ds.field("year") >= start.year)
+            conditions.append(ds.field("Date") >= pa.scalar(start, type=pa.timestamp("ns")))
+
+        if end_date:
+            end = pd.Timestamp(end_date)
+            conditions.append(ds.field("year") <= end.year)
+            conditions.append(ds.field("Date") <= pa.scalar(end, type=pa.timestamp("ns")))
+
+        if not conditions:
+            return None
+
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def read(self, start_date: Optional[str] = None,
+             end_date: Optional[str] = None,
+             symbols: Optional[List[str]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Liest einen Ausschnitt der Marktdaten.
+
+        Args:
+            start_date: Optional, Startdatum im Format 'YYYY-MM-DD'
+            end_date: Optional, Enddatum im Format 'YYYY-MM-DD' (inklusive)
+            symbols: Optional, Liste der zu ladenden Symbole
+            columns: Optional, zu ladende Spalten ('Symbol' wird immer geladen)
+
+        Returns:
+            DataFrame mit DatetimeIndex 'Date' und 'Symbol'-Spalte
+        """
+        if not self.exists():
+            return pd.DataFrame()
+
+        dataset = self._dataset()
+        available = [name for name in dataset.schema.names if name not in ("bucket", "year")]
+
+        if columns is not None:
+            missing = [c for c in columns if c not in available]
+            if missing:
+                logging.warning(f"Spalten nicht im Store vorhanden: {missing}")
+            projection = ["Date", "Symbol"] + [c for c in columns if c in available and c not in ("Date", "Symbol")]
+        else:
+            projection = available
+
+        table = dataset.to_table(
+            columns=projection,
+            filter=self.build_filter(start_date, end_date, symbols)
+        )
+
+        df = table.to_pandas()
+        if df.empty:
+            return df.set_index("Date") if "Date" in df.columns else df
+
+        df = df.sort_values(["Symbol", "Date"], kind="stable")
+        return df.set_index("Date")
+
+    def last_dates(self, symbols: Optional[List[str]] = None) -> pd.Series:
+        """
+        Ermittelt das letzte gespeicherte Datum je Symbol.
+
+        Args:
+            symbols: Optional, Einschränkung auf diese Symbole
+
+        Returns:
+            Series Symbol -> letztes Datum
+        """
+        if not self.exists():
+            return pd.Series(dtype="datetime64[ns]")
+
+        # Nur Symbol und Datum lesen, alle anderen Spalten bleiben auf der Platte
+        table = self._dataset().to_table(
+            columns=["Symbol", "Date"],
+            filter=self.build_filter(symbols=symbols)
+        )
+        if table.num_rows == 0:
+            return pd.Series(dtype="datetime64[ns]")
+
+        last = table.group_by("Symbol").aggregate([("Date", "max")]).to_pandas()
+        return last.set_index("Symbol")["Date_max"].rename("Date")
+
+    def latest_date(self) -> Optional[pd.Timestamp]:
+        """Letztes gespeicherte Datum über alle Symbole (None bei leerem Store)."""
+        max_date = self.read_manifest().get("max_date")
+        if max_date:
+            return pd.Timestamp(max_date)
+        # Ältere Stores ohne Eintrag im Manifest
+        last = self.last_dates()
+        return pd.Timestamp(last.max()) if not last.empty else None
+
+    def date_ranges(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Ermittelt erstes und letztes gespeichertes Datum je Symbol.
+
+        Args:
+            symbols: Optional, Einschränkung auf diese Symbole
+
+        Returns:
+            DataFrame mit Index Symbol und Spalten 'first', 'last'
+        """
+        if not self.exists():
+            return pd.DataFrame(columns=["first", "last"], index=pd.Index([], name="Symbol"))
+
+        table = self._dataset().to_table(
+            columns=["Symbol", "Date"],
+            filter=self.build_filter(symbols=symbols)
+        )
+        ranges = table.group_by("Symbol").aggregate([("Date", "min"), ("Date", "max")]).to_pandas()
+        return ranges.set_index("Symbol").rename(columns={"Date_min": "first", "Date_max": "last"})
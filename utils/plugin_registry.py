@@ -0,0 +1,255 @@
+"""Registry für Screener und Strategien mit einmaliger, importfreier Erkennung"""
+import ast
+import importlib
+import importlib.util
+import logging
+import pkgutil
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+# Typen, die sich als JSON-Parameter übergeben lassen (Annotation -> Schema-Typ)
+PARAMETER_TYPES = {
+    'int': 'int', 'float': 'float', 'str': 'str', 'bool': 'bool',
+    'list': 'list', 'List': 'list', 'tuple': 'list', 'Tuple': 'list',
+    'dict': 'dict', 'Dict': 'dict'
+}
+
+
+def class_name(plugin_id: str, suffix: str) -> str:
+    """Klassenname nach Namenskonvention, z.B. ('ema_touch', 'Screener') -> 'EmaTouchScreener'."""
+    return ''.join(word.capitalize() for word in plugin_id.split('_')) + suffix
+
+
+def _parameter_type(annotation: Optional[ast.expr], default: Any) -> Optional[str]:
+    """Schema-Typ aus Annotation oder Standardwert (None: nicht per JSON übergebbar)."""
+    if annotation is not None:
+        text = ast.unparse(annotation)
+        # Optional[X] / Union[X, None] -> X
+        match = re.fullmatch(r"(?:Optional|Union)\[(\w+)(?:\[.*\])?(?:, None)?\]", text)
+        base = match.group(1) if match else re.match(r"\w+", text).group(0)
+        return PARAMETER_TYPES.get(base)
+    if default is None:
+        return 'any'
+    return PARAMETER_TYPES.get(type(default).__name__)
+
+
+def _docstring_args(docstring: str) -> Dict[str, str]:
+    """Beschreibungen aus dem 'Args:'-Abschnitt eines Docstrings."""
+    descriptions: Dict[str, str] = {}
+    in_args = False
+    current = None
+    for line in docstring.splitlines():
+        stripped = line.strip()
+        if stripped == 'Args:':
+            in_args = True
+            continue
+        if not in_args:
+            continue
+        if not stripped or re.fullmatch(r"\w+:", stripped):
+            # Leerzeile oder nächster Abschnitt (Returns:, Raises:)
+            if descriptions:
+                break
+            continue
+        match = re.match(r"(\w+):\s*(.*)", stripped)
+        if match and not line.startswith(' ' * 12):
+            current = match.group(1)
+            descriptions[current] = match.group(2)
+        elif current:
+            descriptions[current] += ' ' + stripped
+    return descriptions
+
+
+def _summary(docstring: Optional[str]) -> str:
+    """Erster Absatz eines Docstrings in einer Zeile (ohne Args-/Returns-Abschnitte)."""
+    if not docstring:
+        return ''
+    paragraph = docstring.strip().split('\n\n')[0]
+    if re.match(r"\w+:\s*$", paragraph.splitlines()[0].strip()):
+        return ''
+    return ' '.join(paragraph.split())
+
+
+def class_schema(source: str, name: str) -> Optional[Dict[str, Any]]:
+    """
+    Liest Name, Beschreibung und Parameter einer Klasse aus dem Quelltext, ohne das Modul zu importieren.
+
+    Args:
+        source: Quelltext des Moduls
+        name: Klassenname (auch als Alias 'Name = AndereKlasse' aufgelöst)
+
+    Returns:
+        Dict mit 'description', 'display_name' und 'parameters' oder None, wenn die Klasse fehlt
+    """
+    tree = ast.parse(source)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Name)
+                and any(isinstance(target, ast.Name) and target.id == name for target in node.targets)):
+            name = node.value.id
+    if name not in classes:
+        return None
+
+    cls = classes[name]
+    init = next((node for node in cls.body if isinstance(node, ast.FunctionDef) and node.name == '__init__'), None)
+    class_doc = ast.get_docstring(cls)
+    init_doc = ast.get_docstring(init) if init is not None else None
+    descriptions = _docstring_args(init_doc or class_doc or '')
+
+    parameters = []
+    display_name = None
+    if init is not None:
+        args = init.args.args[1:]
+        defaults = [None] * (len(args) - len(init.args.defaults)) + list(init.args.defaults)
+        pairs = list(zip(args, defaults)) + list(zip(init.args.kwonlyargs, init.args.kw_defaults))
+        for arg, default_node in pairs:
+            try:
+                default = ast.literal_eval(default_node) if default_node is not None else None
+            except ValueError:
+                default = None
+            schema_type = _parameter_type(arg.annotation, default)
+            if schema_type is None:
+                continue
+            parameters.append({
+                'name': arg.arg,
+                'type': schema_type,
+                'default': list(default) if isinstance(default, tuple) else default,
+                'required': default_node is None,
+                'description': descriptions.get(arg.arg, '')
+            })
+        # Anzeigename aus super().__init__("Name", ...)
+        for node in ast.walk(init):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == '__init__'
+                    and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                display_name = node.args[0].value
+                break
+
+    return {
+        'description': _summary(class_doc) or _summary(init_doc),
+        'display_name': display_name,
+        'parameters': parameters
+    }
+
+
+class PluginRegistry:
+    """
+    Findet Plugins eines Pakets (z.B. 'screeners') über die Namenskonvention
+    Modul 'ema_touch' -> Klasse 'EmaTouchScreener'.
+
+    Die Erkennung und die Parameter-Schemas stammen aus dem Quelltext (ast) und
+    werden einmal zwischengespeichert - der Katalog importiert keine Plugin-Module
+    und damit auch nicht deren Abhängigkeiten. Klassen werden erst bei der ersten
+    Verwendung importiert und danach ebenfalls zwischengespeichert.
+
+    Beispiel:
+        registry = get_screener_registry()
+        registry.catalog()                     # [{'id': 'ema_touch', 'parameters': [...]}, ...]
+        screener_class = registry.get_class('ema_touch')
+    """
+
+    def __init__(self, package: str, suffix: str):
+        """
+        Args:
+            package: Paket mit den Plugin-Modulen
+            suffix: Klassensuffix ('Screener' oder 'Strategy')
+        """
+        self.package = package
+        self.suffix = suffix
+        self._schemas: Optional[Dict[str, Dict[str, Any]]] = None
+        self._classes: Dict[str, Type] = {}
+        self._lock = threading.Lock()
+
+    def _package_path(self) -> List[str]:
+        spec = importlib.util.find_spec(self.package)
+        if spec is None or not spec.submodule_search_locations:
+            raise ValueError(f"Paket '{self.package}' nicht gefunden")
+        return list(spec.submodule_search_locations)
+
+    def _discover(self) -> Dict[str, Dict[str, Any]]:
+        schemas = {}
+        for module in pkgutil.iter_modules(self._package_path()):
+            if module.ispkg:
+                continue
+            path = Path(module.module_finder.path) / f"{module.name}.py"
+            try:
+                schema = class_schema(path.read_text(encoding='utf-8'), class_name(module.name, self.suffix))
+            except (OSError, SyntaxError) as e:
+                logging.warning(f"Modul {self.package}.{module.name} nicht lesbar: {e}")
+                continue
+            if schema is not None:
+                schemas[module.name] = schema
+        logging.info(f"{len(schemas)} Plugins in '{self.package}' gefunden: {', '.join(sorted(schemas))}")
+        return schemas
+
+    def schemas(self) -> Dict[str, Dict[str, Any]]:
+        """Plugin-ID -> Schema (einmalig aus dem Quelltext gelesen)."""
+        if self._schemas is None:
+            with self._lock:
+                if self._schemas is None:
+                    self._schemas = self._discover()
+        return self._schemas
+
+    def ids(self) -> List[str]:
+        return sorted(self.schemas())
+
+    def catalog(self) -> List[Dict[str, Any]]:
+        """Alle Plugins mit ID, Namen, Beschreibung und Parametern (für die API)."""
+        return [
+            {
+                'id': plugin_id,
+                'name': schema['display_name'] or plugin_id.replace('_', ' ').title(),
+                'description': schema['description'],
+                'parameters': schema['parameters']
+            }
+            for plugin_id, schema in sorted(self.schemas().items())
+        ]
+
+    def get_class(self, plugin_id: str) -> Type:
+        """
+        Importiert die Klasse eines Plugins beim ersten Aufruf.
+
+        Raises:
+            ValueError: wenn Modul oder Klasse nicht existieren
+        """
+        cls = self._classes.get(plugin_id)
+        if cls is not None:
+            return cls
+        try:
+            module = importlib.import_module(f"{self.package}.{plugin_id}")
+            cls = getattr(module, class_name(plugin_id, self.suffix))
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"{self.suffix}-Typ '{plugin_id}' nicht gefunden: {str(e)}")
+        with self._lock:
+            self._classes[plugin_id] = cls
+        return cls
+
+    def refresh(self) -> None:
+        """Verwirft die zwischengespeicherte Erkennung (z.B. nach neuen Modulen)."""
+        with self._lock:
+            self._schemas = None
+
+
+_screener_registry = None
+_strategy_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_screener_registry() -> PluginRegistry:
+    """Liefert die prozessweit geteilte Screener-Registry."""
+    global _screener_registry
+    if _screener_registry is None:
+        with _registry_lock:
+            if _screener_registry is None:
+                _screener_registry = PluginRegistry('screeners', 'Screener')
+    return _screener_registry
+
+
+def get_strategy_registry() -> PluginRegistry:
+    """Liefert die prozessweit geteilte Strategie-Registry."""
+    global _strategy_registry
+    if _strategy_registry is None:
+        with _registry_lock:
+            if _strategy_registry is None:
+                _strategy_registry = PluginRegistry('strategies', 'Strategy')
+    return _strategy_registry
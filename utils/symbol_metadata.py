@@ -0,0 +1,240 @@
+"""Lokaler Cache für Symbol-Metadaten (Subtyp, Name, GICS, Listing-Status)"""
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import norgatedata
+
+from config.config import Config
+from utils.parallel_download import iter_downloads
+
+# GICS-Ebenen und die zugehörigen Spaltennamen
+GICS_LEVELS = {
+    1: 'gics_sector',
+    2: 'gics_industry_group',
+    3: 'gics_industry',
+    4: 'gics_sub_industry'
+}
+
+
+def _listing_status(symbol: str) -> str:
+    database = norgatedata.database(symbol) or ''
+    return 'delisted' if 'Delisted' in database else 'active'
+
+
+# Norgate-Abfrage je Metadaten-Feld (ein Aufruf pro Feld und Symbol)
+FIELD_GETTERS: Dict[str, Callable[[str], Optional[str]]] = {
+    'subtype1': lambda symbol: norgatedata.subtype1(symbol),
+    'security_name': lambda symbol: norgatedata.security_name(symbol),
+    **{
+        column: (lambda symbol, level=level: norgatedata.classification_at_level(symbol, 'GICS', 'Name', level=level))
+        for level, column in GICS_LEVELS.items()
+    },
+    'status': _listing_status
+}
+
+METADATA_FIELDS = list(FIELD_GETTERS)
+# 'fetched_fields': kommagetrennte Felder, die für den Eintrag abgefragt wurden
+METADATA_COLUMNS = [*METADATA_FIELDS, 'fetched_fields', 'updated_at']
+
+
+def fetch_symbol_metadata(symbol: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Holt Metadaten eines Symbols von Norgate - nur die angefragten Felder.
+
+    Args:
+        symbol: Aktien-Symbol
+        fields: Optional, abzufragende Felder aus METADATA_FIELDS (Standard: alle)
+
+    Returns:
+        Dictionary mit den Metadaten (None für fehlgeschlagene Felder, die nicht in
+        'fetched_fields' stehen) oder None, wenn keine einzige Abfrage erfolgreich war
+    """
+    fields = METADATA_FIELDS if fields is None else fields
+    record = {'Symbol': symbol}
+    fetched = []
+    for field in fields:
+        try:
+            record[field] = FIELD_GETTERS[field](symbol)
+            fetched.append(field)
+        except Exception as e:
+            logging.debug(f"{field} für {symbol} nicht verfügbar: {e}")
+            record[field] = None
+
+    if fields and not fetched:
+        logging.warning(f"Keine Metadaten für {symbol} verfügbar")
+        return None
+    # Nur erfolgreiche Felder gelten als geladen, fehlgeschlagene werden erneut angefragt
+    record['fetched_fields'] = ','.join(sorted(fetched))
+    record['updated_at'] = pd.Timestamp(datetime.now())
+    return record
+
+
+class SymbolMetadataCache:
+    """
+    Persistente Metadaten-Tabelle aller bekannten Symbole.
+
+    Fehlende Symbole werden gesammelt nachgeladen und auf der Platte gespeichert,
+    sodass Abfragen wie Subtyp- oder Sektor-Zuordnung zu einem Join über die
+    Tabelle werden statt eines Norgate-Aufrufs pro Symbol.
+    """
+
+    def __init__(self, cache_file=None, max_age_days: int = 30, max_workers: Optional[int] = None):
+        """
+        Args:
+            cache_file: Optional, Pfad zur Parquet-Datei
+            max_age_days: Nach dieser Zeit werden Einträge erneut von Norgate geladen
+            max_workers: Optional, parallele Norgate-Abfragen (Standard aus Config)
+        """
+        if cache_file is None:
+            cache_file = Config.get_project_path('data', 'raw', 'symbol_metadata.parquet')
+        self.cache_file = Path(cache_file)
+        self.max_age_days = max_age_days
+        self.max_workers = max_workers or Config.DOWNLOAD_MAX_WORKERS
+        self._lock = threading.Lock()
+        self._table = None
+
+    def load(self) -> pd.DataFrame:
+        """Lädt die Metadaten-Tabelle (Index: Symbol)."""
+        if self._table is None:
+            if self.cache_file.exists():
+                try:
+                    self._table = pd.read_parquet(self.cache_file)
+                except Exception as e:
+                    logging.error(f"Fehler beim Laden der Symbol-Metadaten: {e}")
+            if self._table is None:
+                self._table = pd.DataFrame(columns=METADATA_COLUMNS, index=pd.Index([], name='Symbol'))
+        return self._table
+
+    def _save(self) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix('.tmp')
+        self._table.to_parquet(tmp_path)
+        os.replace(tmp_path, self.cache_file)
+
+    def stale_symbols(self, symbols: List[str], fields: Optional[List[str]] = None) -> List[str]:
+        """Symbole, die fehlen, älter als max_age_days sind oder denen eines der Felder fehlt."""
+        table = self.load()
+        fields = METADATA_FIELDS if fields is None else fields
+        cutoff = pd.Timestamp(datetime.now() - timedelta(days=self.max_age_days))
+        updated = table['updated_at'].reindex(symbols)
+        fetched = table['fetched_fields'].reindex(symbols) if 'fetched_fields' in table.columns \
+            else pd.Series(index=updated.index, dtype=object)
+        return [
+            symbol for (symbol, ts), done in zip(updated.items(), fetched.values)
+            if pd.isna(ts) or ts < cutoff or pd.isna(done) or not set(fields) <= set(done.split(','))
+        ]
+
+    def _fetch(self, symbols: List[str], fields: List[str]) -> None:
+        """
+        Lädt die Felder für die Symbole von Norgate und speichert die Tabelle.
+
+        Bereits abgefragte Felder eines Eintrags werden mit aktualisiert, damit
+        er vollständig bleibt. Symbole ohne eine einzige erfolgreiche Abfrage
+        werden nicht gespeichert und beim nächsten Zugriff erneut angefragt.
+        """
+        table = self.load()
+        previous = table['fetched_fields'].reindex(symbols) if 'fetched_fields' in table.columns \
+            else pd.Series(index=symbols, dtype=object)
+        groups: Dict[tuple, List[str]] = {}
+        for symbol, done in previous.items():
+            needed = set(fields) | (set(done.split(',')) if isinstance(done, str) else set())
+            # Einträge ohne bekannte Felder (ältere Tabellen) vollständig laden
+            needed = needed or set(METADATA_FIELDS)
+            groups.setdefault(tuple(field for field in METADATA_FIELDS if field in needed), []).append(symbol)
+
+        records = []
+        for group_fields, group_symbols in groups.items():
+            records += [
+                record for _, record in iter_downloads(
+                    group_symbols, lambda symbol: fetch_symbol_metadata(symbol, list(group_fields)),
+                    max_workers=self.max_workers)
+                if record is not None
+            ]
+        if len(records) < len(symbols):
+            logging.warning(f"Metadaten für {len(symbols) - len(records)} Symbole nicht verfügbar")
+        if records:
+            new_rows = pd.DataFrame.from_records(records, index='Symbol')
+            kept = table[~table.index.isin(new_rows.index)]
+            table = pd.concat([kept, new_rows]) if not kept.empty else new_rows
+            self._table = table.reindex(columns=METADATA_COLUMNS)
+            self._save()
+
+    def ensure(self, symbols: List[str], fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Stellt sicher, dass für alle Symbole aktuelle Metadaten vorliegen.
+
+        Args:
+            symbols: Liste der benötigten Symbole
+            fields: Optional, benötigte Felder aus METADATA_FIELDS (Standard: alle)
+
+        Returns:
+            Metadaten der angefragten Symbole (Index: Symbol)
+        """
+        fields = METADATA_FIELDS if fields is None else fields
+        with self._lock:
+            missing = self.stale_symbols(symbols, fields)
+            if missing:
+                logging.info(f"Lade Metadaten ({', '.join(fields)}) für {len(missing)} von "
+                             f"{len(symbols)} Symbolen nach...")
+                self._fetch(missing, fields)
+
+            return self.load().reindex(symbols)
+
+    def refresh(self) -> int:
+        """
+        Aktualisiert alle veralteten Einträge der Tabelle (jeweils mit ihren bisherigen Feldern).
+
+        Returns:
+            Anzahl der aktualisierten Symbole
+        """
+        with self._lock:
+            stale = self.stale_symbols(list(self.load().index), fields=[])
+            if stale:
+                self._fetch(stale, [])
+        return len(stale)
+
+    def invalidate(self) -> None:
+        """Verwirft die im Speicher gehaltene Tabelle (wird beim nächsten Zugriff neu gelesen)."""
+        with self._lock:
+            self._table = None
+
+    def filter_subtype(self, symbols: List[str], subtype: str = 'Equity') -> List[str]:
+        """Filtert Symbole nach Subtyp (Reihenfolge bleibt erhalten)."""
+        metadata = self.ensure(symbols, ['subtype1'])
+        mask = metadata['subtype1'] == subtype
+        return list(metadata.index[mask.fillna(False).values])
+
+    def join(self, data: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        """
+        Fügt Metadaten-Spalten über die 'Symbol'-Spalte an einen DataFrame an.
+
+        Args:
+            data: DataFrame mit 'Symbol'-Spalte
+            columns: Zuordnung Metadaten-Spalte -> Zielspalte
+
+        Returns:
+            DataFrame mit den zusätzlichen Spalten
+        """
+        metadata = self.ensure(list(data['Symbol'].unique()), list(columns))
+        for source, target in columns.items():
+            data[target] = data['Symbol'].map(metadata[source])
+        return data
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_symbol_metadata_cache() -> SymbolMetadataCache:
+    """Liefert den prozessweit geteilten Metadaten-Cache."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SymbolMetadataCache()
+    return _default_cache
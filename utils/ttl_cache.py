@@ -0,0 +1,80 @@
+"""Thread-sicherer Cache mit Ablaufzeit"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Einfacher Key-Value-Cache, dessen Einträge nach `ttl` Sekunden verfallen.
+
+    `get_or_load` stellt sicher, dass pro Key nur ein Thread gleichzeitig lädt;
+    parallele Anfragen warten auf dessen Ergebnis statt die Datenquelle
+    mehrfach abzufragen.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: Gültigkeitsdauer eines Eintrags in Sekunden
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Liefert einen gültigen Eintrag oder `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Speichert einen Eintrag (optional mit abweichender Gültigkeitsdauer)."""
+        with self._lock:
+            self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    cache_if: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Liefert den Eintrag zu `key` oder lädt ihn über `loader`.
+
+        Args:
+            key: Cache-Key
+            loader: Funktion ohne Argumente, die den Wert liefert
+            cache_if: Optional, Bedingung ob der geladene Wert gespeichert wird
+                      (z.B. leere Ergebnisse nach Fehlern nicht cachen)
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Ein anderer Thread könnte inzwischen geladen haben
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+            value = loader()
+            if cache_if(value):
+                self.set(key, value)
+            return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Entfernt einen Eintrag oder, ohne Key, den gesamten Cache."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -1,4 +1,5 @@
 import sys
+import asyncio
 from contextlib import asynccontextmanager
 
 from config.config import Config
@@ -8,7 +9,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 import logging
-import norgatedata
 
 # Relative imports aus dem backend-Paket
 from webapp.backend.database import get_db
@@ -17,6 +17,9 @@ from webapp.backend.models.screener_models import ScreenerRequest, ScreenerRespo
 from webapp.backend.models.backtest_models import BacktestRequest, BacktestResponse
 from webapp.backend.services.screener_process import ScreenerProcess
 from webapp.backend.services import screener_service
+from utils.norgate_watchlist_symbols import get_watchlist_names, invalidate_watchlist_cache
+from utils.panel_cache import get_panel_cache, warm_panel_cache
+from utils.plugin_registry import get_screener_registry, get_strategy_registry
 
 # Logger konfigurieren
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +35,16 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up TraderMind API...")
     ScreenerProcess()  # Initialisiere den ScreenerProcess Singleton
     
+    # Marktdaten im Hintergrund vorladen, der Start wird dadurch nicht verzögert
+    if Config.PANEL_CACHE_WARM_WATCHLISTS:
+        from screeners.run_screener import default_screening_range
+        start_date, end_date = default_screening_range()
+        asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: warm_panel_cache(Config.PANEL_CACHE_WARM_WATCHLISTS, start_date, end_date,
+                                     categorical_symbols=True, lowercase_aliases=False)
+        )
+    
     yield  # Server läuft
     
     # Shutdown
@@ -61,17 +74,18 @@ def read_root():
 
 @app.get("/api/watchlists", response_model=List[Dict[str, str]])
 async def get_watchlists():
-    """Holt die verfügbaren Watchlists von Norgate Data."""
+    """Holt die verfügbaren Watchlists von Norgate Data (zwischengespeichert)."""
     try:
         logger.info("Versuche Watchlists von Norgate Data zu laden...")
-        if not norgatedata.status():
+        try:
+            watchlists = get_watchlist_names()
+        except ConnectionError:
             logger.error("Norgate Data Utility ist nicht verfügbar")
             raise HTTPException(
                 status_code=503,
                 detail="Norgate Data Utility ist nicht verfügbar"
             )
         
-        watchlists = norgatedata.watchlists()
         logger.info(f"Erhaltene Watchlists: {watchlists}")
         
         if not watchlists:
@@ -92,6 +106,35 @@ async def get_watchlists():
             detail=f"Fehler beim Laden der Watchlists: {str(e)}"
         )
 
+@app.post("/api/watchlists/refresh")
+def refresh_watchlists():
+    """Verwirft die zwischengespeicherten Watchlists und deren Mitglieder"""
+    invalidate_watchlist_cache()
+    return {"message": "Watchlist-Cache wurde geleert"}
+
+# Marktdaten-Cache Routes
+@app.get("/api/market-data/cache")
+def get_market_data_cache():
+    """Liefert Kennzahlen des Marktdaten-Caches im Speicher"""
+    return get_panel_cache().stats()
+
+@app.post("/api/market-data/refresh")
+def refresh_market_data_cache():
+    """Verwirft alle im Speicher gehaltenen Marktdaten-Panels"""
+    removed = get_panel_cache().invalidate()
+    return {"message": f"{removed} Marktdaten-Panels verworfen"}
+
+# Katalog der Screener und Strategien (aus der Registry, ohne Import der Module)
+@app.get("/api/screeners")
+def list_screeners():
+    """Verfügbare Screener mit Parametern"""
+    return get_screener_registry().catalog()
+
+@app.get("/api/strategies")
+def list_strategies():
+    """Verfügbare Backtest-Strategien mit Parametern"""
+    return get_strategy_registry().catalog()
+
 # Screener Routes
 @app.post("/api/screener/run", response_model=ScreenerResponse)
 async def execute_screener(request: ScreenerRequest, db: Session = Depends(get_db)):
@@ -103,7 +146,8 @@ async def execute_screener(request: ScreenerRequest, db: Session = Depends(get_d
             screener_type=request.screener_type,
             parameters=request.parameters,
             start_date=request.start_date,
-            end_date=request.end_date
+            end_date=request.end_date,
+            latest_only=request.latest_only
         )
         return result
     except Exception as e:
@@ -65,6 +65,7 @@ class ScreenerRequest(BaseModel):
     parameters: Dict[str, Any]
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    latest_only: bool = False
 
 class ScreenerResultData(BaseModel):
     symbol: str
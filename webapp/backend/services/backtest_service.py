@@ -1,12 +1,12 @@
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-import importlib
 
 from sqlalchemy.orm import Session
 
 from backtesting.performance import EnhancedBacktestPerformance
 from utils.data_manager import EnhancedMarketDataManager
+from utils.plugin_registry import get_strategy_registry
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
@@ -32,14 +32,10 @@ def run_backtest(
         Dictionary mit Backtest-Ergebnissen
     """
     try:
-        # Strategie-Modul dynamisch laden
-        module_path = f"strategies.{strategy_type}"
+        # Strategie-Klasse über die Registry laden (einmal importiert, danach zwischengespeichert)
         try:
-            strategy_module = importlib.import_module(module_path)
-            # Get the appropriate strategy class (assuming it follows naming convention)
-            strategy_class_name = ''.join(word.capitalize() for word in strategy_type.split('_')) + "Strategy"
-            strategy_class = getattr(strategy_module, strategy_class_name)
-        except (ImportError, AttributeError) as e:
+            strategy_class = get_strategy_registry().get_class(strategy_type)
+        except ValueError as e:
             logger.error(f"Fehler beim Laden des Strategie-Moduls: {str(e)}")
             return {
                 "status": "error",
@@ -96,35 +92,14 @@ def get_available_strategies() -> List[Dict[str, Any]]:
     """
     Gibt eine Liste der verfügbaren Backtest-Strategien zurück.
     
+    Die Liste stammt aus der Strategie-Registry: Namen, Beschreibungen und Parameter
+    werden aus den Strategie-Klassen gelesen und bleiben dadurch aktuell.
+    
     Returns:
         Liste der Strategien mit Namen und Beschreibungen
     """
     try:
-        # Diese Liste sollte erweitert werden, wenn neue Strategien hinzugefügt werden
-        strategies = [
-            {
-                "id": "mean_reversion",
-                "name": "Mean Reversion",
-                "description": "Strategie, die Umkehrungen nach starken Kursbewegungen identifiziert",
-                "parameters": [
-                    {
-                        "name": "gap_threshold",
-                        "type": "float",
-                        "default": -0.03,
-                        "description": "Schwellenwert für Kurslücke nach unten (z.B. -0.03 für -3%)"
-                    },
-                    {
-                        "name": "exit_days",
-                        "type": "int",
-                        "default": 5,
-                        "description": "Anzahl der Tage bis zum Ausstieg"
-                    }
-                ]
-            }
-            # Hier können weitere Strategien hinzugefügt werden
-        ]
-        
-        return strategies
+        return get_strategy_registry().catalog()
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der verfügbaren Strategien: {str(e)}", exc_info=True)
-        return []
\ No newline at end of file
+        return []
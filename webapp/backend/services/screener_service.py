@@ -8,11 +8,12 @@ from fastapi import HTTPException
 
 from ..models.screener_models import ScreenerRun, ScreenerResult
 from ..schemas.screener_schemas import ScreenerResponse, ScreenerResultItem
-from utils.norgate_watchlist_symbols import get_watchlist_symbols
+from utils.norgate_watchlist_symbols import get_watchlist_symbols, get_watchlist_names
 from utils.data_manager import EnhancedMarketDataManager
 from screeners.run_screener import run_daily_screening
 from .screener_process import ScreenerProcess
 from utils.json_helpers import prepare_df_for_json
+from utils.market_panel import MarketPanel
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
@@ -23,7 +24,8 @@ async def run_screener(
     screener_type: str,
     parameters: Dict[str, Any],
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    latest_only: bool = False
 ) -> ScreenerResponse:
     """
     Führt einen Screener mit den angegebenen Parametern aus.
@@ -35,6 +37,7 @@ async def run_screener(
         parameters: Parameter für den Screener
         start_date: Optional, Startdatum für die Daten
         end_date: Optional, Enddatum für die Daten
+        latest_only: Nur Treffer am Stichtag (end_date) ermitteln
         
     Returns:
         ScreenerResponse-Objekt mit den Ergebnissen
@@ -67,7 +70,8 @@ async def run_screener(
                     parameters=parameters,
                     start_date=start_date_str,
                     end_date=end_date_str,
-                    watchlist_name=watchlist_name
+                    watchlist_name=watchlist_name,
+                    latest_only=latest_only
                 )
                 
                 if screening_results is None or screening_results.empty:
@@ -78,8 +82,8 @@ async def run_screener(
                       # Speichere Ergebnisse
                 result_items = []
                 # Konvertiere DataFrame zu JSON-serialisierbarem Format
-                for symbol in screening_results['Symbol'].unique():
-                    symbol_data = screening_results[screening_results['Symbol'] == symbol]
+                panel = MarketPanel.from_frame(screening_results)
+                for symbol, symbol_data in panel.iter_symbols():
                     result = ScreenerResult(
                         screener_run_id=screener_run.id,
                         symbol=symbol,
@@ -175,10 +179,8 @@ def get_all_watchlists() -> List[str]:
     Returns:
         Liste von Watchlist-Namen
     """
-    import norgatedata
     try:
-        watchlists = norgatedata.watchlists()
-        return watchlists if watchlists else []
+        return get_watchlist_names()
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Watchlists: {str(e)}", exc_info=True)
         return []
\ No newline at end of file